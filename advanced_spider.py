@@ -13,7 +13,13 @@ from collections import defaultdict
 from browser_manager import BrowserManager
 from login_handler import LoginHandler
 from tianyancha_scraper import TianyanchaScraper
+from browser_pool import BrowserPool
 from excel_exporter import export_to_excel
+from crawl_journal import CrawlJournal
+from metrics import METRICS
+from tracer import TRACER
+from profiler import PROFILER
+from config import BROWSER_POOL_SIZE
 
 
 logger = logging.getLogger(__name__)
@@ -22,7 +28,8 @@ logger = logging.getLogger(__name__)
 class AdvancedTianyanchaSpider:
     """天眼查爬虫高级版本"""
 
-    def __init__(self, browser_type="chrome", use_proxy=False, proxy_list=None):
+    def __init__(self, browser_type="chrome", use_proxy=False, proxy_list=None, pool_size=BROWSER_POOL_SIZE,
+                 resume=False):
         """
         初始化高级爬虫
 
@@ -30,11 +37,17 @@ class AdvancedTianyanchaSpider:
             browser_type: 浏览器类型
             use_proxy: 是否使用代理
             proxy_list: 代理列表
+            pool_size: 详情页并发浏览器数量（1表示不启用浏览器池）
+            resume: 是否从上次中断处续跑（跳过采集日志中已完成的关键词与详情页）
         """
         self.browser_type = browser_type
         self.use_proxy = use_proxy
         self.proxy_list = proxy_list or []
+        self.pool_size = pool_size
+        self.resume = resume
+        self.journal = None
         self.browser_manager = None
+        self.browser_pool = None
         self.scraper = None
         self.all_data = []
         self.duplicate_data = set()  # 用于去重
@@ -73,6 +86,14 @@ class AdvancedTianyanchaSpider:
                 deduplicated.append(item)
         return deduplicated
 
+    def _close_browsers(self):
+        """关闭浏览器池及主浏览器"""
+        if self.browser_pool:
+            self.browser_pool.close()
+            self.browser_pool = None
+        elif self.browser_manager:
+            self.browser_manager.close()
+
     def run_with_retry(self, keywords, username=None, password=None):
         """
         带重试机制的爬虫运行
@@ -86,10 +107,15 @@ class AdvancedTianyanchaSpider:
             bool: 成功返回True
         """
         attempt = 0
+        METRICS.reset()
+        # 重试时沿用同一份采集日志，只重新采集尚未完成的关键词与详情页
+        self.journal = CrawlJournal(resume=self.resume)
 
         while attempt < self.retry_count:
             try:
                 logger.info(f"第 {attempt + 1} 次尝试...")
+                self.duplicate_data = set()
+                self.failed_keywords = []
 
                 # 初始化浏览器
                 logger.info(f"正在启动 {self.browser_type.upper()} 浏览器...")
@@ -109,8 +135,15 @@ class AdvancedTianyanchaSpider:
                 logger.info("✓ 登录成功")
                 time.sleep(3)
 
+                # 启动浏览器池（并发提取详情页）
+                if self.pool_size > 1:
+                    self.browser_pool = BrowserPool(size=self.pool_size, browser_type=self.browser_type,
+                                                    primary=self.browser_manager)
+                    self.browser_pool.share_cookies()
+
                 # 初始化爬虫
-                self.scraper = TianyanchaScraper(self.browser_manager)
+                self.scraper = TianyanchaScraper(self.browser_manager, browser_pool=self.browser_pool,
+                                                 journal=self.journal)
 
                 # 执行搜索和数据采集
                 logger.info("执行数据采集...")
@@ -118,8 +151,15 @@ class AdvancedTianyanchaSpider:
                     logger.info(f"处理关键词 {idx}/{len(keywords)}: {keyword}")
 
                     try:
-                        # 搜索
-                        results = self.scraper.search_toubiao(keyword)
+                        # 搜索（已完成的关键词直接从采集日志载入）
+                        done = self.journal.is_keyword_done(keyword)
+                        if done:
+                            results = self.journal.load_records(keyword)
+                            logger.info(f"⊘ 关键词 '{keyword}' 已完成，载入 {len(results)} 条")
+                        else:
+                            with PROFILER.profile(f"keyword_{keyword}"):
+                                results = self.scraper.search_toubiao(keyword)
+                            self.journal.mark_keyword_done(keyword, len(results))
 
                         # 去重
                         deduplicated_results = self._deduplicate_data(results)
@@ -131,7 +171,8 @@ class AdvancedTianyanchaSpider:
                         else:
                             logger.warning(f"⚠ 关键词 '{keyword}' 无新结果")
 
-                        time.sleep(2)
+                        if not done:
+                            time.sleep(2)
 
                     except Exception as e:
                         logger.error(f"处理关键词 '{keyword}' 失败: {str(e)}")
@@ -141,22 +182,42 @@ class AdvancedTianyanchaSpider:
                 # 获取所有数据
                 self.all_data = self.scraper.get_collected_data()
                 logger.info(f"✓ 数据采集完成，共采集 {len(self.all_data)} 条数据")
+                self.scraper.report_latency()
+                self.browser_manager.readiness.log_summary()
+                self.browser_manager.locator.log_summary()
+                self.browser_manager.log_page_metrics()
+                self.scraper.close()
 
                 # 关闭浏览器
-                if self.browser_manager:
-                    self.browser_manager.close()
+                self._close_browsers()
+                self.journal.close()
 
                 return True
 
+            except KeyboardInterrupt:
+                logger.warning("⚠ 收到中断信号，保留已完成的数据")
+                self.journal.flush()
+                self.duplicate_data = set()
+                self.all_data = self._deduplicate_data(self.journal.load_records())
+                if self.scraper:
+                    self.scraper.close()
+                self._close_browsers()
+                self.journal.close()
+                return False
+
             except Exception as e:
                 logger.error(f"❌ 第 {attempt + 1} 次尝试失败: {str(e)}")
-                if self.browser_manager:
-                    self.browser_manager.close()
+                # 关闭本次尝试的爬虫（解析线程池与HTTP会话），下次尝试重新创建
+                if self.scraper:
+                    self.scraper.close()
+                    self.scraper = None
+                self._close_browsers()
                 attempt += 1
                 if attempt < self.retry_count:
                     time.sleep(10)  # 重试前等待
 
         logger.error(f"❌ 在 {self.retry_count} 次重试后仍然失败")
+        self.journal.close()
         return False
 
     def export_data(self, filename=None):
@@ -174,7 +235,8 @@ class AdvancedTianyanchaSpider:
             return None
 
         logger.info(f"正在导出 {len(self.all_data)} 条数据到Excel...")
-        return export_to_excel(self.all_data, filename)
+        with PROFILER.profile("export"):
+            return export_to_excel(self.all_data, filename)
 
     def get_statistics(self):
         """
@@ -200,7 +262,10 @@ class AdvancedTianyanchaSpider:
             '关键词统计': dict(keyword_count),
             '省份分布': dict(province_count),
             '失败关键词': self.failed_keywords,
-            '失败数量': len(self.failed_keywords)
+            '失败数量': len(self.failed_keywords),
+            '跳过重复详情页': self.scraper.skipped_detail_fetches if self.scraper else 0,
+            '日期预过滤跳过详情页': self.scraper.date_skipped_fetches if self.scraper else 0,
+            '提前结束省去页数': self.scraper.date_skipped_pages if self.scraper else 0
         }
 
     def print_statistics(self):
@@ -212,6 +277,8 @@ class AdvancedTianyanchaSpider:
         logger.info("=" * 50)
         logger.info(f"总数据量: {stats['总数据量']} 条")
         logger.info(f"唯一企业: {stats['唯一企业数']} 个")
+        logger.info(f"跳过重复详情页: {stats['跳过重复详情页']} 次")
+        logger.info(f"日期预过滤: 跳过详情页 {stats['日期预过滤跳过详情页']} 次，提前结束省去 {stats['提前结束省去页数']} 页")
 
         if stats['关键词统计']:
             logger.info("\n关键词统计:")
@@ -233,10 +300,16 @@ class AdvancedTianyanchaSpider:
 
 
 if __name__ == "__main__":
-    from config import KEYWORDS, BROWSER_TYPE, LOGIN_USERNAME, LOGIN_PASSWORD
+    import os
+    import sys
+    from config import KEYWORDS, BROWSER_TYPE, LOGIN_USERNAME, LOGIN_PASSWORD, OUTPUT_EXCEL_FILE
 
-    # 使用高级爬虫
-    spider = AdvancedTianyanchaSpider(browser_type=BROWSER_TYPE)
+    # 使用高级爬虫（--resume 从上次中断处续跑，--trace 记录抓取时间线，--profile 剖析热点函数与内存分配）
+    if "--trace" in sys.argv[1:]:
+        TRACER.enable()
+    if "--profile" in sys.argv[1:]:
+        PROFILER.enable()
+    spider = AdvancedTianyanchaSpider(browser_type=BROWSER_TYPE, resume="--resume" in sys.argv[1:])
 
     # 运行爬虫
     success = spider.run_with_retry(KEYWORDS, LOGIN_USERNAME, LOGIN_PASSWORD)
@@ -247,5 +320,16 @@ if __name__ == "__main__":
 
         # 打印统计
         spider.print_statistics()
+    elif spider.all_data:
+        # 中断时导出已完成的部分数据
+        name, ext = os.path.splitext(OUTPUT_EXCEL_FILE)
+        spider.export_data(f"{name}_部分{ext}")
+        logger.info("使用 --resume 参数从中断处继续采集")
     else:
         logger.error("爬虫执行失败")
+
+    # 各阶段耗时（含导出）
+    METRICS.log_summary()
+    METRICS.write_reports()
+    TRACER.write()
+    PROFILER.log_summary()
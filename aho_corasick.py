@@ -0,0 +1,117 @@
+"""
+Aho-Corasick 多模式匹配
+
+一次线性扫描找出文本中所有词典词的出现位置，耗时与词典大小无关。
+纯Python实现（状态转移为每个状态一个字典），供地区索引等词典匹配使用。
+"""
+
+from collections import deque
+
+
+class AhoCorasick:
+    """Aho-Corasick 自动机：add() 添加词条，build() 构建失败指针后即可匹配"""
+
+    def __init__(self, words=None):
+        """
+        初始化自动机
+
+        Args:
+            words: 可选的 (词, 值) 可迭代对象，提供时直接添加并构建
+        """
+        self._goto = [{}]  # 状态 -> {字符: 下一状态}
+        self._fail = [0]
+        self._output = [()]  # 状态 -> ((词长, 值), ...)，包含经失败指针可达的后缀词
+        self._built = False
+        self.size = 0
+        if words is not None:
+            for word, value in words:
+                self.add(word, value)
+            self.build()
+
+    def add(self, word, value=None):
+        """
+        添加词条（同一个词可添加多次，对应多个值）
+
+        Args:
+            word: 词
+            value: 匹配时返回的值，默认为词本身
+        """
+        if not word:
+            return
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] += ((len(word), word if value is None else value),)
+        self._built = False
+        self.size += 1
+
+    def build(self):
+        """按广度优先构建失败指针，并把后缀词合并到各状态的输出"""
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+        self._built = True
+        return self
+
+    def iter(self, text):
+        """
+        扫描文本，逐个返回所有（可重叠的）匹配
+
+        Args:
+            text: 文本
+
+        Returns:
+            generator: (起始位置, 结束位置, 值)，按结束位置排序
+        """
+        if not self._built:
+            self.build()
+        goto, fail, output = self._goto, self._fail, self._output
+        root = goto[0]
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0) if state else root.get(char, 0)
+            if output[state]:
+                end = index + 1
+                for length, value in output[state]:
+                    yield end - length, end, value
+
+    def find(self, text):
+        """
+        最左最长的不重叠匹配（如“内蒙古自治区”优先于其中的“内蒙古”）
+
+        Args:
+            text: 文本
+
+        Returns:
+            list: [(起始位置, 结束位置, [值, ...])]，同一个词对应多个值时全部返回
+        """
+        spans = {}
+        for start, end, value in self.iter(text):
+            values = spans.setdefault((start, end), [])
+            values.append(value)
+        result = []
+        last_end = 0
+        for (start, end) in sorted(spans, key=lambda span: (span[0], -span[1])):
+            if start >= last_end:
+                result.append((start, end, spans[(start, end)]))
+                last_end = end
+        return result
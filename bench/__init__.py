@@ -0,0 +1,11 @@
+"""
+性能基准测试
+
+微基准（日期解析、省份提取、地址匹配、去重、统计）与宏基准（详情页解析、Excel导出、
+基于本地模拟站点的端到端抓取），每次运行结果保存为JSON，并与基线对比标记性能回退。
+
+用法:
+    python -m bench                      # 运行全部基准并与 bench/baseline.json 对比
+    python -m bench --quick --skip-slow  # 快速运行（跳过10万行导出等耗时基准）
+    python -m bench --save-baseline      # 把本次结果保存为新基线
+"""
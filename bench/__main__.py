@@ -0,0 +1,8 @@
+import sys
+import logging
+from bench.runner import main
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import os
+import csv
+import random
+import tempfile
+from config import OUTPUT_COLUMNS
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+PROVINCES = ["广东", "四川", "浙江", "北京", "湖北", "山东", "江苏", "河南", "未知"]
+KEYWORDS = ["生长激素", "注射笔", "骨龄仪器", "蒲地蓝消炎口服液", "济川药业"]
+ADDRESSES = [
+    "广东省广州市越秀区人民中路 123 号",
+    "四川省成都市武侯区人民南路 1 号",
+    "浙江省杭州市西湖区文三路 90 号",
+    "北京市海淀区中关村大街 27 号",
+    "新疆维吾尔自治区乌鲁木齐市天山区 5 号",
+    "某市某区某路 8 号",
+]
+DATE_TEXTS = ["2023-05-06", "2023年5月6日", "2023/05/06", "2024.11.30", "发布于 2021-01-15 10:00", "", "未知日期",
+              "20220318", "05-06", "3天前", "昨天 10:20"]
+
+
+def read_fixture(name):
+    """读取 fixtures 目录下保存的页面"""
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def detail_text(seed=0):
+    """
+    生成详情页正文（地址行位于正文中后部，接近真实公告）
+
+    Returns:
+        str: 正文文本
+    """
+    rng = random.Random(seed)
+    lines = [f"项目编号：CG-{rng.randint(10000, 99999)}", "采购人：某市人民医院"]
+    lines += [f"采购内容第{i}项：重组人生长激素注射液 {rng.randint(1, 30)}IU × {rng.randint(10, 500)}支" for i in range(30)]
+    lines.append(f"联系地址：{rng.choice(ADDRESSES)}")
+    lines += [f"联系人：张工 联系电话：020-{rng.randint(20000000, 89999999)}", "电子邮箱：bid@example.com",
+              "公告期限：自本公告发布之日起1个工作日。"]
+    return "\n".join(lines)
+
+
+HOSPITAL_KINDS = ["人民医院", "中医医院", "妇幼保健院", "儿童医院", "中心医院", "肿瘤医院", "口腔医院", "眼科医院",
+                  "骨科医院", "传染病医院"]
+HOSPITAL_ORDINALS = ["", "第一", "第二", "第三", "第四", "第五", "第六", "第七", "第八", "第九"]
+
+
+def synthetic_hospital_dict(count):
+    """
+    生成医院词典CSV（地市 × 序号 × 类别组合出的合成名称，用于衡量大词典下的构建、载入与匹配）
+
+    Args:
+        count: 词条数
+
+    Returns:
+        tuple: (CSV文件路径, 名称列表)
+    """
+    from region_index import get_region_index
+    index = get_region_index()
+    with open(index.path, encoding="utf-8", newline="") as f:
+        cities = [(index.resolve(row["城市"]).province, row["城市"])
+                  for row in csv.DictReader(f) if row["城市"] and not row["区县"]]
+    names = []
+    rows = []
+    for kind in HOSPITAL_KINDS:
+        for ordinal in HOSPITAL_ORDINALS:
+            for province, city in cities:
+                if len(names) >= count:
+                    break
+                name = f"{city}{ordinal}{kind}"
+                names.append(name)
+                rows.append([name, f"{city[:-1]}{ordinal}{kind}" if city.endswith("市") else "", province, city])
+    path = os.path.join(tempfile.mkdtemp(), "hospitals.csv")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["名称", "别名", "省份", "城市"])
+        writer.writerows(rows)
+    return path, names
+
+
+def synthetic_records(count, seed=0, duplicate_ratio=0.2):
+    """
+    生成与输出列一致的合成记录
+
+    Args:
+        count: 记录数
+        seed: 随机种子
+        duplicate_ratio: 重复记录（企业名称与地址相同）的比例
+
+    Returns:
+        list: 数据字典列表
+    """
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        source = i
+        if i and rng.random() < duplicate_ratio:
+            source = rng.randrange(i)
+        record = {column: "" for column in OUTPUT_COLUMNS}
+        record.update({
+            "企业名称": f"某市第{source}人民医院{KEYWORDS[source % len(KEYWORDS)]}采购公告",
+            "省份": PROVINCES[source % len(PROVINCES)],
+            "企业经营范围": "采购人：某市人民医院；采购内容：重组人生长激素注射液。" * 4,
+            "企业地址": ADDRESSES[source % len(ADDRESSES)],
+            "成立日期": f"20{20 + source % 6}-{source % 12 + 1:02d}-{source % 28 + 1:02d}",
+            "代理产品类别": KEYWORDS[rng.randrange(len(KEYWORDS))],
+            "详情链接": f"https://www.tianyancha.com/bid/{source:08x}",
+        })
+        records.append(record)
+    return records
@@ -0,0 +1,110 @@
+import os
+import random
+import tempfile
+import page_parser
+from hospital_matcher import HospitalMatcher
+from excel_exporter import ExcelExporter
+from tianyancha_scraper import TianyanchaScraper
+from mock_site import MockSite
+from bench.runner import benchmark
+from bench.data import read_fixture, synthetic_records, synthetic_hospital_dict, detail_text
+
+
+@benchmark("macro", name="detail_parse", setup=lambda: read_fixture("bid_detail.html"))
+def bench_detail_parse(page_html):
+    page_parser.parse_bid_detail(page_html)
+
+
+HOSPITAL_DICT_SIZE = 30000
+
+
+def _hospital_match_setup():
+    # 3万词条的词典 + 约1MB正文（每段正文提及两家医院）
+    path, names = synthetic_hospital_dict(HOSPITAL_DICT_SIZE)
+    rng = random.Random(0)
+    parts = []
+    size = 0
+    seed = 0
+    while size < 1_000_000:
+        part = f"采购人：{rng.choice(names)}\n{detail_text(seed)}\n配送至{rng.choice(names)}"
+        parts.append(part)
+        size += len(part.encode("utf-8"))
+        seed += 1
+    return HospitalMatcher.build(path), "\n".join(parts)
+
+
+@benchmark("macro", name="hospital_match_1mb", setup=_hospital_match_setup, number=1, repeat=3,
+           data_size=lambda state: len(state[1].encode("utf-8")))
+def bench_hospital_match(state):
+    matcher, text = state
+    matcher.match(text)
+
+
+@benchmark("macro", name="hospital_build_30k", setup=lambda: synthetic_hospital_dict(HOSPITAL_DICT_SIZE)[0],
+           number=1, repeat=2)
+def bench_hospital_build(path):
+    HospitalMatcher.build(path)
+
+
+def _hospital_cache_setup():
+    path, _ = synthetic_hospital_dict(HOSPITAL_DICT_SIZE)
+    cache_path = os.path.join(os.path.dirname(path), "hospital_automaton.pickle")
+    HospitalMatcher.load(path, cache_path)
+    return path, cache_path
+
+
+@benchmark("macro", name="hospital_load_cached_30k", setup=_hospital_cache_setup, number=1, repeat=3)
+def bench_hospital_load_cached(state):
+    # 词典未变化时从缓存反序列化（与 hospital_build_30k 对比）
+    HospitalMatcher.load(*state)
+
+
+def _excel_setup(count):
+    def setup():
+        return tempfile.mkdtemp(), synthetic_records(count)
+    return setup
+
+
+def _export(state):
+    folder, records = state
+    exporter = ExcelExporter(os.path.join(folder, "bench.xlsx"))
+    exporter.create_excel(records)
+    for path in exporter.filepaths:
+        os.remove(path)
+
+
+@benchmark("macro", name="excel_export_10k", setup=_excel_setup(10000), number=1, repeat=3)
+def bench_excel_export_10k(state):
+    _export(state)
+
+
+@benchmark("macro", name="excel_export_100k", setup=_excel_setup(100000), number=1, repeat=2, slow=True)
+def bench_excel_export_100k(state):
+    _export(state)
+
+
+class _NoCookieBrowser:
+    """HTTP通道不需要真实浏览器，只提供空Cookie"""
+
+    def get_driver(self):
+        return self
+
+    def get_cookies(self):
+        return []
+
+
+def _mock_site_setup():
+    # 模拟站点随进程退出（守护线程），5页×20条，无延迟，只衡量爬虫自身开销
+    return MockSite(pages=5, items_per_page=20).start()
+
+
+@benchmark("macro", name="crawl_mock_100", setup=_mock_site_setup, number=1, repeat=3)
+def bench_crawl_mock(site):
+    scraper = TianyanchaScraper(_NoCookieBrowser(), parse_mode="script")
+    scraper.page_cache = None
+    scraper._extract_bid_from_detail_page = lambda url, title, keyword: None
+    try:
+        results = scraper._search_via_http("生长激素", site.search_url("生长激素"), 10, 20)
+        assert results is not None and len(results) == 100, "端到端抓取结果数量不符"
+    finally:
+        scraper.close()
@@ -0,0 +1,69 @@
+from advanced_spider import AdvancedTianyanchaSpider
+from tianyancha_scraper import TianyanchaScraper
+from field_extractor import extract_fields
+from region_index import get_region_index
+from date_utils import parse_dates
+from bench.runner import benchmark
+from bench.data import DATE_TEXTS, ADDRESSES, detail_text, synthetic_records
+
+
+def _bare_scraper():
+    """不初始化浏览器、HTTP会话与缓存的爬虫实例（只调用纯解析方法）"""
+    return TianyanchaScraper.__new__(TianyanchaScraper)
+
+
+@benchmark("micro", name="parse_date", setup=_bare_scraper)
+def bench_parse_date(scraper):
+    for text in DATE_TEXTS:
+        scraper._parse_date(text)
+
+
+@benchmark("micro", name="parse_dates_10k", setup=lambda: [DATE_TEXTS[i % len(DATE_TEXTS)] for i in range(10000)])
+def bench_parse_dates(texts):
+    # 对结果库重新过滤时的批量解析（重复日期文本只解析一次）
+    parse_dates(texts)
+
+
+@benchmark("micro", name="extract_province", setup=_bare_scraper)
+def bench_extract_province(scraper):
+    for address in ADDRESSES:
+        scraper._extract_province(address)
+
+
+@benchmark("micro", name="address_extract", setup=lambda: (_bare_scraper(), detail_text()))
+def bench_address_extract(state):
+    # _build_bid_record 一次扫描正文提取各字段并由地址提取省份
+    scraper, text = state
+    scraper._build_bid_record("某市人民医院采购公告", "生长激素", "", text)
+
+
+@benchmark("micro", name="field_extract_10x", setup=lambda: "\n".join(detail_text(seed) for seed in range(10)))
+def bench_field_extract(text):
+    # 约1万字的完整正文（不截断）
+    extract_fields(text)
+
+
+@benchmark("micro", name="region_mentions_10x",
+           setup=lambda: (get_region_index(), "\n".join(detail_text(seed) for seed in range(10))))
+def bench_region_mentions(state):
+    index, text = state
+    index.mentions(text)
+
+
+def _spider_with_records(count):
+    def setup():
+        spider = AdvancedTianyanchaSpider()
+        spider.all_data = synthetic_records(count)
+        return spider
+    return setup
+
+
+@benchmark("micro", name="deduplicate_10k", setup=_spider_with_records(10000))
+def bench_deduplicate(spider):
+    spider.duplicate_data = set()
+    spider._deduplicate_data(spider.all_data)
+
+
+@benchmark("micro", name="get_statistics_10k", setup=_spider_with_records(10000))
+def bench_get_statistics(spider):
+    spider.get_statistics()
@@ -0,0 +1,294 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import logging
+import importlib
+import statistics
+import subprocess
+from datetime import datetime
+
+
+logger = logging.getLogger(__name__)
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_THRESHOLD = 0.25  # 最快一轮耗时比基线慢超过25%视为回退
+COMPARE_STAT = "min"  # 对比各轮中最快的一轮：干扰只会让耗时变长，最快一轮比中位数更稳定
+BENCHMARK_MODULES = {"micro": "bench.micro", "macro": "bench.macro"}
+
+BENCHMARKS = []
+
+
+class Benchmark:
+    """单个基准：setup 准备输入，func(state) 为被计时的一次操作"""
+
+    def __init__(self, name, group, func, setup=None, number=None, repeat=None, slow=False, data_size=None):
+        """
+        Args:
+            name: 基准名称（结果文件中的键）
+            group: 分组（micro / macro）
+            func: 被计时函数，参数为 setup 的返回值
+            setup: 准备函数（不计时），None表示无输入
+            number: 每轮调用次数，None表示自动校准
+            repeat: 轮数，None表示使用命令行设置
+            slow: 是否为耗时基准（--skip-slow 时跳过）
+            data_size: 每次操作处理的字节数，参数为 setup 的返回值；提供时结果中附带吞吐量（MB/s）
+        """
+        self.name = name
+        self.group = group
+        self.func = func
+        self.setup = setup
+        self.number = number
+        self.repeat = repeat
+        self.slow = slow
+        self.data_size = data_size
+
+
+def benchmark(group, name=None, setup=None, number=None, repeat=None, slow=False, data_size=None):
+    """注册基准的装饰器"""
+    def decorator(func):
+        BENCHMARKS.append(Benchmark(name or func.__name__, group, func, setup, number, repeat, slow, data_size))
+        return func
+    return decorator
+
+
+def load_benchmarks(group=None):
+    """
+    导入基准模块（导入时完成注册）
+
+    Args:
+        group: 只导入该分组的模块，None表示全部
+
+    Returns:
+        list: 已注册的基准
+    """
+    for name, module in BENCHMARK_MODULES.items():
+        if group is None or name == group:
+            importlib.import_module(module)
+    return BENCHMARKS
+
+
+def _time(func, state, number):
+    """执行 number 次并返回总耗时（秒）"""
+    start = time.perf_counter()
+    for _ in range(number):
+        func(state)
+    return time.perf_counter() - start
+
+
+def run_benchmark(bench, repeat=5, min_time=0.2):
+    """
+    运行单个基准
+
+    Args:
+        bench: Benchmark实例
+        repeat: 轮数（基准自身指定时以基准为准）
+        min_time: 自动校准时每轮的最短耗时（秒）
+
+    Returns:
+        dict: {'group', 'number', 'repeat', 'median', 'min', 'mean', 'stdev'}，耗时为单次操作秒数；
+              基准提供 data_size 时附带 'mb_per_s'（按中位耗时计算）
+    """
+    state = bench.setup() if bench.setup else None
+    number = bench.number
+    if number is None:
+        number = 1
+        while True:
+            elapsed = _time(bench.func, state, number)
+            if elapsed >= min_time or number >= 1 << 20:
+                break
+            number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    repeat = bench.repeat or repeat
+    samples = [_time(bench.func, state, number) / number for _ in range(repeat)]
+    result = {
+        "group": bench.group,
+        "number": number,
+        "repeat": repeat,
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+    if bench.data_size and result["median"] > 0:
+        result["mb_per_s"] = bench.data_size(state) / result["median"] / 1e6
+    return result
+
+
+def _git_commit():
+    """当前提交（非git目录返回空字符串）"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=BENCH_DIR, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def run_all(name_filter=None, group=None, skip_slow=False, repeat=5, min_time=0.2):
+    """
+    运行匹配条件的全部基准
+
+    Args:
+        name_filter: 名称包含该字符串的基准才运行
+        group: 只运行该分组
+        skip_slow: 是否跳过耗时基准
+        repeat: 轮数
+        min_time: 自动校准时每轮的最短耗时（秒）
+
+    Returns:
+        dict: 运行结果（含环境信息与各基准结果）
+    """
+    results = {}
+    for bench in load_benchmarks(group):
+        if (name_filter and name_filter not in bench.name) or (group and bench.group != group):
+            continue
+        if skip_slow and bench.slow:
+            continue
+        # 被测代码的进度日志会淹没报告，运行期间屏蔽 INFO 及以下日志
+        logging.disable(logging.INFO)
+        try:
+            results[bench.name] = run_benchmark(bench, repeat=repeat, min_time=min_time)
+        except Exception as e:
+            logger.error(f"❌ 基准 {bench.name} 运行失败: {str(e)}")
+            continue
+        finally:
+            logging.disable(logging.NOTSET)
+        throughput = results[bench.name].get("mb_per_s")
+        logger.info(f"✓ {bench.name}: {_format_seconds(results[bench.name]['median'])}/次"
+                    + (f"（{throughput:.2f} MB/s）" if throughput else ""))
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def save_run(run, folder=RESULTS_DIR):
+    """
+    保存运行结果为 results/<时间>.json
+
+    Returns:
+        str: 结果文件路径
+    """
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(run, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_run(path):
+    """读取结果文件；不存在时返回None"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    与基线对比各基准最快一轮的耗时（COMPARE_STAT）
+
+    Args:
+        current: 本次运行结果
+        baseline: 基线运行结果
+        threshold: 回退阈值（相对基线变慢的比例）
+
+    Returns:
+        list: [{'name', 'baseline', 'current', 'ratio', 'status'}]，status 为 regression / improved / ok / new
+    """
+    rows = []
+    base_results = (baseline or {}).get("results", {})
+    for name, result in current["results"].items():
+        base = base_results.get(name)
+        if not base:
+            rows.append({"name": name, "baseline": None, "current": result[COMPARE_STAT], "ratio": None,
+                         "status": "new"})
+            continue
+        ratio = result[COMPARE_STAT] / base[COMPARE_STAT] if base[COMPARE_STAT] else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "baseline": base[COMPARE_STAT], "current": result[COMPARE_STAT],
+                     "ratio": ratio, "status": status})
+    return rows
+
+
+def _format_seconds(seconds):
+    """按量级格式化耗时"""
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.2f}s"
+
+
+def log_report(rows, threshold=DEFAULT_THRESHOLD):
+    """
+    输出对比报告
+
+    Returns:
+        int: 回退的基准数量
+    """
+    marks = {"regression": "⚠ 回退", "improved": "✓ 提升", "ok": "  持平", "new": "  新增"}
+    logger.info("\n" + "=" * 60)
+    logger.info(f"基准对比（最快一轮耗时，阈值 ±{threshold:.0%}）")
+    logger.info("=" * 60)
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        logger.info(f"{marks[row['status']]} {row['name']:<28} 基线 {_format_seconds(row['baseline']):>10}  "
+                    f"本次 {_format_seconds(row['current']):>10}  {ratio:>7}")
+    regressions = sum(1 for row in rows if row["status"] == "regression")
+    if regressions:
+        logger.warning(f"⚠ {regressions} 项基准性能回退超过 {threshold:.0%}")
+    return regressions
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(prog="python -m bench", description="天眼查爬虫性能基准")
+    parser.add_argument("--filter", help="只运行名称包含该字符串的基准")
+    parser.add_argument("--group", choices=["micro", "macro"], help="只运行该分组")
+    parser.add_argument("--quick", action="store_true", help="快速模式（减少轮数与每轮耗时）")
+    parser.add_argument("--skip-slow", action="store_true", help="跳过耗时基准（如10万行Excel导出）")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="基线文件路径")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help=f"回退阈值（比例，默认{DEFAULT_THRESHOLD}）")
+    parser.add_argument("--fail-on-regression", action="store_true", help="存在回退时返回非零退出码")
+    args = parser.parse_args(argv)
+
+    repeat, min_time = (3, 0.05) if args.quick else (5, 0.2)
+    run = run_all(args.filter, args.group, args.skip_slow, repeat=repeat, min_time=min_time)
+    path = save_run(run)
+    logger.info(f"✓ 结果已保存: {path}")
+
+    baseline = load_run(args.baseline)
+    regressions = 0
+    if baseline:
+        regressions = log_report(compare(run, baseline, args.threshold), args.threshold)
+    else:
+        logger.info(f"未找到基线 {args.baseline}，使用 --save-baseline 保存本次结果作为基线")
+    if args.save_baseline:
+        # 只运行部分基准时保留基线中其余基准的结果
+        if baseline:
+            baseline["results"].update(run["results"])
+            run = dict(run, results=baseline["results"])
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(run, f, ensure_ascii=False, indent=2)
+        logger.info(f"✓ 基线已更新: {args.baseline}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main())
@@ -1,13 +1,22 @@
 import time
 import logging
 import os
+from collections import defaultdict
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.edge.service import Service as EdgeService
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from config import BROWSER_TYPE, HEADLESS_MODE, IMPLICIT_WAIT_TIME, PAGE_LOAD_TIMEOUT
+from config import BROWSER_TYPE, HEADLESS_MODE, IMPLICIT_WAIT_TIME, PAGE_LOAD_TIMEOUT, USER_AGENT
+from config import READY_TIMEOUT, READY_QUIET_WINDOW, READY_POLL_INTERVAL
+from config import LEAN_PROFILE, PAGE_LOAD_STRATEGY, BLOCK_CSS, BLOCKED_URL_PATTERNS, BLOCKED_CSS_PATTERNS
+from config import REPORT_PAGE_METRICS, RECORD_FIXTURES_DIR, REPLAY_FIXTURES_DIR
+from element_locator import ElementLocator
+from metrics import timed
+from tracer import traced
+from dom_scripts import READY_STATE_SCRIPT, PAGE_METRICS_SCRIPT
+from replay_driver import FixtureArchive, ReplayDriver
 
 
 # 配置日志
@@ -18,26 +27,155 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class PageReadiness:
+    """页面就绪等待引擎：基于具体信号等待，并统计相对原固定等待节省的时间"""
+
+    def __init__(self, driver, timeout=READY_TIMEOUT, quiet_window=READY_QUIET_WINDOW, poll_interval=READY_POLL_INTERVAL,
+                 ready_states=("complete",)):
+        """
+        初始化就绪等待引擎
+
+        Args:
+            driver: WebDriver实例
+            timeout: 默认最长等待时间（秒）
+            quiet_window: DOM静默窗口（秒）
+            poll_interval: 轮询间隔（秒）
+            ready_states: 视为已加载的 document.readyState 取值
+        """
+        self.driver = driver
+        self.ready_states = tuple(ready_states)
+        self.timeout = timeout
+        self.quiet_window = quiet_window
+        self.poll_interval = poll_interval
+        self.stats = defaultdict(lambda: {"count": 0, "waited": 0.0, "budget": 0.0})
+
+    @traced("wait_ready", args=("label",))
+    def wait_until_ready(self, label, budget=0, locators=None, timeout=None, reset=False):
+        """
+        等待当前页面就绪：readyState为complete、DOM静默、目标容器出现
+
+        Args:
+            label: 等待场景名称（用于统计）
+            budget: 原固定等待秒数（用于对比节省时间）
+            locators: 目标容器定位器列表 [(By, value)]，任一出现即可
+            timeout: 最长等待时间（秒），默认使用配置值
+            reset: 是否重置DOM静默计时（点击等操作后使用，确保至少等待一个静默窗口）
+
+        Returns:
+            bool: 在期限内就绪返回True
+        """
+        script_locators = [[by, value] for by, value in (locators or [])]
+        quiet_ms = self.quiet_window * 1000
+        errors = 0
+
+        def ready():
+            nonlocal reset, errors
+            try:
+                state = self.driver.execute_script(READY_STATE_SCRIPT, reset, script_locators)
+            except Exception as e:
+                errors += 1
+                logger.debug(f"读取页面就绪状态失败: {str(e)}")
+                # 连续失败（如非HTML页面）时不再等待
+                return errors >= 3
+            reset = False
+            if not isinstance(state, dict):
+                return True
+            return state.get("state") in self.ready_states and state.get("quiet", 0) >= quiet_ms and state.get("found", True)
+
+        return self.wait_for(ready, label, budget, timeout)
+
+    def wait_for(self, condition, label, budget=0, timeout=None, poll_interval=None):
+        """
+        轮询等待任意条件成立
+
+        Args:
+            condition: 无参可调用对象，返回真值表示条件成立
+            label: 等待场景名称（用于统计）
+            budget: 原固定等待秒数（用于对比节省时间）
+            timeout: 最长等待时间（秒），默认使用配置值
+            poll_interval: 轮询间隔（秒），默认使用配置值
+
+        Returns:
+            bool: 在期限内条件成立返回True
+        """
+        timeout = self.timeout if timeout is None else timeout
+        poll_interval = self.poll_interval if poll_interval is None else poll_interval
+        start = time.time()
+        deadline = start + timeout
+        satisfied = False
+        while True:
+            try:
+                satisfied = bool(condition())
+            except Exception as e:
+                logger.debug(f"就绪条件检查出错 [{label}]: {str(e)}")
+            if satisfied or time.time() >= deadline:
+                break
+            time.sleep(poll_interval)
+
+        waited = time.time() - start
+        self._record(label, waited, budget)
+        if satisfied:
+            logger.debug(f"就绪等待 [{label}]: 实际 {waited:.2f}s / 原固定 {budget:.1f}s")
+        else:
+            logger.debug(f"就绪等待超时 [{label}]: 实际 {waited:.2f}s / 原固定 {budget:.1f}s")
+        return satisfied
+
+    def _record(self, label, waited, budget):
+        """记录单次等待耗时"""
+        item = self.stats[label]
+        item["count"] += 1
+        item["waited"] += waited
+        item["budget"] += budget
+
+    def log_summary(self):
+        """打印各场景实际等待时间与原固定等待时间的对比"""
+        total_waited = 0.0
+        total_budget = 0.0
+        for label, item in sorted(self.stats.items()):
+            total_waited += item["waited"]
+            total_budget += item["budget"]
+            logger.info(
+                f"就绪等待 [{label}] 次数={item['count']} 实际={item['waited']:.1f}s "
+                f"原固定={item['budget']:.1f}s 节省={item['budget'] - item['waited']:.1f}s"
+            )
+        if self.stats:
+            logger.info(f"就绪等待合计: 实际 {total_waited:.1f}s / 原固定 {total_budget:.1f}s，节省 {total_budget - total_waited:.1f}s")
+
+
 class BrowserManager:
     """浏览器管理器类"""
 
-    def __init__(self, browser_type=BROWSER_TYPE, headless=HEADLESS_MODE):
+    def __init__(self, browser_type=BROWSER_TYPE, headless=HEADLESS_MODE, lean=LEAN_PROFILE,
+                 record_dir=RECORD_FIXTURES_DIR, replay_dir=REPLAY_FIXTURES_DIR):
         """
         初始化浏览器管理器
 
         Args:
             browser_type: 浏览器类型（仅支持 'edge'）
             headless: 是否使用无头模式
+            lean: 是否使用精简加载配置（eager加载、屏蔽图片/字体/媒体/统计脚本）
+            record_dir: 录制目录；提供时把访问过的页面HTML保存为回放夹具
+            replay_dir: 回放目录；提供时不启动浏览器，由 ReplayDriver 从夹具读取页面
         """
         self.browser_type = browser_type.lower()
         self.headless = headless
+        self.offline = replay_dir is not None
+        self.lean = lean and not self.offline
+        self.recorder = FixtureArchive(record_dir) if record_dir else None
+        self.replay_dir = replay_dir
+        self.page_metrics = []
         self.driver = None
+        self.readiness = None
+        self.locator = None
         self._init_driver()
 
     def _init_driver(self):
         """初始化WebDriver"""
         try:
-            if self.browser_type == "edge":
+            if self.offline:
+                self.driver = ReplayDriver(self.replay_dir)
+                logger.info(f"✓ 回放模式：从 {self.replay_dir} 读取 {len(self.driver.archive)} 个已录制页面")
+            elif self.browser_type == "edge":
                 self.driver = self._create_edge_driver()
                 logger.info("✓ Edge浏览器已启动")
             else:
@@ -48,11 +186,39 @@ class BrowserManager:
             # 设置超时
             self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
             self.driver.implicitly_wait(IMPLICIT_WAIT_TIME)
+            if self.lean:
+                self.apply_lean_profile()
+            # eager 加载策略下 DOM 可用即返回，就绪判断接受 interactive 状态
+            ready_states = ("interactive", "complete") if self.lean and PAGE_LOAD_STRATEGY != "normal" else ("complete",)
+            self.readiness = PageReadiness(self.driver, ready_states=ready_states)
+            self.locator = ElementLocator(self.driver)
 
         except Exception as e:
             logger.error(f"❌ 浏览器初始化失败: {str(e)}")
             raise
 
+    def apply_lean_profile(self, log=True):
+        """
+        通过 CDP 为当前标签屏蔽图片、字体、媒体与第三方统计请求（可选屏蔽CSS）
+
+        CDP 设置只作用于当前标签，新开标签需在加载页面前再次调用。
+
+        Args:
+            log: 是否输出启用日志
+        """
+        if not self.lean:
+            return
+        patterns = list(BLOCKED_URL_PATTERNS)
+        if BLOCK_CSS:
+            patterns.extend(BLOCKED_CSS_PATTERNS)
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            if log:
+                logger.info(f"✓ 精简加载已启用（加载策略 {PAGE_LOAD_STRATEGY}，屏蔽 {len(patterns)} 类资源）")
+        except Exception as e:
+            logger.warning(f"⚠ 设置资源屏蔽失败，按完整资源加载: {str(e)}")
+
     # 移除 Chrome 支持：仅保留 Edge
 
     def _create_edge_driver(self):
@@ -65,11 +231,16 @@ class BrowserManager:
         options.add_experimental_option('useAutomationExtension', False)
 
         # 设置用户代理
-        options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0')
+        options.add_argument(f'user-agent={USER_AGENT}')
 
         if self.headless:
             options.add_argument('--headless=new')
 
+        if self.lean:
+            options.page_load_strategy = PAGE_LOAD_STRATEGY
+            # 浏览器偏好中同时禁止图片，作为 CDP 屏蔽之外的兜底
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
 
@@ -97,17 +268,108 @@ class BrowserManager:
         """获取WebDriver实例"""
         return self.driver
 
+    @traced("navigate", args=("url",))
+    @timed("navigate")
     def navigate_to(self, url):
         """导航到指定URL"""
         try:
             logger.info(f"正在访问: {url}")
             self.driver.get(url)
-            time.sleep(2)  # 等待页面加载
+            self.wait_until_ready("navigate", budget=2)
+            self.record_page_metrics("navigate")
+            self.record_fixture(url)
             return True
         except Exception as e:
             logger.error(f"❌ 访问URL失败: {str(e)}")
             return False
 
+    def record_fixture(self, url=None):
+        """
+        录制模式下保存当前页面HTML（页面就绪后调用）
+
+        Args:
+            url: 请求的URL；与跳转后的地址不同时两者都记录，回放时按任一地址都能命中
+        """
+        if self.recorder is None:
+            return
+        try:
+            current_url = self.driver.current_url
+            self.recorder.save(url or current_url, self.driver.page_source, final_url=current_url)
+        except Exception as e:
+            logger.warning(f"⚠ 录制页面失败: {str(e)}")
+
+    def record_page_metrics(self, label):
+        """
+        记录当前页面的传输字节数与加载耗时
+
+        Args:
+            label: 页面类别（如 'navigate'、'detail'）
+
+        Returns:
+            dict: {'label', 'url', 'bytes', 'resources', 'load_ms'}；未启用或读取失败返回None
+        """
+        if not REPORT_PAGE_METRICS:
+            return None
+        try:
+            metrics = self.driver.execute_script(PAGE_METRICS_SCRIPT)
+        except Exception as e:
+            logger.debug(f"读取页面加载指标失败: {str(e)}")
+            return None
+        if not isinstance(metrics, dict):
+            return None
+        item = {
+            "label": label,
+            "url": self.driver.current_url,
+            "bytes": int(metrics.get("bytes") or 0),
+            "resources": int(metrics.get("resources") or 0),
+            "load_ms": float(metrics.get("load_ms") or 0),
+        }
+        self.page_metrics.append(item)
+        logger.debug(f"页面指标 [{label}] {item['bytes'] / 1024:.1f}KB / {item['resources']} 个资源 / {item['load_ms']:.0f}ms")
+        return item
+
+    def log_page_metrics(self):
+        """按页面类别打印平均传输字节数与加载耗时"""
+        groups = defaultdict(list)
+        for item in self.page_metrics:
+            groups[item["label"]].append(item)
+        profile = "精简" if self.lean else "完整"
+        for label, items in sorted(groups.items()):
+            count = len(items)
+            total_bytes = sum(i["bytes"] for i in items)
+            avg_load = sum(i["load_ms"] for i in items) / count
+            logger.info(
+                f"页面加载 [{label}]（{profile}配置）页数={count} 平均 {total_bytes / count / 1024:.1f}KB "
+                f"平均加载 {avg_load:.0f}ms 合计 {total_bytes / 1024 / 1024:.2f}MB"
+            )
+
+    def wait_until_ready(self, label, budget=0, locators=None, timeout=None, reset=False):
+        """
+        等待当前页面就绪（参数见 PageReadiness.wait_until_ready）
+
+        Returns:
+            bool: 在期限内就绪返回True
+        """
+        return self.readiness.wait_until_ready(label, budget=budget, locators=locators, timeout=timeout, reset=reset)
+
+    def wait_for(self, condition, label, budget=0, timeout=None, poll_interval=None):
+        """
+        轮询等待任意条件成立（参数见 PageReadiness.wait_for）
+
+        Returns:
+            bool: 在期限内条件成立返回True
+        """
+        return self.readiness.wait_for(condition, label, budget=budget, timeout=timeout, poll_interval=poll_interval)
+
+    def find_first(self, locator_list, timeout=0, log_failure=True):
+        """
+        查找多个候选定位器中第一个匹配的元素（参数见 ElementLocator.find_first）
+
+        Returns:
+            WebElement: 匹配的元素，未找到返回None
+        """
+        return self.locator.find_first(locator_list, timeout=timeout, log_failure=log_failure)
+
     def wait_for_element(self, by, value, timeout=10):
         """等待元素出现"""
         try:
@@ -133,6 +395,7 @@ class BrowserManager:
         try:
             if self.driver:
                 self.driver.quit()
+                self.driver = None
                 logger.info("✓ 浏览器已关闭")
         except Exception as e:
             logger.error(f"❌ 关闭浏览器失败: {str(e)}")
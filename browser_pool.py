@@ -0,0 +1,183 @@
+import logging
+import queue
+import threading
+from browser_manager import BrowserManager
+from config import BASE_URL, BROWSER_TYPE, HEADLESS_MODE, BROWSER_POOL_SIZE
+
+
+logger = logging.getLogger(__name__)
+
+
+class CollectedData:
+    """线程安全的数据列表（替代普通 list 存放采集结果）"""
+
+    def __init__(self, items=None):
+        """
+        初始化数据列表
+
+        Args:
+            items: 初始数据
+        """
+        self._lock = threading.Lock()
+        self._items = list(items or [])
+
+    def append(self, item):
+        """追加单条数据"""
+        with self._lock:
+            self._items.append(item)
+
+    def extend(self, items):
+        """追加多条数据"""
+        items = list(items)
+        with self._lock:
+            self._items.extend(items)
+
+    def snapshot(self):
+        """
+        获取当前数据的副本
+
+        Returns:
+            list: 数据列表副本
+        """
+        with self._lock:
+            return list(self._items)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def __getitem__(self, index):
+        with self._lock:
+            return self._items[index]
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+class BrowserPool:
+    """浏览器工作池：多个浏览器实例共享登录Cookie，并发提取详情页"""
+
+    def __init__(self, size=BROWSER_POOL_SIZE, browser_type=BROWSER_TYPE, headless=HEADLESS_MODE, primary=None):
+        """
+        初始化浏览器池
+
+        Args:
+            size: 浏览器实例总数（含主浏览器）
+            browser_type: 浏览器类型
+            headless: 是否使用无头模式
+            primary: 已登录的主BrowserManager；为None时由池自行创建
+        """
+        self.size = max(1, int(size))
+        self.browser_type = browser_type
+        self.headless = headless
+        self.managers = []
+
+        if primary is None:
+            primary = BrowserManager(browser_type=browser_type, headless=headless)
+        self.managers.append(primary)
+
+        for idx in range(2, self.size + 1):
+            try:
+                self.managers.append(BrowserManager(browser_type=browser_type, headless=headless))
+                logger.info(f"✓ 浏览器池实例 {idx}/{self.size} 已启动")
+            except Exception as e:
+                logger.warning(f"⚠ 浏览器池实例 {idx}/{self.size} 启动失败: {str(e)}")
+
+        logger.info(f"✓ 浏览器池就绪，共 {len(self.managers)} 个实例")
+
+    @property
+    def primary(self):
+        """主浏览器（已登录）"""
+        return self.managers[0]
+
+    def share_cookies(self, base_url=BASE_URL):
+        """
+        将主浏览器的登录Cookie同步到其余实例
+
+        Args:
+            base_url: 写入Cookie前需要先访问的站点地址
+
+        Returns:
+            int: 同步成功的实例数
+        """
+        try:
+            cookies = self.primary.get_driver().get_cookies()
+        except Exception as e:
+            logger.error(f"❌ 读取主浏览器Cookie失败: {str(e)}")
+            return 0
+
+        synced = 0
+        for manager in self.managers[1:]:
+            try:
+                manager.navigate_to(base_url)
+                driver = manager.get_driver()
+                for cookie in cookies:
+                    cookie = {k: v for k, v in cookie.items() if k in ("name", "value", "domain", "path", "secure", "httpOnly", "expiry")}
+                    try:
+                        driver.add_cookie(cookie)
+                    except Exception as e:
+                        logger.debug(f"写入Cookie失败 {cookie.get('name')}: {str(e)}")
+                driver.refresh()
+                synced += 1
+            except Exception as e:
+                logger.warning(f"⚠ 同步Cookie到浏览器池实例失败: {str(e)}")
+
+        logger.info(f"✓ 已将登录Cookie同步到 {synced} 个浏览器实例")
+        return synced
+
+    def run_tasks(self, tasks, handler):
+        """
+        从共享队列分发任务给各浏览器实例并发执行
+
+        Args:
+            tasks: 任务列表（如详情链接字典）
+            handler: 处理函数 handler(browser_manager, task) -> 结果
+
+        Returns:
+            list: 与tasks顺序一致的结果列表（失败的任务为None）
+        """
+        task_queue = queue.Queue()
+        for index, task in enumerate(tasks):
+            task_queue.put((index, task))
+        results = [None] * len(tasks)
+
+        def worker(manager):
+            while True:
+                try:
+                    index, task = task_queue.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    results[index] = handler(manager, task)
+                except Exception as e:
+                    logger.warning(f"⚠ 浏览器池任务失败: {str(e)}")
+
+        threads = []
+        for manager in self.managers[:max(1, len(tasks))]:
+            thread = threading.Thread(target=worker, args=(manager,), daemon=True)
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def close(self):
+        """关闭池内所有浏览器实例"""
+        for manager in self.managers:
+            manager.close()
+        logger.info(f"✓ 浏览器池已关闭（{len(self.managers)} 个实例）")
+
+    def __len__(self):
+        return len(self.managers)
+
+    def __enter__(self):
+        """上下文管理器入口"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """上下文管理器出口"""
+        self.close()
@@ -1,13 +1,15 @@
 # 天眼查爬虫配置文件
 
+import os
+
 # 登录信息
 LOGIN_USERNAME = "1336xxxxxxx"  # 替换为你的天眼查账号
 LOGIN_PASSWORD = "***********"  # 替换为你的密码
 
-# 网站URL
-BASE_URL = "https://www.tianyancha.com"
-LOGIN_URL = "https://www.tianyancha.com/login"
-SEARCH_URL_TEMPLATE = "https://www.tianyancha.com/s/toubiao/detail?key={keyword}"
+# 网站URL（可用环境变量 TYC_BASE_URL 指向本地模拟站点 mock_site.py 进行压测）
+BASE_URL = os.environ.get("TYC_BASE_URL", "https://www.tianyancha.com").rstrip("/")
+LOGIN_URL = f"{BASE_URL}/login"
+SEARCH_URL_TEMPLATE = BASE_URL + "/s/toubiao/detail?key={keyword}"
 
 # 搜索关键字
 KEYWORDS = [
@@ -21,16 +23,100 @@ KEYWORDS = [
 # 时间过滤配置
 DATE_FILTER_START = "2020-01-01"  # 开始日期
 DATE_FILTER_END = "2025-11-30"    # 结束日期
+LIST_DATE_PREFILTER = True  # 按列表项日期跳过不在范围内的详情页（列表项无日期时仍打开详情页判断）
+RESULTS_SORTED_BY_DATE = True  # 搜索结果按发布日期倒序：整页早于开始日期时停止翻页
+
+# 按发布日期分片搜索（python main.py --shard 开启：关键词按日期区间拆分，突破翻页上限与站点结果数上限）
+SEARCH_DATE_PARAMS = ("startDate", "endDate")  # 搜索页发布日期筛选的URL参数名（按站点实际参数修改；不支持时设为None，不拆分）
+SHARD_INITIAL_DAYS = 365  # 初始分片跨度（天）
+SHARD_MIN_DAYS = 1  # 分片最小跨度（天）；最小分片仍达到翻页上限时记为截断
+SHARD_WORKERS = 1  # 并发执行的分片数（>1 时需HTTP快速通道可用，浏览器通道仍串行执行）
 
 # 浏览器配置
 BROWSER_TYPE = "edge"  # 可选: chrome, edge
 HEADLESS_MODE = False  # True表示无头模式，False表示有界面
-IMPLICIT_WAIT_TIME = 10  # 隐式等待时间（秒）
+IMPLICIT_WAIT_TIME = 0  # 隐式等待时间（秒）；保持为0，元素查找使用显式截止时间
+LOCATOR_POLL_INTERVAL = 0.2  # 元素定位轮询间隔（秒）
+
+# 精简加载配置（只读取文本，屏蔽图片、字体、媒体与第三方统计脚本）
+LEAN_PROFILE = True  # False表示按完整资源加载页面（原有方式，可用于对比）
+PAGE_LOAD_STRATEGY = "eager"  # 精简模式下的页面加载策略：normal / eager / none
+BLOCK_CSS = False  # 是否同时屏蔽样式表（可能影响依赖样式判断可见性的元素）
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m4a", "*.flv",
+    "*google-analytics.com*", "*googletagmanager.com*", "*hm.baidu.com*",
+    "*cnzz.com*", "*51.la*", "*growingio.com*", "*sensorsdata*", "*zhugeio.com*",
+]
+BLOCKED_CSS_PATTERNS = ["*.css"]
+REPORT_PAGE_METRICS = True  # 是否统计每个页面的传输字节数与加载耗时
 PAGE_LOAD_TIMEOUT = 30  # 页面加载超时时间（秒）
+BROWSER_POOL_SIZE = 1  # 详情页并发浏览器数量（1表示不启用浏览器池）
+
+# 页面就绪等待配置（按 readyState / DOM静默 / 目标容器判断，替代固定等待）
+READY_TIMEOUT = 10  # 单次就绪等待的最长时间（秒）
+READY_QUIET_WINDOW = 0.3  # DOM无变化持续多久视为渲染完成（秒）
+READY_POLL_INTERVAL = 0.1  # 就绪状态轮询间隔（秒）
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0"
+
+# HTTP快速通道配置（复用浏览器登录Cookie，直接请求页面HTML）
+HTTP_FAST_PATH = True  # True表示优先用HTTP抓取列表/详情页，遇到验证页回退浏览器
+HTTP_POOL_SIZE = 4  # 连接池大小（keep-alive 连接数上限）
+HTTP_TIMEOUT = 15  # 单次请求超时时间（秒）
+HTTP_MAX_CHALLENGES = 3  # 连续遇到验证页的次数上限，超过后本次运行停用HTTP通道
+
+# 页面解析配置
+# offline: 每页只取一次 page_source，用预编译的 lxml XPath 离线解析（浏览器可继续处理下一页）
+# script: 注入脚本一次往返提取；element: 逐元素读取（最慢，仅用于排查）
+PARSE_MODE = "offline"
+PARSE_WORKERS = 2  # 离线解析线程数
+
+# 页面缓存配置（磁盘缓存压缩后的页面HTML，重复运行时跳过网络请求）
+PAGE_CACHE_ENABLED = True
+PAGE_CACHE_DIR = "cache/pages"
+PAGE_CACHE_MAX_MB = 512  # 缓存总容量上限（MB），超出后按最近访问时间淘汰
+# 按URL片段匹配TTL（秒），按顺序匹配，None表示永不过期
+PAGE_CACHE_TTL = [
+    ("/bid/", None),  # 招投标详情页内容发布后不再变化
+    ("/s/toubiao", 3600),  # 搜索列表会随新公告变化，只缓存1小时
+]
+PAGE_CACHE_DEFAULT_TTL = 24 * 3600  # 未匹配任何规则时的TTL（秒）
+
+# 页面录制与回放（用于离线调试与测试，None表示关闭）
+RECORD_FIXTURES_DIR = None  # 录制：把浏览器访问过的页面HTML保存到该目录，如 "fixtures/toubiao"
+REPLAY_FIXTURES_DIR = None  # 回放：不启动浏览器，从该目录读取已录制页面（同时关闭HTTP快速通道与页面缓存）
 
 # 输出配置
 OUTPUT_EXCEL_FILE = "天眼查招投标数据.xlsx"
 OUTPUT_FOLDER = "output"
+CRAWL_JOURNAL_FILE = "output/crawl_journal.db"  # 采集日志（逐条记录已完成的详情页，python main.py --resume 续跑）
+EXCEL_MAX_ROWS = 1048576  # 单个工作表最大行数（xlsx上限，含标题行与列头行），写满后新建工作表
+OUTPUT_SINKS = ["excel", "csv", "jsonl", "store"]  # 同时写出的格式（excel / csv / jsonl / sqlite / store），每个关键词完成后由后台线程追加写入
+RESULT_STORE_FILE = "output/results.db"  # 本地结果库（跨运行合并，python result_store.py query 按条件导出）
+RESULT_STORE_BATCH = 500  # 结果库每个事务写入的记录数
+EXCEL_SHEETS_PER_FILE = 4  # 单个Excel文件最多工作表数，写满后另起新文件（文件名加 _2、_3 后缀）
+
+# 阶段耗时统计（导航、等待、翻页、详情页、登录等待、导出，按阶段与关键词统计 p50/p95/max）
+METRICS_ENABLED = True
+METRICS_JSON_FILE = "output/metrics.json"  # 运行结束写出的JSON报告
+METRICS_PROM_FILE = "output/metrics.prom"  # Prometheus 文本格式（可由 node_exporter textfile collector 采集）
+
+# 区间追踪（关键词 → 页面 → 详情页 → 子步骤，按线程记录，输出 Chrome Trace Event JSON）
+TRACE_ENABLED = False  # 默认关闭；python main.py --trace 临时开启
+TRACE_FILE = "output/trace.json"  # 可在 chrome://tracing 或 https://ui.perfetto.dev 打开
+
+# 性能剖析（python main.py --profile 开启：每个关键词与导出分别用 cProfile + tracemalloc 剖析）
+PROFILE_DIR = "output/profile"  # 每个标签写出 <标签>.pstats 与 <标签>_report.txt
+PROFILE_TOP_N = 30  # 报告中列出的耗时函数与内存分配代码行数量
+PROFILE_TRACEMALLOC_FRAMES = 1  # tracemalloc 调用栈帧数（1 按代码行汇总，更多帧可看到调用链但更慢）
+
+# 行政区划表（省份, 城市, 区县, 别名；相对路径按程序目录解析，可替换为含全部区县的完整区划表）
+REGION_DATA_FILE = "data/regions.csv"
+
+# 医院词典（名称, 别名, 省份, 城市；省份/城市为空时由名称解析），正文提及的医院写入“覆盖医院”
+HOSPITAL_DICT_FILE = "data/hospitals.csv"
+HOSPITAL_AUTOMATON_CACHE = "cache/hospital_automaton.pickle"  # 构建好的自动机，词典与区划表内容未变化时直接载入
 
 # 数据字段
 OUTPUT_COLUMNS = [
@@ -0,0 +1,212 @@
+import os
+import json
+import time
+import logging
+import sqlite3
+import threading
+from config import CRAWL_JOURNAL_FILE
+
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlJournal:
+    """采集日志：在SQLite中逐条记录已完成的详情页、页面与关键词，支持中断后续跑"""
+
+    def __init__(self, path=CRAWL_JOURNAL_FILE, resume=False):
+        """
+        初始化采集日志
+
+        Args:
+            path: 日志数据库文件路径
+            resume: 是否续跑；False 时清空上次运行的记录
+        """
+        self.path = path
+        self.resume = resume
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL模式下每次提交即落盘，进程崩溃不会丢失已提交的记录
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # 早期版本的页面表不含搜索URL列，无法区分同一关键词的不同分片，丢弃后按新结构重建
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(pages)")]
+        if columns and "search" not in columns:
+            self._conn.execute("DROP TABLE pages")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS bids ("
+            "keyword TEXT, url TEXT, data TEXT, created REAL, PRIMARY KEY (keyword, url));"
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "keyword TEXT, search TEXT, page INTEGER, items INTEGER, urls TEXT, next_url TEXT, last INTEGER, "
+            "created REAL, PRIMARY KEY (keyword, search, page));"
+            "CREATE TABLE IF NOT EXISTS keywords ("
+            "keyword TEXT PRIMARY KEY, items INTEGER, created REAL);"
+        )
+        if resume:
+            logger.info(f"✓ 断点续跑：已载入采集日志 {path}（{self._summary()}）")
+        else:
+            self._conn.executescript("DELETE FROM bids; DELETE FROM pages; DELETE FROM keywords;")
+        self._conn.commit()
+
+    def _summary(self):
+        """已完成的关键词、页面与详情页数量描述"""
+        keywords = self._conn.execute("SELECT COUNT(*) FROM keywords").fetchone()[0]
+        pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        bids = self._conn.execute("SELECT COUNT(*) FROM bids").fetchone()[0]
+        return f"关键词 {keywords} 个，页面 {pages} 个，详情页 {bids} 个"
+
+    def record_bid(self, keyword, url, record):
+        """
+        记录一个已完成的详情页
+
+        Args:
+            keyword: 搜索关键词
+            url: 详情页URL
+            record: 提取到的数据字典；None表示被日期过滤排除
+        """
+        data = json.dumps(record, ensure_ascii=False) if record is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO bids (keyword, url, data, created) VALUES (?, ?, ?, ?)",
+                (keyword, url, data, time.time()),
+            )
+            self._conn.commit()
+
+    def update_bid(self, url, record):
+        """
+        更新已记录详情页的数据（如合并了新的关键词）
+
+        Args:
+            url: 详情页URL
+            record: 数据字典
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE bids SET data = ? WHERE url = ? AND data IS NOT NULL",
+                (json.dumps(record, ensure_ascii=False), url),
+            )
+            self._conn.commit()
+
+    def get_bids(self, keyword, urls):
+        """
+        查询已完成的详情页
+
+        Args:
+            keyword: 搜索关键词
+            urls: 详情页URL列表
+
+        Returns:
+            dict: {url: 数据字典或None}，只包含已完成的URL
+        """
+        urls = list(urls)
+        if not urls:
+            return {}
+        placeholders = ",".join("?" * len(urls))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT url, data FROM bids WHERE keyword = ? AND url IN ({placeholders})",
+                [keyword] + urls,
+            ).fetchall()
+        return {url: json.loads(data) if data is not None else None for url, data in rows}
+
+    def mark_page_done(self, keyword, page, items, urls=(), next_url="", last=False, search=""):
+        """
+        记录一个已完成的搜索结果页
+
+        Args:
+            keyword: 搜索关键词
+            page: 页码
+            items: 该页提取到的数据条数
+            urls: 该页需要提取的详情页URL（续跑时据此从已完成的详情页重建该页结果）
+            next_url: 下一页URL（通过点击翻页时为空）
+            last: 是否在该页结束翻页
+            search: 首页搜索URL（含分片的发布日期区间，同一关键词的各分片分别记录页码）
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (keyword, search, page, items, urls, next_url, last, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (keyword, search, page, items, json.dumps(list(urls)), next_url or "", int(last), time.time()),
+            )
+            self._conn.commit()
+
+    def is_page_done(self, keyword, page, search=""):
+        """判断搜索结果页是否已完成"""
+        return self.get_page(keyword, page, search) is not None
+
+    def get_page(self, keyword, page, search=""):
+        """
+        查询已完成的搜索结果页
+
+        Args:
+            keyword: 搜索关键词
+            page: 页码
+            search: 首页搜索URL（见 mark_page_done）
+
+        Returns:
+            dict: {'urls', 'next_url', 'last'}；未完成返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT urls, next_url, last FROM pages WHERE keyword = ? AND search = ? AND page = ?",
+                (keyword, search, page),
+            ).fetchone()
+        if row is None:
+            return None
+        urls, next_url, last = row
+        return {"urls": json.loads(urls or "[]"), "next_url": next_url or "", "last": bool(last)}
+
+    def mark_keyword_done(self, keyword, items):
+        """
+        记录一个已完成的关键词
+
+        Args:
+            keyword: 搜索关键词
+            items: 该关键词采集到的数据条数
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO keywords (keyword, items, created) VALUES (?, ?, ?)",
+                (keyword, items, time.time()),
+            )
+            self._conn.commit()
+
+    def is_keyword_done(self, keyword):
+        """判断关键词是否已完成"""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM keywords WHERE keyword = ?", (keyword,)).fetchone()
+        return row is not None
+
+    def load_records(self, keyword=None):
+        """
+        读取已记录的数据（按记录顺序，不含被日期过滤排除的详情页）
+
+        Args:
+            keyword: 只读取该关键词的数据；None表示全部
+
+        Returns:
+            list: 数据字典列表
+        """
+        sql = "SELECT data FROM bids WHERE data IS NOT NULL"
+        params = []
+        if keyword is not None:
+            sql += " AND keyword = ?"
+            params.append(keyword)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY rowid", params).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def flush(self):
+        """提交未写入的记录并合并WAL到主数据库"""
+        with self._lock:
+            self._conn.commit()
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        """关闭采集日志"""
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,149 @@
+"""
+发布日期解析与过滤
+
+列表页与详情页出现的日期写法（2023-05-06、2023年5月6日、2023/05/06、2023.5.6、20230506、
+05-06、5月6日、3天前、昨天、刚刚……）统一解析为 datetime.date。所有正则在模块加载时编译，
+过滤区间（DATE_FILTER_START / DATE_FILTER_END）只解析一次。
+"""
+
+import re
+from datetime import date, timedelta
+from config import DATE_FILTER_START, DATE_FILTER_END
+
+
+# 按优先级排列：完整日期 > 紧凑日期 > 相对日期 > 无年份日期（默认今年，晚于今天时取去年）
+FULL_DATE_PATTERN = re.compile(r'(\d{4})\s*[-年/.]\s*(\d{1,2})\s*[-月/.]\s*(\d{1,2})')
+COMPACT_DATE_PATTERN = re.compile(r'(?<!\d)((?:19|20)\d{2})(\d{2})(\d{2})(?!\d)')
+RELATIVE_PATTERN = re.compile(r'(\d+)\s*(分钟|小时|天|日|周|星期|个月|月|年)前')
+RELATIVE_WORDS = {"刚刚": 0, "今天": 0, "今日": 0, "昨天": 1, "昨日": 1, "前天": 2}
+RELATIVE_WORD_PATTERN = re.compile("|".join(RELATIVE_WORDS))
+MONTH_DAY_PATTERN = re.compile(r'(?<![\d年/.-])(\d{1,2})\s*(?:月\s*(\d{1,2})\s*日|[-/.]\s*(\d{1,2})(?![\d/.-]))')
+RELATIVE_DAYS = {"分钟": 0, "小时": 0, "天": 1, "日": 1, "周": 7, "星期": 7, "个月": 30, "月": 30, "年": 365}
+
+FILTER_START = date.fromisoformat(DATE_FILTER_START)
+FILTER_END = date.fromisoformat(DATE_FILTER_END)
+
+
+def _make_date(year, month, day):
+    """构造日期，非法日期（如2月30日）返回None"""
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def parse_date(text, today=None):
+    """
+    解析发布日期文本
+
+    Args:
+        text: 日期文本（可夹带其他文字，如“发布于 2021-01-15 10:00”）
+        today: 相对日期与无年份日期的参照日，默认今天
+
+    Returns:
+        date: 日期；无法识别时返回None
+    """
+    if not text:
+        return None
+
+    match = FULL_DATE_PATTERN.search(text)
+    if match:
+        return _make_date(*match.groups())
+
+    match = COMPACT_DATE_PATTERN.search(text)
+    if match:
+        return _make_date(*match.groups())
+
+    today = today or date.today()
+    match = RELATIVE_PATTERN.search(text)
+    if match:
+        return today - timedelta(days=int(match.group(1)) * RELATIVE_DAYS[match.group(2)])
+    match = RELATIVE_WORD_PATTERN.search(text)
+    if match:
+        return today - timedelta(days=RELATIVE_WORDS[match.group(0)])
+
+    match = MONTH_DAY_PATTERN.search(text)
+    if match:
+        month, day = int(match.group(1)), int(match.group(2) or match.group(3))
+        value = _make_date(today.year, month, day)
+        if value and value > today:
+            value = _make_date(today.year - 1, month, day)
+        return value
+    return None
+
+
+def parse_dates(texts, today=None):
+    """
+    批量解析（相同文本只解析一次，适合对结果库或导出数据重新过滤）
+
+    Args:
+        texts: 日期文本的可迭代对象
+        today: 相对日期的参照日，默认今天
+
+    Returns:
+        list: date 或 None，与输入一一对应
+    """
+    today = today or date.today()
+    parsed = {}
+    results = []
+    for text in texts:
+        if text not in parsed:
+            parsed[text] = parse_date(text, today)
+        results.append(parsed[text])
+    return results
+
+
+def has_year(text):
+    """
+    判断文本是否为带年份的绝对日期（相对日期与无年份日期的结果依赖参照日）
+
+    Returns:
+        bool: 带年份时返回True
+    """
+    return bool(text) and bool(FULL_DATE_PATTERN.search(text) or COMPACT_DATE_PATTERN.search(text))
+
+
+def normalize_date(text, today=None):
+    """
+    规范为 YYYY-MM-DD
+
+    Returns:
+        str: 规范化日期；无法识别时返回空字符串
+    """
+    value = parse_date(text, today)
+    return value.isoformat() if value else ""
+
+
+def in_filter_range(value, start=FILTER_START, end=FILTER_END):
+    """
+    判断日期是否在过滤区间内（含两端）
+
+    Args:
+        value: date
+        start: 区间起点，None表示不限
+        end: 区间终点，None表示不限
+
+    Returns:
+        bool: 在区间内返回True
+    """
+    return (start is None or value >= start) and (end is None or value <= end)
+
+
+def filter_records(records, start=FILTER_START, end=FILTER_END, column="成立日期", keep_unknown=True):
+    """
+    按发布日期批量重新过滤记录
+
+    Args:
+        records: 数据字典列表
+        start: 区间起点（date），None表示不限
+        end: 区间终点（date），None表示不限
+        column: 日期列
+        keep_unknown: 是否保留日期无法识别的记录（与采集时一致：无法识别时不过滤）
+
+    Returns:
+        list: 区间内的记录
+    """
+    records = list(records)
+    dates = parse_dates(record.get(column) for record in records)
+    return [record for record, value in zip(records, dates)
+            if (value is None and keep_unknown) or (value is not None and in_filter_range(value, start, end))]
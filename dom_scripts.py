@@ -0,0 +1,165 @@
+"""
+注入页面执行的 JavaScript 提取函数
+
+每个脚本在一次 execute_script 往返内完成整页提取，返回可直接序列化的 JSON 结构，
+避免逐个元素调用 get_attribute / .text 产生的大量 WebDriver 往返。
+"""
+
+# 搜索结果页：返回 [{url, name, date}]
+# arguments[0]: 最大条目数
+LIST_EXTRACT_SCRIPT = r"""
+var maxItems = arguments[0] || 20;
+var classPattern = /result|item|list/;
+
+function className(el) {
+    var c = el.className;
+    if (c && typeof c === 'object' && c.baseVal !== undefined) { c = c.baseVal; }
+    return c || '';
+}
+
+function inResult(el) {
+    for (var p = el.parentElement; p; p = p.parentElement) {
+        if (classPattern.test(className(p))) { return true; }
+    }
+    return false;
+}
+
+// 向上找到只包含当前链接的最大祖先节点，作为该结果项的范围
+function itemScope(el) {
+    var scope = el;
+    for (var p = el.parentElement; p && p !== document.body; p = p.parentElement) {
+        if (p.querySelectorAll("a[href*='/bid/']").length > 1) { break; }
+        scope = p;
+    }
+    return scope;
+}
+
+var datePattern = /\d{4}\s*[-年\/.]\s*\d{1,2}\s*[-月\/.]\s*\d{1,2}/;
+var relativeDatePattern = /\d+\s*(?:分钟|小时|天|周|个月)前|刚刚|今天|昨天|前天/;
+var anchors = document.querySelectorAll("a[href*='/bid/']");
+var links = [];
+var seen = {};
+for (var i = 0; i < anchors.length && links.length < maxItems; i++) {
+    var a = anchors[i];
+    if (!inResult(a)) { continue; }
+    var url = a.href;
+    var name = (a.innerText || a.textContent || '').trim();
+    if (!url || !name || seen[url]) { continue; }
+    seen[url] = true;
+    var scope = itemScope(a);
+    var itemText = scope.innerText || scope.textContent || '';
+    var match = itemText.match(datePattern) || itemText.match(relativeDatePattern);
+    links.push({url: url, name: name, date: match ? match[0] : ''});
+}
+return links;
+"""
+
+# 招投标详情页：返回 {date_text, text}（地址等字段由 Python 端 extract_fields 从正文提取）
+DETAIL_EXTRACT_SCRIPT = r"""
+function firstByXPath(xpath) {
+    try {
+        return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } catch (e) {
+        return null;
+    }
+}
+
+function textOf(el) {
+    return el ? (el.innerText || el.textContent || '').trim() : '';
+}
+
+var dateXPaths = [
+    "//*[contains(text(),'发布日期') or contains(text(),'公告日期') or contains(text(),'发布时间')]/following-sibling::*[1]",
+    "//*[contains(text(),'发布日期') or contains(text(),'公告日期')]/parent::*/following-sibling::*[1]",
+    "//span[contains(@class,'date') or contains(@class,'time')]",
+    "//div[contains(@class,'date') or contains(@class,'time')]"
+];
+var dateText = '';
+for (var i = 0; i < dateXPaths.length; i++) {
+    var node = firstByXPath(dateXPaths[i]);
+    if (node) { dateText = textOf(node); break; }
+}
+
+var container = document.querySelector('.bid-detail, .article, .content, .detail, .announcement')
+    || firstByXPath("//div[contains(@class,'bid') or contains(@class,'detail') or contains(@class,'content')]")
+    || document.body;
+var text = textOf(container);
+
+return {date_text: dateText, text: text};
+"""
+
+# 单次往返获取页面就绪状态：安装 MutationObserver 记录最后一次DOM变化时间，
+# 同时返回 readyState、距最后一次变化的毫秒数以及目标容器是否已出现
+READY_STATE_SCRIPT = r"""
+var reset = arguments[0], locators = arguments[1] || [];
+if (!window.__tycReady) {
+    window.__tycReady = {last: performance.now()};
+    try {
+        new MutationObserver(function () { window.__tycReady.last = performance.now(); })
+            .observe(document.documentElement || document, {childList: true, subtree: true, attributes: true, characterData: true});
+    } catch (e) {}
+}
+if (reset) { window.__tycReady.last = performance.now(); }
+var found = locators.length === 0;
+for (var i = 0; i < locators.length && !found; i++) {
+    var by = locators[i][0], value = locators[i][1];
+    try {
+        if (by === 'xpath') {
+            found = document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue !== null;
+        } else if (by === 'tag name') {
+            found = document.getElementsByTagName(value).length > 0;
+        } else {
+            found = document.querySelector(value) !== null;
+        }
+    } catch (e) {}
+}
+return {state: document.readyState, quiet: performance.now() - window.__tycReady.last, found: found};
+"""
+
+
+# 单次往返按顺序尝试全部候选定位器：返回 [命中的候选下标, 元素]，均未命中返回 null
+# arguments[0]: 候选定位器 [[by, value]]（Selenium By 取值）
+FIND_FIRST_SCRIPT = r"""
+var locators = arguments[0] || [];
+function textOf(el) { return (el.innerText || el.textContent || '').trim(); }
+function findOne(by, value) {
+    if (by === 'xpath') {
+        return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } else if (by === 'id') {
+        return document.getElementById(value);
+    } else if (by === 'name') {
+        return document.getElementsByName(value)[0] || null;
+    } else if (by === 'tag name') {
+        return document.getElementsByTagName(value)[0] || null;
+    } else if (by === 'class name') {
+        return document.getElementsByClassName(value)[0] || null;
+    } else if (by === 'link text' || by === 'partial link text') {
+        var links = document.getElementsByTagName('a');
+        for (var j = 0; j < links.length; j++) {
+            var text = textOf(links[j]);
+            if (by === 'link text' ? text === value : text.indexOf(value) >= 0) { return links[j]; }
+        }
+        return null;
+    }
+    return document.querySelector(value);
+}
+for (var i = 0; i < locators.length; i++) {
+    try {
+        var el = findOne(locators[i][0], locators[i][1]);
+        if (el) { return [i, el]; }
+    } catch (e) {}
+}
+return null;
+"""
+
+
+# 读取当前页面的传输字节数与加载耗时（Navigation/Resource Timing）
+# 注：跨域资源未返回 Timing-Allow-Origin 时 transferSize 为0，统计值为下限
+PAGE_METRICS_SCRIPT = r"""
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var resources = performance.getEntriesByType('resource');
+var bytes = nav.transferSize || 0;
+for (var i = 0; i < resources.length; i++) { bytes += resources[i].transferSize || 0; }
+var load = nav.loadEventEnd > 0 ? nav.loadEventEnd : (nav.domContentLoadedEventEnd || performance.now());
+return {bytes: bytes, resources: resources.length, load_ms: load, dcl_ms: nav.domContentLoadedEventEnd || 0};
+"""
@@ -0,0 +1,108 @@
+import time
+import logging
+from collections import defaultdict
+from config import LOCATOR_POLL_INTERVAL
+from dom_scripts import FIND_FIRST_SCRIPT
+
+
+logger = logging.getLogger(__name__)
+
+
+class ElementLocator:
+    """多定位器元素查找（要求关闭隐式等待，按调用指定的截止时间轮询）"""
+
+    def __init__(self, driver, poll_interval=LOCATOR_POLL_INTERVAL):
+        """
+        初始化定位器
+
+        Args:
+            driver: WebDriver实例（implicitly_wait 应为 0）
+            poll_interval: 轮询间隔（秒）
+        """
+        self.driver = driver
+        self.poll_interval = poll_interval
+        self.wins = defaultdict(int)
+        self.misses = 0
+
+    def find_first(self, locator_list, timeout=0, log_failure=True):
+        """
+        在截止时间内查找第一个匹配的元素
+
+        每轮用一次 execute_script 在页面内按候选顺序查找（FIND_FIRST_SCRIPT），取第一个命中者，
+        避免每个候选各一次 find_elements 往返；驱动不支持脚本时退回逐个 find_elements。
+        timeout=0 表示只查找一轮。
+
+        Args:
+            locator_list: 候选定位器列表 [(By, value)]
+            timeout: 最长等待时间（秒）
+            log_failure: 未找到时是否输出调试日志
+
+        Returns:
+            WebElement: 匹配的元素，未找到返回None
+        """
+        locator_list = list(locator_list)
+        deadline = time.time() + timeout
+        while True:
+            found = self._find_round(locator_list)
+            if found:
+                index, elem = found
+                self.wins[locator_list[index]] += 1
+                return elem
+            if time.time() >= deadline:
+                break
+            time.sleep(self.poll_interval)
+
+        self.misses += 1
+        if log_failure:
+            logger.debug(f"未定位到元素 locators={locator_list}")
+        return None
+
+    def _find_round(self, locator_list):
+        """
+        查找一轮
+
+        Returns:
+            tuple: (命中的候选下标, WebElement)，均未命中返回None
+        """
+        try:
+            found = self.driver.execute_script(FIND_FIRST_SCRIPT, [[by, value] for by, value in locator_list])
+            return tuple(found) if found else None
+        except Exception:
+            pass
+
+        for index, (by, value) in enumerate(locator_list):
+            try:
+                elems = self.driver.find_elements(by, value)
+            except Exception:
+                continue
+            if elems:
+                return index, elems[0]
+        return None
+
+    def exists(self, locator_list):
+        """
+        立即判断任一定位器是否存在匹配元素
+
+        Args:
+            locator_list: 候选定位器列表 [(By, value)]
+
+        Returns:
+            bool: 存在返回True
+        """
+        return self.find_first(locator_list, timeout=0, log_failure=False) is not None
+
+    def winner_stats(self):
+        """
+        获取各定位器命中次数
+
+        Returns:
+            dict: {(By, value): 命中次数}
+        """
+        return dict(self.wins)
+
+    def log_summary(self, top=10):
+        """打印命中次数最多的定位器"""
+        ranked = sorted(self.wins.items(), key=lambda x: x[1], reverse=True)
+        for (by, value), count in ranked[:top]:
+            logger.info(f"定位器命中 {count} 次: [{by}] {value[:80]}")
+        logger.info(f"定位器未命中次数: {self.misses}")
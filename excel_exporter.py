@@ -2,19 +2,82 @@ import os
 import sys
 from datetime import datetime
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from openpyxl.utils import get_column_letter
 from config import OUTPUT_EXCEL_FILE, OUTPUT_COLUMNS, OUTPUT_FOLDER
+from config import EXCEL_MAX_ROWS, EXCEL_SHEETS_PER_FILE
+from metrics import timed
+from tracer import traced
+
+
+XLSX_MAX_ROWS = 1048576  # xlsx 单个工作表的行数上限
+SHEET_TITLE = "招投标数据"
+TITLE_TEXT = "全国内分泌配送商联系表"
+
+COLUMN_WIDTHS = {
+    "企业名称": 30,
+    "省份": 12,
+    "企业经营范围": 40,
+    "企业地址": 35,
+    "企业法人": 15,
+    "企业联系电话": 18,
+    "成立日期": 15,
+    "营业期限": 18,
+    "注册资金": 15,
+    "统一社会信用代码": 20,
+    "纳税人识别号": 18,
+    "实际业务负责人": 18,
+    "实际联系号码": 18,
+    "代理产品类别": 25,
+    "微信/邮箱": 25,
+    "配送省份": 30,
+    "覆盖地区": 30,
+    "覆盖医院": 40
+}
+
+
+def _named_styles():
+    """标题、列头、数据单元格的共享命名样式（每个工作簿注册一次，单元格按名称引用）"""
+    fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    title = NamedStyle(name="tyc_title")
+    title.fill = fill
+    title.font = Font(bold=True, color="FFFFFF", size=14)
+    title.alignment = Alignment(horizontal="center", vertical="center")
+
+    header = NamedStyle(name="tyc_header")
+    header.fill = fill
+    header.font = Font(bold=True, color="FFFFFF", size=11)
+    header.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+
+    data = NamedStyle(name="tyc_data")
+    data.alignment = Alignment(horizontal="left", vertical="top", wrap_text=True)
+    return [title, header, data]
 
 
 class ExcelExporter:
-    """Excel导出器类"""
+    """Excel导出器类（write_only 流式写入，内存占用与数据量无关）"""
 
-    def __init__(self, filename=None):
-        """初始化Excel导出器"""
+    def __init__(self, filename=None, max_rows=EXCEL_MAX_ROWS, sheets_per_file=EXCEL_SHEETS_PER_FILE):
+        """
+        初始化Excel导出器
+
+        Args:
+            filename: 输出文件名
+            max_rows: 单个工作表的最大行数（含标题行与列头行，不超过xlsx上限）
+            sheets_per_file: 单个文件的最大工作表数，写满后另起新文件
+        """
         self.filename = filename or OUTPUT_EXCEL_FILE
         self.filepath = os.path.join(OUTPUT_FOLDER, self.filename)
+        self.max_rows = max(3, min(max_rows, XLSX_MAX_ROWS))
+        self.sheets_per_file = max(1, sheets_per_file)
         self.workbook = None
         self.worksheet = None
+        self.filepaths = []
+        self.rows_written = 0
+        self._sheet_rows = 0
+        self._sheet_count = 0
+        self._data_style = None
         self._ensure_output_folder()
 
     def _ensure_output_folder(self):
@@ -22,99 +85,138 @@ class ExcelExporter:
         if not os.path.exists(OUTPUT_FOLDER):
             os.makedirs(OUTPUT_FOLDER)
 
+    @traced("excel_export")
+    @timed("excel_export")
     def create_excel(self, data_list):
-        """创建并填充Excel文件"""
-        self.workbook = Workbook()
-        self.worksheet = self.workbook.active
-        self.worksheet.title = "招投标数据"
+        """
+        创建并填充Excel文件
 
-        # 设置表头
-        self._set_headers()
+        Args:
+            data_list: 数据字典的列表或任意迭代器（逐条写入，不会整体载入内存）
 
-        # 填充数据
+        Returns:
+            str: 第一个输出文件路径（超过行数上限时的后续文件见 filepaths）
+        """
+        self.open()
         self._fill_data(data_list)
+        return self.close()
+
+    def open(self):
+        """创建工作簿与第一个工作表"""
+        self._new_workbook()
+
+    def write(self, data_dict):
+        """
+        追加一行数据，当前工作表写满时自动新建工作表或文件
+
+        Args:
+            data_dict: 以输出列为键的数据字典
+        """
+        if self.workbook is None:
+            self.open()
+        if self._sheet_rows >= self.max_rows - 2:
+            if self._sheet_count >= self.sheets_per_file:
+                self._save_workbook()
+                self._new_workbook()
+            else:
+                self._new_sheet()
+        self.worksheet.append(self._data_row(data_dict))
+        self._sheet_rows += 1
+        self.rows_written += 1
+
+    def close(self):
+        """
+        保存当前工作簿
+
+        Returns:
+            str: 第一个输出文件路径
+        """
+        if self.workbook is None and not self.filepaths:
+            self.open()
+        if self.workbook is not None:
+            self._save_workbook()
+        print(f"✓ Excel文件已保存: {', '.join(self.filepaths)}（{self.rows_written} 行）")
+        return self.filepaths[0]
+
+    def _new_workbook(self):
+        """新建 write_only 工作簿并注册共享样式"""
+        self.workbook = Workbook(write_only=True)
+        for style in _named_styles():
+            self.workbook.add_named_style(style)
+        # 数据单元格样式只解析一次：按名称赋值每次都要查找命名样式并复制样式数组
+        self._data_style = self.workbook._named_styles["tyc_data"].as_tuple()
+        self._sheet_count = 0
+        self._new_sheet()
+
+    def _save_workbook(self):
+        """保存工作簿（第一个文件使用原文件名，之后依次加 _2、_3 后缀）"""
+        if self.filepaths:
+            name, ext = os.path.splitext(self.filepath)
+            path = f"{name}_{len(self.filepaths) + 1}{ext}"
+        else:
+            path = self.filepath
+        self.workbook.save(path)
+        self.filepaths.append(path)
+        self.workbook = None
+        self.worksheet = None
 
-        # 调整列宽
-        self._adjust_column_widths()
+    def _new_sheet(self):
+        """新建工作表并写入标题行与列头行"""
+        self._sheet_count += 1
+        title = SHEET_TITLE if self._sheet_count == 1 else f"{SHEET_TITLE}{self._sheet_count}"
+        self.worksheet = self.workbook.create_sheet(title)
+        self._sheet_rows = 0
 
-        # 保存文件
-        self.workbook.save(self.filepath)
-        print(f"✓ Excel文件已保存: {self.filepath}")
-        return self.filepath
+        # 列宽与行高须在写入第一行之前设置
+        self._adjust_column_widths()
+        self._set_headers()
 
     def _set_headers(self):
         """设置表头（第1行为标题，第2行为列头）"""
-        # 第1行：大标题
-        title_cell = self.worksheet.cell(row=1, column=1)
-        title_cell.value = "全国内分泌配送商联系表"
-        title_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        title_font = Font(bold=True, color="FFFFFF", size=14)
-        title_alignment = Alignment(horizontal="center", vertical="center")
-        title_cell.fill = title_fill
-        title_cell.font = title_font
-        title_cell.alignment = title_alignment
-
-        # 合并第1行所有列
-        self.worksheet.merge_cells(start_row=1, start_column=1, end_row=1, end_column=len(OUTPUT_COLUMNS))
+        # 第1行：大标题，合并第1行所有列
+        title_cell = WriteOnlyCell(self.worksheet, value=TITLE_TEXT)
+        title_cell.style = "tyc_title"
+        self.worksheet.merged_cells.add(f"A1:{get_column_letter(len(OUTPUT_COLUMNS))}1")
+        self.worksheet.append([title_cell])
 
         # 第2行：列头
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-
-        for col_idx, column_name in enumerate(OUTPUT_COLUMNS, 1):
-            cell = self.worksheet.cell(row=2, column=col_idx)
-            cell.value = column_name
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_alignment
+        header_row = []
+        for column_name in OUTPUT_COLUMNS:
+            cell = WriteOnlyCell(self.worksheet, value=column_name)
+            cell.style = "tyc_header"
+            header_row.append(cell)
+        self.worksheet.append(header_row)
+
+    def _data_row(self, data_dict):
+        """生成一行数据单元格（共用预先解析的数据样式，write_only 模式下单元格写出后不再修改）"""
+        row = []
+        for column_name in OUTPUT_COLUMNS:
+            value = data_dict.get(column_name, "")
+            cell = WriteOnlyCell(self.worksheet, value=value if value else "-")
+            cell._style = self._data_style
+            row.append(cell)
+        return row
 
     def _fill_data(self, data_list):
         """填充数据到Excel（从第3行开始）"""
-        for row_idx, data_dict in enumerate(data_list, 3):  # 从第3行开始
-            for col_idx, column_name in enumerate(OUTPUT_COLUMNS, 1):
-                cell = self.worksheet.cell(row=row_idx, column=col_idx)
-                value = data_dict.get(column_name, "")
-                cell.value = value if value else "-"
-                cell.alignment = Alignment(horizontal="left", vertical="top", wrap_text=True)
+        for data_dict in data_list:
+            self.write(data_dict)
 
     def _adjust_column_widths(self):
-        """自动调整列宽"""
-        column_widths = {
-            "企业名称": 30,
-            "省份": 12,
-            "企业经营范围": 40,
-            "企业地址": 35,
-            "企业法人": 15,
-            "企业联系电话": 18,
-            "成立日期": 15,
-            "营业期限": 18,
-            "注册资金": 15,
-            "统一社会信用代码": 20,
-            "纳税人识别号": 18,
-            "实际业务负责人": 18,
-            "实际联系号码": 18,
-            "代理产品类别": 25,
-            "微信/邮箱": 25,
-            "配送省份": 30,
-            "覆盖地区": 30,
-            "覆盖医院": 40
-        }
-
+        """设置列宽与行高（数据行使用工作表默认行高，无需逐行设置）"""
         for col_idx, column_name in enumerate(OUTPUT_COLUMNS, 1):
-            column_letter = self.worksheet.cell(row=1, column=col_idx).column_letter
-            width = column_widths.get(column_name, 20)
-            self.worksheet.column_dimensions[column_letter].width = width
+            width = COLUMN_WIDTHS.get(column_name, 20)
+            self.worksheet.column_dimensions[get_column_letter(col_idx)].width = width
 
         # 设置行高
         self.worksheet.row_dimensions[1].height = 35  # 标题行
         self.worksheet.row_dimensions[2].height = 30  # 列头行
-        for row_idx in range(3, self.worksheet.max_row + 1):  # 数据行
-            self.worksheet.row_dimensions[row_idx].height = 25
+        self.worksheet.sheet_format.defaultRowHeight = 25  # 数据行
+        self.worksheet.sheet_format.customHeight = True
 
 
 def export_to_excel(data_list, filename=None):
-    """导出数据到Excel的便捷函数"""
+    """导出数据到Excel的便捷函数（data_list 可以是列表或迭代器）"""
     exporter = ExcelExporter(filename)
     return exporter.create_excel(data_list)
 
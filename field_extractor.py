@@ -0,0 +1,161 @@
+"""
+公告正文多字段提取
+
+所有字段标签（地址、电话、联系人、信用代码等）在模块加载时编译为一个正则扫描器，
+对正文只做一次线性扫描：标签的取值为冒号之后到下一个标签或行尾/分号为止的文本，
+再按字段规范化。无标签的邮箱（正文含 @ 时）与统一社会信用代码（无标签取值时）
+作为兜底补充扫描。可直接处理完整正文，无需截断。
+"""
+
+import re
+import unicodedata
+
+
+# 输出列 -> 正文中的标签（同一位置按最长标签优先匹配，如“移动电话”优先于“电话”）
+FIELD_LABELS = {
+    "企业地址": ["地址"],
+    "企业法人": ["法定代表人", "法人代表", "法人"],
+    "企业联系电话": ["电话", "电话号码", "联系方式", "座机"],
+    "实际联系号码": ["手机", "手机号", "手机号码", "移动电话"],
+    "实际业务负责人": ["联系人", "负责人"],
+    "统一社会信用代码": ["统一社会信用代码", "信用代码"],
+    "纳税人识别号": ["纳税人识别号", "纳税识别号", "税号"],
+    "注册资金": ["注册资本", "注册资金"],
+    "营业期限": ["营业期限", "经营期限"],
+    "微信/邮箱": ["微信", "微信号", "邮箱", "邮箱地址", "电子邮箱", "电子邮件", "邮件地址", "E-mail", "Email", "email", "EMAIL"],
+}
+
+# 可合并多个取值的字段（其余字段取第一个有效值）
+MULTI_VALUE_FIELDS = frozenset(("微信/邮箱",))
+
+CREDIT_CODE = r"[0-9A-HJ-NPQRTUWXY]{2}\d{6}[0-9A-HJ-NPQRTUWXY]{10}"
+EMAIL = r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}"
+
+CREDIT_CODE_PATTERN = re.compile(CREDIT_CODE)
+EMAIL_PATTERN = re.compile(EMAIL)
+PHONE_PATTERN = re.compile(r"(?<!\d)(?:1[3-9]\d{9}|0\d{2,3}-?\d{7,8}(?:-\d{1,4})?|[2-9]\d{6,7})(?!\d)")
+MOBILE_PATTERN = re.compile(r"(?<!\d)1[3-9]\d{9}(?!\d)")
+TAX_ID_PATTERN = re.compile(r"[0-9A-Z]{15,20}")
+WECHAT_PATTERN = re.compile(r"[A-Za-z][-_A-Za-z0-9]{5,19}")
+CAPITAL_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(亿|万)?\s*元?\s*(人民币|美元|港元|欧元)?")
+VALUE_END_PATTERN = re.compile(r"[\n；;]")
+DASHES = str.maketrans({"—": "-", "－": "-", "–": "-", " ": ""})
+
+_LABEL_FIELDS = {label: field for field, labels in FIELD_LABELS.items() for label in labels}
+
+
+def _build_scanner():
+    """编译标签扫描器（标签后接冒号；全部标签为汉字或字母开头，正则引擎可按首字符快速跳过）"""
+    labels = "|".join(re.escape(label) for label in sorted(_LABEL_FIELDS, key=len, reverse=True))
+    return re.compile(f"({labels})[ \\t]*[：:][ \\t]*")
+
+
+SCANNER = _build_scanner()
+LOOSE_EMAIL_PATTERN = re.compile(f"(?<![A-Za-z0-9._%+-]){EMAIL}")
+LOOSE_CREDIT_CODE_PATTERN = re.compile(f"(?<![0-9A-Za-z]){CREDIT_CODE}(?![0-9A-Za-z])")
+
+
+def _clean(value):
+    """全角转半角并去掉首尾空白与标点"""
+    return unicodedata.normalize("NFKC", value).strip(" \t\r，,。.、")
+
+
+def _normalize_phone(value):
+    numbers = PHONE_PATTERN.findall(value.translate(DASHES))
+    return "；".join(dict.fromkeys(numbers))
+
+
+def _normalize_mobile(value):
+    return "；".join(dict.fromkeys(MOBILE_PATTERN.findall(value.replace(" ", ""))))
+
+
+def _normalize_person(value):
+    # 取第一个词，如“张三 电话”“李四（采购部）”只保留姓名
+    name = re.split(r"[\s，,、（(/]", value, maxsplit=1)[0]
+    return name if len(name) <= 20 else ""
+
+
+def _normalize_credit_code(value):
+    value = value.replace(" ", "").upper()
+    return value[:18] if CREDIT_CODE_PATTERN.match(value) else ""
+
+
+def _normalize_tax_id(value):
+    match = TAX_ID_PATTERN.match(value.replace(" ", "").upper())
+    return match.group() if match else ""
+
+
+def _normalize_capital(value):
+    match = CAPITAL_PATTERN.search(value.replace(",", ""))
+    if not match:
+        return ""
+    amount, unit, currency = match.groups()
+    return f"{amount}{unit or ''}元{currency if currency and currency != '人民币' else ''}"
+
+
+def _normalize_contact(value):
+    # 邮箱原样小写，其余视为微信号
+    email = EMAIL_PATTERN.search(value)
+    if email:
+        return email.group().lower()
+    wechat = WECHAT_PATTERN.match(value.replace(" ", ""))
+    return wechat.group() if wechat else ""
+
+
+NORMALIZERS = {
+    "企业地址": lambda value: value,
+    "企业法人": _normalize_person,
+    "企业联系电话": _normalize_phone,
+    "实际联系号码": _normalize_mobile,
+    "实际业务负责人": _normalize_person,
+    "统一社会信用代码": _normalize_credit_code,
+    "纳税人识别号": _normalize_tax_id,
+    "注册资金": _normalize_capital,
+    "营业期限": lambda value: value,
+    "微信/邮箱": _normalize_contact,
+}
+
+
+def extract_fields(text):
+    """
+    一次扫描提取正文中的全部字段
+
+    Args:
+        text: 正文文本（完整正文，无需截断）
+
+    Returns:
+        dict: 输出列 -> 规范化后的值（只包含提取到的字段）
+    """
+    if not text:
+        return {}
+
+    labels = [(_LABEL_FIELDS[match.group(1)], match.end(), match.start()) for match in SCANNER.finditer(text)]
+
+    fields = {}
+    for index, (field, start, _) in enumerate(labels):
+        if field in fields and field not in MULTI_VALUE_FIELDS:
+            continue
+        stop = labels[index + 1][2] if index + 1 < len(labels) else len(text)
+        end = VALUE_END_PATTERN.search(text, start, stop)
+        value = NORMALIZERS[field](_clean(text[start:end.start() if end else stop]))
+        if not value:
+            continue
+        if field in fields:
+            if value not in fields[field].split("；"):
+                fields[field] += "；" + value
+        else:
+            fields[field] = value
+
+    # 无标签的统一社会信用代码与邮箱作为兜底
+    if "统一社会信用代码" not in fields:
+        match = LOOSE_CREDIT_CODE_PATTERN.search(text)
+        if match:
+            fields["统一社会信用代码"] = match.group()
+    if "@" in text:
+        known = fields.get("微信/邮箱", "").split("；")
+        emails = [email.lower() for email in LOOSE_EMAIL_PATTERN.findall(text)]
+        values = [value for value in dict.fromkeys(known + emails) if value]
+        if values:
+            fields["微信/邮箱"] = "；".join(values)
+
+    return fields
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+医院词典匹配
+由 data/hospitals.csv（名称、别名、省份、城市）构建 Aho-Corasick 自动机，一次线性扫描找出
+正文提及的全部医院，写入“覆盖医院”，并把医院所在地市并入“覆盖地区”。
+构建好的自动机序列化到 cache/，词典与区划表（空省份/城市由区划表解析）未变化时启动直接载入，不再重建。
+
+用法:
+    python hospital_matcher.py 本次采购由四川大学华西医院、华西第二医院联合组织
+"""
+
+import os
+import sys
+import csv
+import pickle
+import hashlib
+import logging
+import threading
+from collections import namedtuple
+from aho_corasick import AhoCorasick
+from region_index import get_region_index, LIST_SEPARATOR
+from config import HOSPITAL_DICT_FILE, HOSPITAL_AUTOMATON_CACHE, REGION_DATA_FILE
+
+
+logger = logging.getLogger(__name__)
+
+Hospital = namedtuple("Hospital", ["name", "province", "city"])
+CACHE_VERSION = 1
+
+
+def _data_path(path):
+    """相对路径按本模块所在目录解析（词典随代码发布）"""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+
+
+def _file_signature(*paths):
+    """数据文件内容摘要（用于判断缓存的自动机是否过期）"""
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class HospitalMatcher:
+    """医院词典匹配器：名称与别名共用一个自动机，匹配值为医院序号"""
+
+    def __init__(self, hospitals, automaton):
+        """
+        Args:
+            hospitals: (名称, 省份, 城市) 元组列表（缓存中保存普通元组，反序列化比 namedtuple 快）
+            automaton: 已构建的 AhoCorasick，匹配值为 hospitals 中的序号
+        """
+        self.hospitals = hospitals
+        self.automaton = automaton
+
+    @classmethod
+    def build(cls, path=HOSPITAL_DICT_FILE):
+        """
+        读取词典并构建匹配器（省份/城市为空时由医院名称经区划索引解析）
+
+        Args:
+            path: 词典CSV（列：名称, 别名, 省份, 城市；别名以 | 分隔）
+
+        Returns:
+            HospitalMatcher: 匹配器
+        """
+        regions = get_region_index()
+        hospitals = []
+        automaton = AhoCorasick()
+        with open(_data_path(path), encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                name = (row.get("名称") or "").strip()
+                if not name:
+                    continue
+                province, city = (row.get("省份") or "").strip(), (row.get("城市") or "").strip()
+                if not province or not city:
+                    region = regions.resolve(name)
+                    province, city = province or region.province, city or region.city
+                index = len(hospitals)
+                hospitals.append((name, province, city))
+                automaton.add(name, index)
+                for alias in (row.get("别名") or "").split("|"):
+                    alias = alias.strip()
+                    if alias and alias != name:
+                        automaton.add(alias, index)
+        automaton.build()
+        return cls(hospitals, automaton)
+
+    @classmethod
+    def load(cls, path=HOSPITAL_DICT_FILE, cache_path=HOSPITAL_AUTOMATON_CACHE, region_path=REGION_DATA_FILE):
+        """
+        载入匹配器：缓存存在且与词典、区划表内容一致时直接反序列化，否则重新构建并写入缓存
+
+        Args:
+            path: 词典CSV
+            cache_path: 自动机缓存文件，None表示不使用缓存
+            region_path: 区划表CSV（构建时由其解析空省份/城市，内容变化同样使缓存失效）
+
+        Returns:
+            HospitalMatcher: 匹配器
+        """
+        signature = _file_signature(_data_path(path), _data_path(region_path))
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "rb") as f:
+                    cached = pickle.load(f)
+                if cached.get("version") == CACHE_VERSION and cached.get("signature") == signature:
+                    return cls(cached["hospitals"], cached["automaton"])
+            except Exception as e:
+                logger.warning(f"⚠ 医院词典缓存无法读取，重新构建: {str(e)}")
+
+        matcher = cls.build(path)
+        if cache_path:
+            matcher.save(cache_path, signature)
+        return matcher
+
+    def save(self, cache_path, signature):
+        """序列化到缓存文件（先写临时文件再替换，避免中断时留下不完整的缓存）"""
+        folder = os.path.dirname(cache_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        temp_path = f"{cache_path}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump({"version": CACHE_VERSION, "signature": signature, "hospitals": self.hospitals,
+                         "automaton": self.automaton}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+
+    def match(self, text):
+        """
+        找出正文提及的全部医院（最左最长匹配，名称与别名指向同一家时只计一次）
+
+        Args:
+            text: 正文
+
+        Returns:
+            list: 按首次出现排序、去重后的 Hospital 列表
+        """
+        if not text:
+            return []
+        indexes = dict.fromkeys(values[0] for _, _, values in self.automaton.find(text))
+        return [Hospital._make(self.hospitals[index]) for index in indexes]
+
+    def fill_record(self, record, text):
+        """
+        填写记录的 覆盖医院，并把医院所在地市并入 覆盖地区
+
+        Args:
+            record: 数据字典
+            text: 正文
+
+        Returns:
+            dict: 同一个数据字典
+        """
+        hospitals = self.match(text)
+        if not hospitals:
+            return record
+        record["覆盖医院"] = LIST_SEPARATOR.join(hospital.name for hospital in hospitals)
+        areas = [area for area in (record.get("覆盖地区") or "").split(LIST_SEPARATOR) if area]
+        areas += [hospital.city for hospital in hospitals if hospital.city]
+        record["覆盖地区"] = LIST_SEPARATOR.join(dict.fromkeys(areas))
+        return record
+
+
+_shared_matcher = None
+_shared_matcher_lock = threading.Lock()
+
+
+def get_hospital_matcher():
+    """
+    获取进程内共享的医院匹配器（首次调用时载入缓存或构建）
+
+    Returns:
+        HospitalMatcher: 匹配器；词典文件不存在时返回None
+    """
+    global _shared_matcher
+    with _shared_matcher_lock:
+        if _shared_matcher is None:
+            if not os.path.exists(_data_path(HOSPITAL_DICT_FILE)):
+                logger.warning(f"⚠ 未找到医院词典 {HOSPITAL_DICT_FILE}，不填写覆盖医院")
+                _shared_matcher = False
+            else:
+                _shared_matcher = HospitalMatcher.load()
+                logger.debug(f"医院词典已载入: {len(_shared_matcher.hospitals)} 家")
+        return _shared_matcher or None
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    matcher = get_hospital_matcher()
+    if matcher is not None:
+        for hospital in matcher.match(" ".join(sys.argv[1:])):
+            logger.info(f"{hospital.name}（{hospital.province} {hospital.city}）")
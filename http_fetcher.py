@@ -0,0 +1,174 @@
+import logging
+from collections import defaultdict
+import requests
+from requests.adapters import HTTPAdapter
+from config import USER_AGENT, HTTP_POOL_SIZE, HTTP_TIMEOUT, HTTP_MAX_CHALLENGES
+
+
+logger = logging.getLogger(__name__)
+
+# 验证页/拦截页特征（出现任意一项即视为需要回退浏览器）
+CHALLENGE_STATUS_CODES = (401, 403, 429, 503)
+CHALLENGE_MARKERS = (
+    "captcha",
+    "验证码",
+    "安全验证",
+    "人机验证",
+    "访问过于频繁",
+    "请完成验证",
+    "antirobot",
+)
+
+
+class HttpFetcher:
+    """基于 requests.Session 的HTTP抓取器（复用浏览器登录Cookie）"""
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE, timeout=HTTP_TIMEOUT, max_challenges=HTTP_MAX_CHALLENGES):
+        """
+        初始化HTTP抓取器
+
+        Args:
+            pool_size: 连接池大小（同一主机保持的keep-alive连接上限）
+            timeout: 单次请求超时时间（秒）
+            max_challenges: 连续遇到验证页的次数上限，超过后停用
+        """
+        self.timeout = timeout
+        self.max_challenges = max_challenges
+        self.consecutive_challenges = 0
+        self.enabled = True
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "zh-CN,zh;q=0.9",
+        })
+
+    def load_cookies_from_driver(self, driver):
+        """
+        从已登录的WebDriver导出Cookie到Session
+
+        Args:
+            driver: WebDriver实例
+
+        Returns:
+            int: 导入的Cookie数量
+        """
+        count = 0
+        try:
+            for cookie in driver.get_cookies():
+                self.session.cookies.set(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie.get("domain"),
+                    path=cookie.get("path", "/"),
+                )
+                count += 1
+            logger.info(f"✓ 已同步 {count} 个浏览器Cookie到HTTP会话")
+        except Exception as e:
+            logger.warning(f"⚠ 同步浏览器Cookie失败: {str(e)}")
+        return count
+
+    def fetch(self, url):
+        """
+        请求页面HTML
+
+        Args:
+            url: 页面URL
+
+        Returns:
+            str: 页面HTML；请求失败或疑似验证页时返回None
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except Exception as e:
+            logger.debug(f"HTTP请求失败 {url}: {str(e)}")
+            return None
+
+        if self.is_challenge(response):
+            self.consecutive_challenges += 1
+            logger.info(f"⚠ HTTP响应疑似验证页 ({response.status_code}): {url}")
+            if self.consecutive_challenges >= self.max_challenges:
+                self.enabled = False
+                logger.warning(f"⚠ 连续 {self.consecutive_challenges} 次遇到验证页，本次运行停用HTTP快速通道")
+            return None
+
+        self.consecutive_challenges = 0
+        return response.text
+
+    def is_challenge(self, response):
+        """
+        判断响应是否为验证页/拦截页
+
+        Args:
+            response: requests.Response对象
+
+        Returns:
+            bool: 疑似验证页返回True
+        """
+        if response.status_code in CHALLENGE_STATUS_CODES or response.status_code >= 500:
+            return True
+        if "/login" in response.url:
+            return True
+        text = response.text or ""
+        if not text.strip():
+            return True
+        head = text[:5000].lower()
+        return any(marker in head for marker in CHALLENGE_MARKERS)
+
+    def close(self):
+        """关闭HTTP会话"""
+        try:
+            self.session.close()
+        except Exception:
+            pass
+
+
+class LatencyTracker:
+    """按抓取通道统计单页耗时"""
+
+    def __init__(self):
+        """初始化耗时统计"""
+        self.samples = defaultdict(list)
+
+    def record(self, path, seconds):
+        """
+        记录一次页面耗时
+
+        Args:
+            path: 通道名称，如 'http:detail'、'browser:detail'
+            seconds: 耗时（秒）
+        """
+        self.samples[path].append(seconds)
+
+    def summary(self):
+        """
+        汇总各通道耗时
+
+        Returns:
+            dict: {通道: {'count', 'avg', 'p50', 'max'}}
+        """
+        result = {}
+        for path, values in self.samples.items():
+            ordered = sorted(values)
+            result[path] = {
+                "count": len(ordered),
+                "avg": sum(ordered) / len(ordered),
+                "p50": ordered[len(ordered) // 2],
+                "max": ordered[-1],
+            }
+        return result
+
+    def log_summary(self):
+        """打印各通道耗时统计"""
+        for path, stats in sorted(self.summary().items()):
+            logger.info(
+                f"页面耗时 [{path}] 次数={stats['count']} 平均={stats['avg']:.2f}s "
+                f"中位={stats['p50']:.2f}s 最大={stats['max']:.2f}s"
+            )
+
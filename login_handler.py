@@ -1,9 +1,10 @@
-import time
 import logging
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from browser_manager import BrowserManager
+from metrics import timed
+from tracer import traced
 from config import LOGIN_URL, LOGIN_USERNAME, LOGIN_PASSWORD
 
 
@@ -40,7 +41,7 @@ class LoginHandler:
         try:
             # 导航到登录页面
             self.browser_manager.navigate_to(LOGIN_URL)
-            time.sleep(2)
+            self.browser_manager.wait_until_ready("login_page", budget=2, locators=[(By.TAG_NAME, "input")])
 
             logger.info("正在执行登录...")
 
@@ -57,7 +58,7 @@ class LoginHandler:
                 if pwd_tab:
                     pwd_tab.click()
                     logger.info("✓ 已切换到密码登录模式")
-                    time.sleep(1)
+                    self.browser_manager.wait_until_ready("login_tab", budget=1, reset=True)
             except Exception:
                 logger.debug("未找到密码登录切换，继续尝试输入")
 
@@ -74,7 +75,6 @@ class LoginHandler:
                 username_field.clear()
                 username_field.send_keys(username)
                 logger.info("✓ 用户名已输入")
-                time.sleep(1)
             else:
                 logger.error("❌ 未找到用户名输入框")
                 return False
@@ -92,7 +92,6 @@ class LoginHandler:
                 password_field.clear()
                 password_field.send_keys(password)
                 logger.info("✓ 密码已输入")
-                time.sleep(1)
             else:
                 logger.error("❌ 未找到密码输入框")
                 return False
@@ -107,7 +106,6 @@ class LoginHandler:
                 if agree_box and not agree_box.is_selected():
                     agree_box.click()
                     logger.info("✓ 已勾选同意条款")
-                    time.sleep(0.3)
             except Exception:
                 logger.debug("未找到同意条款复选框，跳过")
 
@@ -121,18 +119,15 @@ class LoginHandler:
             if login_button:
                 # 滚动到按钮
                 self.driver.execute_script("arguments[0].scrollIntoView(true);", login_button)
-                time.sleep(0.5)
                 login_button.click()
                 logger.info("✓ 登录按钮已点击")
             else:
                 logger.error("❌ 未找到登录按钮")
                 return False
 
-            # 等待登录完成
-            time.sleep(5)
-
-            # 检查是否登录成功
-            if self._check_login_success():
+            # 等待登录完成（检测到登录成功即返回，不再固定等待）
+            if self.browser_manager.wait_for(self._check_login_success, "login_submit", budget=5,
+                                             timeout=10, poll_interval=0.5):
                 logger.info("✓ 登录成功")
                 return True
             else:
@@ -152,19 +147,12 @@ class LoginHandler:
         """
         try:
             # 检查是否出现用户信息或首页特征
-            # 方法1: 检查个人资料入口
-            try:
-                self.driver.find_element(By.XPATH, "//span[contains(text(), '个人资料')]")
-                return True
-            except:
-                pass
-
-            # 方法2: 检查搜索框（登录后主页的特征）
-            try:
-                self.driver.find_element(By.XPATH, "//input[@placeholder='请输入企业名称、关键词等']")
+            # 方法1: 检查个人资料入口；方法2: 检查搜索框（登录后主页的特征）
+            if self._find_first([
+                (By.XPATH, "//span[contains(text(), '个人资料')]"),
+                (By.XPATH, "//input[@placeholder='请输入企业名称、关键词等']"),
+            ], timeout=0, log_failure=False):
                 return True
-            except:
-                pass
 
             # 方法3: 检查URL变化
             current_url = self.driver.current_url
@@ -172,13 +160,11 @@ class LoginHandler:
                 return True
 
             # 方法4: 检查是否有错误提示
-            try:
-                error_message = self.driver.find_element(By.XPATH, "//*[contains(text(), '账号或密码')]")
-                if error_message:
-                    logger.error(f"❌ 登录错误: {error_message.text}")
-                    return False
-            except:
-                pass
+            error_message = self._find_first([(By.XPATH, "//*[contains(text(), '账号或密码')]")],
+                                             timeout=0, log_failure=False)
+            if error_message:
+                logger.error(f"❌ 登录错误: {error_message.text}")
+                return False
 
             return False
 
@@ -213,20 +199,11 @@ class LoginHandler:
         return False
 
     def _find_first(self, locator_list, timeout=10, log_failure=True):
-        """尝试多个定位器，返回第一个找到的元素。"""
-        end_time = time.time() + timeout
-        while time.time() < end_time:
-            for by, value in locator_list:
-                try:
-                    elem = self.driver.find_element(by, value)
-                    return elem
-                except Exception:
-                    continue
-            time.sleep(0.3)
-        if log_failure:
-            logger.debug(f"未匹配到元素，locators={locator_list}")
-        return None
+        """尝试多个定位器，返回第一个找到的元素（timeout为整体截止时间）。"""
+        return self.browser_manager.find_first(locator_list, timeout=timeout, log_failure=log_failure)
 
+    @traced("login_wait")
+    @timed("login_wait")
     def wait_for_manual_login(self, max_wait_seconds=600):
         """打开登录页并等待人工登录完成。
 
@@ -240,13 +217,11 @@ class LoginHandler:
             from config import LOGIN_URL  # 避免循环导入
             logger.info("请在打开的浏览器中完成登录（支持扫码/密码）。")
             self.browser_manager.navigate_to(LOGIN_URL)
-            start = time.time()
             # 循环检测登录状态
-            while time.time() - start < max_wait_seconds:
-                if self._check_login_success():
-                    logger.info("✓ 检测到已登录")
-                    return True
-                time.sleep(2)
+            if self.browser_manager.wait_for(self._check_login_success, "manual_login",
+                                             timeout=max_wait_seconds, poll_interval=2):
+                logger.info("✓ 检测到已登录")
+                return True
             logger.error("❌ 等待人工登录超时")
             return False
         except Exception as e:
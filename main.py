@@ -7,8 +7,13 @@
 1. 安装依赖: pip install -r requirements.txt
 2. 修改config.py中的登录信息（用户名和密码）
 3. 运行本脚本: python main.py
+4. 中断（Ctrl+C）或崩溃后续跑: python main.py --resume
+5. 记录抓取时间线（Chrome Trace）: python main.py --trace
+6. 剖析每个关键词与导出的热点函数和内存分配: python main.py --profile
+7. 按发布日期分片搜索（突破翻页上限）: python main.py --shard
 """
 
+import os
 import time
 import logging
 import sys
@@ -16,8 +21,15 @@ from datetime import datetime
 from browser_manager import BrowserManager
 from login_handler import LoginHandler
 from tianyancha_scraper import TianyanchaScraper
+from browser_pool import BrowserPool
 from excel_exporter import export_to_excel
-from config import KEYWORDS, BROWSER_TYPE, OUTPUT_EXCEL_FILE
+from output_sinks import SinkWriter, create_sinks
+from crawl_journal import CrawlJournal
+from metrics import METRICS
+from tracer import TRACER
+from profiler import PROFILER
+from query_planner import QueryPlanner
+from config import KEYWORDS, BROWSER_TYPE, OUTPUT_EXCEL_FILE, BROWSER_POOL_SIZE
 
 
 # 配置日志
@@ -31,20 +43,28 @@ logger = logging.getLogger(__name__)
 class TianyanchaSpider:
     """天眼查爬虫主类"""
 
-    def __init__(self, browser_type=BROWSER_TYPE):
+    def __init__(self, browser_type=BROWSER_TYPE, resume=False, shard=False):
         """
         初始化爬虫
 
         Args:
             browser_type: 浏览器类型
+            resume: 是否从上次中断处续跑（跳过采集日志中已完成的关键词与详情页）
+            shard: 是否按发布日期分片搜索每个关键词
         """
         self.browser_type = browser_type
+        self.resume = resume
+        self.shard = shard
         self.browser_manager = None
+        self.browser_pool = None
         self.scraper = None
+        self.journal = None
+        self.sink_writer = None
         self.all_data = []
 
     def run(self):
         """执行爬虫主流程"""
+        METRICS.reset()
         try:
             logger.info("=" * 50)
             logger.info("天眼查爬虫 v1.0")
@@ -55,31 +75,61 @@ class TianyanchaSpider:
             self.browser_manager = BrowserManager(browser_type=self.browser_type)
             time.sleep(2)
 
-            # 等待人工登录
-            logger.info("\n【第1步】请在浏览器中人工登录...")
-            login_handler = LoginHandler(self.browser_manager)
-            if not login_handler.wait_for_manual_login(max_wait_seconds=600):
-                logger.error("❌ 未检测到登录成功，程序终止")
-                return False
+            # 等待人工登录（回放模式下页面来自录制夹具，无需登录）
+            if self.browser_manager.offline:
+                logger.info("\n【第1步】回放模式，跳过登录")
+            else:
+                logger.info("\n【第1步】请在浏览器中人工登录...")
+                login_handler = LoginHandler(self.browser_manager)
+                if not login_handler.wait_for_manual_login(max_wait_seconds=600):
+                    logger.error("❌ 未检测到登录成功，程序终止")
+                    return False
+
+            # 启动浏览器池（并发提取详情页）
+            if BROWSER_POOL_SIZE > 1:
+                logger.info(f"正在启动浏览器池（{BROWSER_POOL_SIZE} 个实例）...")
+                self.browser_pool = BrowserPool(size=BROWSER_POOL_SIZE, browser_type=self.browser_type,
+                                                primary=self.browser_manager)
+                self.browser_pool.share_cookies()
 
             # 初始化爬虫
-            self.scraper = TianyanchaScraper(self.browser_manager)
+            self.journal = CrawlJournal(resume=self.resume)
+            self.sink_writer = SinkWriter(create_sinks())
+            self.scraper = TianyanchaScraper(self.browser_manager, browser_pool=self.browser_pool,
+                                             journal=self.journal)
 
             # 执行搜索和数据采集
             logger.info("【第2步】执行关键字搜索和数据采集...\n")
             for idx, keyword in enumerate(KEYWORDS, 1):
                 logger.info(f"正在处理关键词 {idx}/{len(KEYWORDS)}: {keyword}")
 
+                if self.journal.is_keyword_done(keyword):
+                    results = self.journal.load_records(keyword)
+                    self.scraper.save_data(results)
+                    self.sink_writer.submit(results)
+                    logger.info(f"⊘ 关键词 '{keyword}' 上次已完成，载入 {len(results)} 条\n")
+                    continue
+
                 try:
                     # 搜索
-                    results = self.scraper.search_toubiao(keyword)
+                    with PROFILER.profile(f"keyword_{keyword}"):
+                        if self.shard:
+                            planner = QueryPlanner(self.scraper)
+                            results = planner.run(keyword)
+                            planner.log_report()
+                        else:
+                            results = self.scraper.search_toubiao(keyword)
 
                     # 保存数据
                     if results:
                         self.scraper.save_data(results)
+                        self.sink_writer.submit(results)
                         logger.info(f"✓ 关键词 '{keyword}' 采集完成，共 {len(results)} 条\n")
                     else:
                         logger.warning(f"⚠ 关键词 '{keyword}' 无结果\n")
+                    # 之前关键词的记录合并了本关键词后需要重写
+                    self.sink_writer.update(self.scraper.take_merged_records())
+                    self.journal.mark_keyword_done(keyword, len(results))
 
                     time.sleep(2)  # 关键词之间的延迟
 
@@ -90,13 +140,16 @@ class TianyanchaSpider:
             # 获取所有数据
             self.all_data = self.scraper.get_collected_data()
             logger.info(f"\n✓ 数据采集完成，共采集 {len(self.all_data)} 条数据")
-
-            # 导出Excel
-            if self.all_data:
-                logger.info("\n【第3步】导出Excel文件...")
-                output_file = export_to_excel(self.all_data, OUTPUT_EXCEL_FILE)
-                logger.info(f"✓ Excel文件已导出: {output_file}\n")
-            else:
+            self.scraper.report_latency()
+            self.browser_manager.readiness.log_summary()
+            self.browser_manager.locator.log_summary()
+            self.browser_manager.log_page_metrics()
+
+            # 写完并关闭各输出文件（每个关键词完成后已追加写入）
+            logger.info("\n【第3步】保存输出文件...")
+            output_files = self.sink_writer.close()
+            logger.info(f"✓ 输出文件已保存: {', '.join(output_files)}\n")
+            if not self.all_data:
                 logger.warning("⚠ 未采集到任何数据")
 
             # 完成
@@ -105,30 +158,77 @@ class TianyanchaSpider:
             logger.info("=" * 50)
             return True
 
+        except KeyboardInterrupt:
+            logger.warning("\n⚠ 收到中断信号，正在保存已完成的数据...")
+            self._export_partial()
+            return False
+
         except Exception as e:
             logger.error(f"❌ 爬虫执行出错: {str(e)}")
             return False
 
         finally:
+            if self.scraper:
+                self.scraper.close()
+            if self.sink_writer:
+                self.sink_writer.close()
+            if self.journal:
+                self.journal.close()
+
+            # 各阶段耗时（含输出文件写入），中断或出错时同样写出
+            METRICS.log_summary()
+            METRICS.write_reports()
+            TRACER.write()
+            PROFILER.log_summary()
+
             # 关闭浏览器
-            if self.browser_manager:
+            if self.browser_pool:
+                logger.info("\n正在关闭浏览器池...")
+                self.browser_pool.close()
+            elif self.browser_manager:
                 logger.info("\n正在关闭浏览器...")
                 self.browser_manager.close()
 
 
+    def _export_partial(self):
+        """中断时导出采集日志中已完成的数据（包括未完成关键词中已提取的详情页）"""
+        if not self.journal:
+            return
+        self.journal.flush()
+        self.all_data = self.journal.load_records()
+        if not self.all_data:
+            logger.warning("⚠ 尚未采集到任何数据")
+            return
+        name, ext = os.path.splitext(OUTPUT_EXCEL_FILE)
+        output_file = export_to_excel(self.all_data, f"{name}_部分{ext}")
+        logger.info(f"✓ 已导出 {len(self.all_data)} 条部分数据: {output_file}")
+        logger.info("使用 python main.py --resume 从中断处继续采集")
+
+
 def main():
     """主函数"""
+    args = [arg.lower() for arg in sys.argv[1:]]
+    resume = "--resume" in args
+    if "--trace" in args:
+        TRACER.enable()
+        logger.info("区间追踪: 运行结束写出 Chrome Trace 文件")
+    if "--profile" in args:
+        PROFILER.enable()
+    shard = "--shard" in args
 
     # 强制使用 Edge 浏览器
     browser_type = 'edge'
-    if len(sys.argv) > 1:
-        arg = sys.argv[1].lower()
-        if arg != 'edge':
+    for arg in args:
+        if arg not in ('edge', '--resume', '--trace', '--profile', '--shard'):
             logger.warning(f"仅支持 edge 浏览器，忽略参数: {arg}")
     logger.info("使用浏览器: edge")
+    if resume:
+        logger.info("断点续跑: 跳过上次已完成的关键词与详情页")
+    if shard:
+        logger.info("分片搜索: 每个关键词按发布日期区间拆分搜索")
 
     # 创建爬虫实例并运行
-    spider = TianyanchaSpider(browser_type=browser_type)
+    spider = TianyanchaSpider(browser_type=browser_type, resume=resume, shard=shard)
     success = spider.run()
 
     # 返回退出码
@@ -0,0 +1,245 @@
+import os
+import json
+import math
+import time
+import inspect
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from config import METRICS_ENABLED, METRICS_JSON_FILE, METRICS_PROM_FILE
+
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95)
+
+
+def percentile(sorted_samples, q):
+    """
+    最近秩百分位数
+
+    Args:
+        sorted_samples: 已排序的样本
+        q: 分位（0~1）
+
+    Returns:
+        float: 分位值；无样本时返回0
+    """
+    if not sorted_samples:
+        return 0.0
+    rank = min(max(1, math.ceil(q * len(sorted_samples))), len(sorted_samples))
+    return sorted_samples[rank - 1]
+
+
+def _summarize(samples):
+    """计算次数、合计、p50/p95/max"""
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "total": sum(ordered),
+        "p50": percentile(ordered, 0.5),
+        "p95": percentile(ordered, 0.95),
+        "max": ordered[-1] if ordered else 0.0,
+    }
+
+
+def _label(value):
+    """Prometheus 标签值转义"""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class StageMetrics:
+    """按阶段与关键词记录耗时样本，运行结束输出 JSON 报告与 Prometheus 文本格式文件"""
+
+    def __init__(self, enabled=METRICS_ENABLED):
+        """
+        初始化阶段耗时统计
+
+        Args:
+            enabled: 是否记录（关闭时计时器与装饰器直接调用原函数，不记录样本）
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.samples = defaultdict(list)  # (阶段, 关键词) -> 耗时样本（秒）
+        self.started = time.time()
+
+    def reset(self):
+        """清空样本（每次运行开始时调用）"""
+        with self._lock:
+            self.samples.clear()
+            self.started = time.time()
+
+    @property
+    def current_keyword(self):
+        """当前线程正在处理的关键词"""
+        return getattr(self._local, "keyword", "")
+
+    @contextmanager
+    def keyword_scope(self, keyword):
+        """在该作用域内记录的样本归属到指定关键词（按线程生效）"""
+        previous = self.current_keyword
+        self._local.keyword = keyword or ""
+        try:
+            yield
+        finally:
+            self._local.keyword = previous
+
+    def record(self, stage, seconds, keyword=None):
+        """
+        记录一个耗时样本
+
+        Args:
+            stage: 阶段名称
+            seconds: 耗时（秒）
+            keyword: 关键词，None表示取当前线程的关键词
+        """
+        if not self.enabled:
+            return
+        keyword = self.current_keyword if keyword is None else keyword
+        with self._lock:
+            self.samples[(stage, keyword)].append(seconds)
+
+    @contextmanager
+    def timer(self, stage, keyword=None):
+        """
+        计时上下文管理器（异常时同样记录）
+
+        用法:
+            with METRICS.timer("navigate"):
+                driver.get(url)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, keyword)
+
+    def timed(self, stage, keyword_arg=None):
+        """
+        计时装饰器
+
+        Args:
+            stage: 阶段名称
+            keyword_arg: 关键词参数名；提供时以该参数作为关键词，并在调用期间设为当前线程的关键词
+
+        Returns:
+            function: 装饰器
+        """
+        def decorator(func):
+            signature = inspect.signature(func) if keyword_arg else None
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                if signature is None:
+                    with self.timer(stage):
+                        return func(*args, **kwargs)
+                bound = signature.bind_partial(*args, **kwargs)
+                keyword = bound.arguments.get(keyword_arg)
+                with self.keyword_scope(keyword if keyword is not None else self.current_keyword):
+                    with self.timer(stage):
+                        return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self):
+        """
+        汇总统计
+
+        Returns:
+            dict: {'elapsed', 'stages': {阶段: 统计}, 'keywords': {关键词: {阶段: 统计}}}，
+                  统计为 {'count', 'total', 'p50', 'p95', 'max'}（秒）
+        """
+        with self._lock:
+            items = [(key, list(values)) for key, values in self.samples.items()]
+        by_stage = defaultdict(list)
+        by_keyword = defaultdict(dict)
+        for (stage, keyword), values in items:
+            by_stage[stage].extend(values)
+            if keyword:
+                by_keyword[keyword][stage] = _summarize(values)
+        return {
+            "elapsed": time.time() - self.started,
+            "stages": {stage: _summarize(values) for stage, values in sorted(by_stage.items())},
+            "keywords": dict(by_keyword),
+        }
+
+    def to_prometheus(self, summary=None):
+        """
+        转换为 Prometheus 文本格式（summary 类型，附加 max 指标）
+
+        Returns:
+            str: 文本格式指标
+        """
+        summary = summary or self.summary()
+        lines = [
+            "# HELP tyc_stage_duration_seconds Crawler stage latency.",
+            "# TYPE tyc_stage_duration_seconds summary",
+        ]
+        series = [({"stage": stage}, stats) for stage, stats in summary["stages"].items()]
+        series += [({"stage": stage, "keyword": keyword}, stats)
+                   for keyword, stages in summary["keywords"].items() for stage, stats in stages.items()]
+        for labels, stats in series:
+            label_text = ",".join(f'{name}="{_label(value)}"' for name, value in labels.items())
+            for q in QUANTILES:
+                lines.append(f'tyc_stage_duration_seconds{{{label_text},quantile="{q}"}} {stats[f"p{int(q * 100)}"]:.6f}')
+            lines.append(f"tyc_stage_duration_seconds_sum{{{label_text}}} {stats['total']:.6f}")
+            lines.append(f"tyc_stage_duration_seconds_count{{{label_text}}} {stats['count']}")
+        lines += [
+            "# HELP tyc_stage_duration_max_seconds Slowest sample per crawler stage.",
+            "# TYPE tyc_stage_duration_max_seconds gauge",
+        ]
+        for labels, stats in series:
+            label_text = ",".join(f'{name}="{_label(value)}"' for name, value in labels.items())
+            lines.append(f"tyc_stage_duration_max_seconds{{{label_text}}} {stats['max']:.6f}")
+        lines += [
+            "# HELP tyc_run_duration_seconds Wall time of the crawler run.",
+            "# TYPE tyc_run_duration_seconds gauge",
+            f"tyc_run_duration_seconds {summary['elapsed']:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write_reports(self, json_path=METRICS_JSON_FILE, prom_path=METRICS_PROM_FILE):
+        """
+        写出 JSON 报告与 Prometheus 文本格式文件
+
+        Returns:
+            list: 写出的文件路径
+        """
+        if not self.enabled:
+            return []
+        summary = self.summary()
+        paths = []
+        for path, content in ((json_path, json.dumps(summary, ensure_ascii=False, indent=2)),
+                              (prom_path, self.to_prometheus(summary))):
+            if not path:
+                continue
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            paths.append(path)
+        logger.info(f"✓ 阶段耗时报告已保存: {', '.join(paths)}")
+        return paths
+
+    def log_summary(self):
+        """打印各阶段耗时统计"""
+        stages = self.summary()["stages"]
+        if not stages:
+            return
+        logger.info("阶段耗时统计:")
+        for stage, stats in sorted(stages.items(), key=lambda item: item[1]["total"], reverse=True):
+            logger.info(
+                f"  {stage}: {stats['count']} 次，合计 {stats['total']:.1f}s，"
+                f"p50 {stats['p50'] * 1000:.0f}ms / p95 {stats['p95'] * 1000:.0f}ms / max {stats['max'] * 1000:.0f}ms"
+            )
+
+
+# 进程内共享的统计实例
+METRICS = StageMetrics()
+timed = METRICS.timed
@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+本地模拟天眼查站点（压测与端到端测试用）
+
+提供与爬虫选择器一致的 /s/toubiao/detail?key= 搜索列表页（可翻页、可按发布日期筛选）与 /bid/ 详情页，
+支持配置页数、延迟、错误率、429/验证页响应与登录Cookie校验。
+爬虫通过环境变量 TYC_BASE_URL 指向本站点，无需访问真实网站即可测试吞吐与并发。
+
+用法:
+    python mock_site.py --port 8800 --pages 10 --latency 0.2 --error-rate 0.02 --rate-limit 0.01
+    TYC_BASE_URL=http://127.0.0.1:8800 python main.py
+"""
+
+import sys
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from collections import Counter
+from datetime import date, timedelta
+from html import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, quote
+
+
+logger = logging.getLogger(__name__)
+
+LOGIN_COOKIE = "auth_token"
+DATE_PARAMS = ("startDate", "endDate")  # 发布日期筛选参数（与 config.SEARCH_DATE_PARAMS 默认值一致）
+PROVINCE_ADDRESSES = [
+    "广东省广州市天河区",
+    "四川省成都市武侯区",
+    "浙江省杭州市西湖区",
+    "北京市海淀区",
+    "湖北省武汉市洪山区",
+    "山东省济南市历下区",
+    "江苏省南京市鼓楼区",
+    "河南省郑州市金水区",
+]
+HOSPITAL_NAMES = ["人民医院", "妇幼保健院", "中医院", "儿童医院", "第一人民医院", "中心医院"]
+NOTICE_TYPES = ["采购公告", "中标公告", "成交结果公告", "招标公告"]
+
+
+def _page(title, body):
+    """拼装完整HTML页面"""
+    return f"<html><head><meta charset='utf-8'><title>{escape(title)}</title></head><body>{body}</body></html>"
+
+
+class MockSite:
+    """模拟站点：ThreadingHTTPServer 在后台线程中运行，按参数生成确定性的列表页与详情页"""
+
+    def __init__(self, host="127.0.0.1", port=0, pages=5, items_per_page=20, latency=0.0, jitter=0.0,
+                 error_rate=0.0, rate_limit=0.0, captcha_rate=0.0, require_login=False,
+                 newest="2025-06-30", days_step=3, seed=0):
+        """
+        初始化模拟站点
+
+        Args:
+            host: 监听地址
+            port: 监听端口，0表示自动分配
+            pages: 每个关键词的搜索结果页数
+            items_per_page: 每页结果条数
+            latency: 每个请求的固定延迟（秒）
+            jitter: 额外随机延迟上限（秒）
+            error_rate: 返回500的概率
+            rate_limit: 返回429（访问过于频繁）的概率
+            captcha_rate: 返回验证页的概率
+            require_login: 是否校验登录Cookie（缺失时302跳转到登录页）
+            newest: 第一条结果的发布日期（之后按 days_step 天递减，模拟按时间倒序的列表）
+            days_step: 相邻结果的发布日期间隔（天）
+            seed: 随机种子（故障注入与详情内容可复现）
+        """
+        self.pages = pages
+        self.items_per_page = items_per_page
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.captcha_rate = captcha_rate
+        self.require_login = require_login
+        self.newest = date.fromisoformat(newest)
+        self.days_step = days_step
+        self.seed = seed
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+
+    @property
+    def base_url(self):
+        """站点根地址（可直接用作 TYC_BASE_URL）"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def search_url(self, keyword, page=1):
+        """
+        搜索结果页URL
+
+        Args:
+            keyword: 搜索关键词
+            page: 页码
+
+        Returns:
+            str: 与 SEARCH_URL_TEMPLATE 格式一致的URL
+        """
+        url = f"{self.base_url}/s/toubiao/detail?key={quote(keyword)}"
+        return url if page == 1 else f"{url}&pageNum={page}"
+
+    def _search_indexes(self, start=None, end=None):
+        """
+        发布日期在筛选区间内的结果序号
+
+        Args:
+            start: 区间起点 YYYY-MM-DD，None表示不限
+            end: 区间终点 YYYY-MM-DD，None表示不限
+
+        Returns:
+            range: 结果序号（按发布日期倒序）
+        """
+        total = self.pages * self.items_per_page
+        first, last = 0, total - 1
+        if end:
+            first = max(first, -((date.fromisoformat(end) - self.newest).days // self.days_step))
+        if start:
+            last = min(last, (self.newest - date.fromisoformat(start)).days // self.days_step)
+        return range(first, last + 1)
+
+    def start(self):
+        """在后台线程中启动站点"""
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-site", daemon=True)
+        self._thread.start()
+        logger.info(f"✓ 模拟站点已启动: {self.base_url}")
+        return self
+
+    def stop(self):
+        """停止站点"""
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def log_stats(self):
+        """输出请求统计"""
+        with self._lock:
+            items = sorted(self.stats.items())
+        summary = "，".join(f"{name} {count}" for name, count in items)
+        logger.info(f"模拟站点请求统计: {summary or '无请求'}")
+
+    def _count(self, label):
+        """请求计数（ThreadingHTTPServer 下多个处理线程并发累加）"""
+        with self._lock:
+            self.stats[label] += 1
+
+    def _delay(self):
+        """模拟响应延迟"""
+        delay = self.latency
+        if self.jitter:
+            with self._lock:
+                delay += self.jitter * self._random.random()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _roll(self, rate):
+        """按概率判定是否注入故障"""
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+    def _bid_id(self, keyword, index):
+        """结果条目ID（关键词与序号确定）"""
+        return hashlib.sha1(f"{self.seed}:{keyword}:{index}".encode("utf-8")).hexdigest()[:16]
+
+    def _bid_info(self, bid_id, index=None):
+        """
+        由条目ID生成公告内容
+
+        Args:
+            bid_id: 条目ID
+            index: 条目在关键词结果中的序号（决定发布日期，详情页从路径中读取）
+
+        Returns:
+            dict: {'hospital', 'address', 'notice', 'date'}
+        """
+        digest = int(bid_id[:8], 16)
+        address = PROVINCE_ADDRESSES[digest % len(PROVINCE_ADDRESSES)]
+        city = address[address.find("省") + 1:address.find("市") + 1] if "省" in address else address[:3]
+        return {
+            "hospital": city.rstrip("市") + HOSPITAL_NAMES[(digest >> 4) % len(HOSPITAL_NAMES)],
+            "address": f"{address}{digest % 300 + 1}号",
+            "notice": NOTICE_TYPES[(digest >> 8) % len(NOTICE_TYPES)],
+            "date": (self.newest - timedelta(days=self.days_step * (index or 0))).isoformat(),
+        }
+
+    def render_home(self):
+        """首页（登录后特征：搜索框）"""
+        return _page("天眼查", "<div class='header'><span>个人资料</span></div>"
+                             "<input type='text' placeholder='请输入企业名称、关键词等'>")
+
+    def render_login(self):
+        """登录页（提交后设置登录Cookie并跳转首页）"""
+        return _page("登录", "<form class='login-form' action='/login/submit' method='get'>"
+                           "<input name='mobile' type='tel' autocomplete='username'>"
+                           "<input name='password' type='password'>"
+                           "<button type='submit' class='login-btn'>登录</button></form>")
+
+    def render_search(self, keyword, page, start=None, end=None):
+        """
+        搜索结果页
+
+        Args:
+            keyword: 搜索关键词
+            page: 页码（从1开始）
+            start: 发布日期筛选起点 YYYY-MM-DD
+            end: 发布日期筛选终点 YYYY-MM-DD
+
+        Returns:
+            str: 页面HTML；超出页数时返回空列表页
+        """
+        indexes = self._search_indexes(start, end)
+        pages = -(-len(indexes) // self.items_per_page)
+        items = []
+        if 1 <= page <= pages:
+            for index in indexes[(page - 1) * self.items_per_page:page * self.items_per_page]:
+                bid_id = self._bid_id(keyword, index)
+                info = self._bid_info(bid_id, index)
+                items.append(
+                    f"<div class='result-item'><a href='/bid/{bid_id}-{index}'>"
+                    f"{escape(info['hospital'])}{escape(keyword)}{info['notice']}</a>"
+                    f"<span class='date'>{info['date']}</span></div>"
+                )
+        pagination = ""
+        if page < pages:
+            filters = "".join(f"&{name}={value}" for name, value in zip(DATE_PARAMS, (start, end)) if value)
+            next_url = f"/s/toubiao/detail?key={quote(keyword)}{filters}&pageNum={page + 1}"
+            pagination = f"<div class='pagination'><a class='next' href='{next_url}'>下一页</a></div>"
+        return _page(f"{keyword}_招投标", f"<div class='search-result-list'>{''.join(items)}</div>{pagination}")
+
+    def render_bid(self, bid_path):
+        """
+        招投标详情页
+
+        Args:
+            bid_path: /bid/ 之后的路径（条目ID-序号）
+
+        Returns:
+            str: 页面HTML；路径无效时返回None
+        """
+        bid_id, _, index = bid_path.partition("-")
+        if len(bid_id) != 16 or not index.isdigit():
+            return None
+        info = self._bid_info(bid_id, int(index))
+        return _page(
+            info["notice"],
+            f"<div class='header'><span>发布日期</span><span>{info['date']}</span></div>"
+            f"<div class='bid-detail'><p>采购人：{escape(info['hospital'])}</p>"
+            f"<p>联系地址：{escape(info['address'])}</p><p>联系电话：010-{int(bid_id[8:14], 16) % 90000000 + 10000000}</p></div>",
+        )
+
+    def _handler_class(self):
+        """创建绑定到本站点的请求处理类"""
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # keep-alive 下避免头部与正文分两次发送触发的40ms延迟确认
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                site._delay()
+
+                if parts.path == "/login":
+                    return self._send(200, site.render_login(), "login")
+                if parts.path == "/login/submit":
+                    site._count("login")
+                    self.send_response(302)
+                    self.send_header("Set-Cookie", f"{LOGIN_COOKIE}=mock; Path=/")
+                    self.send_header("Location", "/")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return None
+                if site.require_login and f"{LOGIN_COOKIE}=" not in (self.headers.get("Cookie") or ""):
+                    site._count("302")
+                    self.send_response(302)
+                    self.send_header("Location", f"/login?from={quote(self.path)}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return None
+                if site._roll(site.error_rate):
+                    return self._send(500, _page("错误", "服务器繁忙"), "500")
+                if site._roll(site.rate_limit):
+                    return self._send(429, _page("访问过于频繁", "访问过于频繁，请稍后再试"), "429",
+                                      headers={"Retry-After": "1"})
+                if site._roll(site.captcha_rate):
+                    return self._send(200, _page("安全验证", "<div class='captcha'>请完成安全验证</div>"), "captcha")
+
+                if parts.path == "/":
+                    return self._send(200, site.render_home(), "home")
+                if parts.path == "/s/toubiao/detail":
+                    keyword = (query.get("key") or [""])[0]
+                    page = int((query.get("pageNum") or ["1"])[0])
+                    start, end = ((query.get(name) or [None])[0] for name in DATE_PARAMS)
+                    return self._send(200, site.render_search(keyword, page, start, end), "list")
+                if parts.path.startswith("/bid/"):
+                    body = site.render_bid(parts.path[len("/bid/"):])
+                    if body is not None:
+                        return self._send(200, body, "detail")
+                return self._send(404, _page("404", "页面不存在"), "404")
+
+            def _send(self, status, body, label, headers=None):
+                site._count(label)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="本地模拟天眼查站点")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8800, help="监听端口")
+    parser.add_argument("--pages", type=int, default=5, help="每个关键词的结果页数")
+    parser.add_argument("--items", type=int, default=20, help="每页结果条数")
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的固定延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="额外随机延迟上限（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回500的概率")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="返回429的概率")
+    parser.add_argument("--captcha-rate", type=float, default=0.0, help="返回验证页的概率")
+    parser.add_argument("--require-login", action="store_true", help="校验登录Cookie（访问 /login 登录）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args(argv)
+
+    site = MockSite(host=args.host, port=args.port, pages=args.pages, items_per_page=args.items,
+                    latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                    rate_limit=args.rate_limit, captcha_rate=args.captcha_rate,
+                    require_login=args.require_login, seed=args.seed)
+    site.start()
+    logger.info(f"使用方式: TYC_BASE_URL={site.base_url} python main.py（Ctrl+C 停止）")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.stop()
+        site.log_stats()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main())
@@ -0,0 +1,296 @@
+import os
+import csv
+import json
+import queue
+import logging
+import sqlite3
+import threading
+from excel_exporter import ExcelExporter
+from result_store import ResultStore
+from metrics import METRICS
+from profiler import PROFILER
+from config import OUTPUT_COLUMNS, OUTPUT_FOLDER, OUTPUT_EXCEL_FILE, OUTPUT_SINKS, RESULT_STORE_FILE
+
+
+logger = logging.getLogger(__name__)
+
+
+class OutputSink:
+    """输出目标基类：open 后逐条 write，结束时 close"""
+
+    name = "sink"
+
+    def __init__(self, filename):
+        """
+        初始化输出目标
+
+        Args:
+            filename: 输出文件名（位于输出目录下）
+        """
+        self.filename = filename
+        self.filepath = os.path.join(OUTPUT_FOLDER, filename)
+        self.rows_written = 0
+
+    def open(self):
+        """打开输出文件"""
+        os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+
+    def write(self, record):
+        """写入单条记录"""
+        raise NotImplementedError
+
+    def write_many(self, records):
+        """
+        写入一批记录并刷新到磁盘
+
+        Args:
+            records: 记录列表
+        """
+        for record in records:
+            self.write(record)
+            self.rows_written += 1
+        self.flush()
+
+    def flush(self):
+        """刷新已写入的数据，使其他进程可以读取"""
+
+    def close(self):
+        """
+        关闭输出文件
+
+        Returns:
+            str: 输出文件路径
+        """
+        return self.filepath
+
+
+class CsvSink(OutputSink):
+    """CSV输出（UTF-8 BOM，Excel可直接打开）"""
+
+    name = "csv"
+
+    def open(self):
+        super().open()
+        self._file = open(self.filepath, "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(OUTPUT_COLUMNS)
+        self._file.flush()
+
+    def write(self, record):
+        self._writer.writerow([record.get(column, "") for column in OUTPUT_COLUMNS])
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+        return self.filepath
+
+
+class JsonlSink(OutputSink):
+    """JSON Lines输出（每行一条记录，包含输出列与详情链接，可用 result_store.py import 导入结果库）"""
+
+    name = "jsonl"
+
+    def open(self):
+        super().open()
+        self._file = open(self.filepath, "w", encoding="utf-8")
+
+    def write(self, record):
+        row = {column: record.get(column, "") for column in OUTPUT_COLUMNS}
+        if record.get("详情链接"):
+            row["详情链接"] = record["详情链接"]
+        self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+        return self.filepath
+
+
+class SqliteSink(OutputSink):
+    """SQLite输出（records 表，列为输出列加详情链接，按详情链接upsert，每批一个事务）"""
+
+    name = "sqlite"
+
+    def open(self):
+        super().open()
+        if os.path.exists(self.filepath):
+            os.remove(self.filepath)
+        self._conn = sqlite3.connect(self.filepath, check_same_thread=False)
+        columns = ", ".join(f'"{column}" TEXT' for column in OUTPUT_COLUMNS)
+        # 详情链接唯一：后续关键词合并到已有记录时覆盖更新（无链接的记录为NULL，不参与去重）
+        self._conn.execute(f'CREATE TABLE records ({columns}, "详情链接" TEXT UNIQUE)')
+        quoted = ", ".join(f'"{column}"' for column in OUTPUT_COLUMNS)
+        updates = ", ".join(f'"{column}" = excluded."{column}"' for column in OUTPUT_COLUMNS)
+        self._insert_sql = (f'INSERT INTO records ({quoted}, "详情链接") VALUES ({", ".join("?" * (len(OUTPUT_COLUMNS) + 1))}) '
+                            f'ON CONFLICT ("详情链接") DO UPDATE SET {updates}')
+        self._conn.commit()
+
+    def write(self, record):
+        self._conn.execute(self._insert_sql, [record.get(column, "") for column in OUTPUT_COLUMNS]
+                           + [record.get("详情链接") or None])
+
+    def flush(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+        return self.filepath
+
+
+class ExcelSink(OutputSink):
+    """Excel输出（流式写入，保存发生在 close 时）"""
+
+    name = "excel"
+
+    def open(self):
+        super().open()
+        self._exporter = ExcelExporter(self.filename)
+        self._exporter.open()
+
+    def write(self, record):
+        self._exporter.write(record)
+
+    def close(self):
+        return self._exporter.close()
+
+
+class ResultStoreSink(OutputSink):
+    """本地结果库输出（跨运行累积，按详情链接upsert，不随每次运行重建）"""
+
+    name = "store"
+
+    def __init__(self, filename=None):
+        super().__init__(filename or os.path.basename(RESULT_STORE_FILE))
+        self.filepath = RESULT_STORE_FILE
+
+    def open(self):
+        self._store = ResultStore(self.filepath)
+
+    def write_many(self, records):
+        self.rows_written += self._store.upsert(records)
+
+    def close(self):
+        self._store.close()
+        return self.filepath
+
+
+SINK_TYPES = {
+    "excel": (ExcelSink, ".xlsx"),
+    "csv": (CsvSink, ".csv"),
+    "jsonl": (JsonlSink, ".jsonl"),
+    "sqlite": (SqliteSink, ".db"),
+    "store": (ResultStoreSink, None),
+}
+
+
+def create_sinks(formats=OUTPUT_SINKS, basename=None):
+    """
+    按格式名创建输出目标
+
+    Args:
+        formats: 格式名列表（excel / csv / jsonl / sqlite / store）
+        basename: 输出文件名（不含扩展名），默认取 OUTPUT_EXCEL_FILE 的文件名部分
+
+    Returns:
+        list: OutputSink 实例列表
+    """
+    basename = basename or os.path.splitext(OUTPUT_EXCEL_FILE)[0]
+    sinks = []
+    for name in formats:
+        if name not in SINK_TYPES:
+            logger.warning(f"⚠ 未知的输出格式，已忽略: {name}")
+            continue
+        sink_class, ext = SINK_TYPES[name]
+        sinks.append(sink_class(basename + ext) if ext else sink_class())
+    return sinks
+
+
+class SinkWriter:
+    """
+    后台写入线程：采集线程提交记录后立即返回，由后台线程依次写入各输出目标
+
+    后续关键词合并到已提交记录的“代理产品类别”时通过 update 再次提交：SQLite 与结果库按详情链接覆盖，
+    CSV/JSONL/Excel 追加一行合并后的完整记录（同一记录以最后一行为准，JSONL 可按详情链接去重）。
+    """
+
+    def __init__(self, sinks):
+        """
+        初始化并启动后台写入线程
+
+        Args:
+            sinks: OutputSink 实例列表
+        """
+        self.sinks = []
+        for sink in sinks:
+            try:
+                sink.open()
+                self.sinks.append(sink)
+            except Exception as e:
+                logger.error(f"❌ 打开输出文件失败 {sink.filepath}: {str(e)}")
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="sink-writer", daemon=True)
+        self._thread.start()
+        self._closed = False
+
+    def submit(self, records):
+        """
+        提交一批记录（不阻塞采集）
+
+        Args:
+            records: 记录列表
+        """
+        # 复制一份：后台写入时采集线程可能正在合并关键词，每行以提交时的内容为准
+        records = [dict(record) for record in records]
+        if records and not self._closed:
+            self._queue.put(records)
+
+    def update(self, records):
+        """
+        提交已更新的记录（如合并了新的关键词）：按详情链接覆盖的目标重写，其余目标追加一行更新后的记录
+
+        Args:
+            records: 记录列表
+        """
+        self.submit(records)
+
+    def _run(self):
+        """后台线程：写入各输出目标，单个目标出错时停用该目标"""
+        while True:
+            records = self._queue.get()
+            if records is None:
+                return
+            for sink in list(self.sinks):
+                try:
+                    with METRICS.timer(f"sink:{sink.name}", keyword=""), PROFILER.profile("export"):
+                        sink.write_many(records)
+                except Exception as e:
+                    logger.error(f"❌ 写入 {sink.name} 输出失败，已停用: {str(e)}")
+                    self.sinks.remove(sink)
+
+    def close(self):
+        """
+        写完队列中的记录并关闭所有输出目标
+
+        Returns:
+            list: 输出文件路径列表
+        """
+        if self._closed:
+            return []
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+        paths = []
+        for sink in self.sinks:
+            try:
+                with PROFILER.profile("export"):
+                    paths.append(sink.close())
+                logger.info(f"✓ 已写出 {sink.name}: {sink.filepath}（{sink.rows_written} 条）")
+            except Exception as e:
+                logger.error(f"❌ 关闭 {sink.name} 输出失败: {str(e)}")
+        return paths
@@ -0,0 +1,238 @@
+import os
+import time
+import zlib
+import hashlib
+import logging
+import sqlite3
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from config import (
+    PAGE_CACHE_ENABLED, PAGE_CACHE_DIR, PAGE_CACHE_MAX_MB, PAGE_CACHE_TTL, PAGE_CACHE_DEFAULT_TTL,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# 不影响页面内容的跟踪参数，归一化URL时移除
+TRACKING_PARAMS = ("utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content", "spm", "from")
+
+
+def normalize_url(url):
+    """
+    归一化URL作为缓存键：协议/域名小写、去掉锚点与跟踪参数、查询参数排序
+
+    Args:
+        url: 原始URL
+
+    Returns:
+        str: 归一化后的URL
+    """
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in TRACKING_PARAMS]
+    query.sort()
+    path = parts.path or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+class PageCache:
+    """磁盘页面缓存：按归一化URL存储压缩HTML，支持按URL类别设置TTL与总容量LRU淘汰"""
+
+    def __init__(self, cache_dir=PAGE_CACHE_DIR, max_mb=PAGE_CACHE_MAX_MB, ttl_rules=PAGE_CACHE_TTL,
+                 default_ttl=PAGE_CACHE_DEFAULT_TTL):
+        """
+        初始化页面缓存
+
+        Args:
+            cache_dir: 缓存目录
+            max_mb: 缓存总容量上限（MB，按压缩后大小计算）
+            ttl_rules: [(URL片段, 秒数或None)]，按顺序匹配，None表示永不过期
+            default_ttl: 未匹配任何规则时的TTL（秒）
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.ttl_rules = list(ttl_rules)
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, url TEXT, size INTEGER, created REAL, accessed REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed)")
+        self._conn.commit()
+        self.total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def ttl_for(self, url):
+        """
+        获取URL对应的TTL
+
+        Args:
+            url: 页面URL
+
+        Returns:
+            float: TTL秒数；None表示永不过期
+        """
+        for fragment, ttl in self.ttl_rules:
+            if fragment in url:
+                return ttl
+        return self.default_ttl
+
+    def _path_for(self, key):
+        """缓存文件路径（按哈希前两位分目录）"""
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest + ".html.z")
+
+    def get(self, url):
+        """
+        读取缓存页面
+
+        Args:
+            url: 页面URL
+
+        Returns:
+            str: 页面HTML；未命中或已过期返回None
+        """
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            ttl = self.ttl_for(key)
+            if ttl is not None and now - row[0] > ttl:
+                self.expired += 1
+                self.misses += 1
+                self._delete(key)
+                return None
+            try:
+                with open(self._path_for(key), "rb") as f:
+                    html = zlib.decompress(f.read()).decode("utf-8")
+            except Exception as e:
+                logger.debug(f"读取缓存文件失败 {url}: {str(e)}")
+                self.misses += 1
+                self._delete(key)
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return html
+
+    def put(self, url, html):
+        """
+        写入缓存页面
+
+        Args:
+            url: 页面URL
+            html: 页面HTML
+        """
+        if not html:
+            return
+        key = normalize_url(url)
+        data = zlib.compress(html.encode("utf-8"), 6)
+        path = self._path_for(key)
+        now = time.time()
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.debug(f"写入缓存文件失败 {url}: {str(e)}")
+                return
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if old:
+                self.total_bytes -= old[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, url, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, url, len(data), now, now),
+            )
+            self._conn.commit()
+            self.total_bytes += len(data)
+            self.stores += 1
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _delete(self, key):
+        """删除单个缓存条目（调用方持有锁）"""
+        row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._conn.commit()
+        self.total_bytes -= row[0]
+        try:
+            os.remove(self._path_for(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """按最近访问时间淘汰，直到总容量降到上限的90%（调用方持有锁）"""
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT key FROM entries ORDER BY accessed ASC").fetchall()
+        for (key,) in rows:
+            if self.total_bytes <= target:
+                break
+            self._delete(key)
+            self.evictions += 1
+
+    def stats(self):
+        """
+        获取缓存统计
+
+        Returns:
+            dict: 命中、未命中、过期、写入、淘汰次数及当前容量
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size_mb": self.total_bytes / 1024 / 1024,
+        }
+
+    def log_stats(self):
+        """打印缓存命中统计"""
+        stats = self.stats()
+        logger.info(
+            f"页面缓存: 命中 {stats['hits']} / 未命中 {stats['misses']}（命中率 {stats['hit_rate']:.0%}），"
+            f"过期 {stats['expired']}，写入 {stats['stores']}，淘汰 {stats['evictions']}，"
+            f"占用 {stats['size_mb']:.1f}MB"
+        )
+
+    def close(self):
+        """关闭缓存索引"""
+        with self._lock:
+            self._conn.close()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_page_cache():
+    """
+    获取进程内共享的页面缓存（浏览器池各实例与解析线程共用）
+
+    Returns:
+        PageCache: 缓存实例；配置未启用时返回None
+    """
+    global _shared_cache
+    if not PAGE_CACHE_ENABLED:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = PageCache()
+        return _shared_cache
@@ -0,0 +1,234 @@
+"""
+离线页面解析
+
+对浏览器 page_source 或HTTP响应的HTML做纯Python解析，结果与注入脚本
+（dom_scripts.py）返回的结构一致。所有XPath在模块加载时编译一次。
+"""
+
+import re
+from urllib.parse import urljoin
+from lxml import etree, html as lxml_html
+from field_extractor import extract_fields
+
+
+def _class_token(name):
+    """生成匹配class中完整词的XPath条件（等价于CSS的 .name）"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# 搜索结果链接（与 _collect_result_links 的两组定位器一致）
+RESULT_LINKS_XPATH = etree.XPath(
+    "//a[contains(@href,'/bid/')][ancestor::*[contains(@class,'result') or contains(@class,'item') or contains(@class,'list')]]"
+)
+RESULT_LINKS_FALLBACK_XPATH = etree.XPath(
+    "//div[contains(@class,'result') or contains(@class,'item')]//a[contains(@href,'/bid/')]"
+)
+BID_LINKS_XPATH = etree.XPath(".//a[contains(@href,'/bid/')]")
+
+# 翻页控件（与 _go_to_next_page 的定位器一致）
+NEXT_PAGE_XPATHS = [
+    etree.XPath("//a[contains(text(),'下一页') or contains(text(),'下页')]"),
+    etree.XPath("//button[contains(text(),'下一页') or contains(text(),'下页')]"),
+    etree.XPath(f"//*[{_class_token('pagination')}]//*[{_class_token('next')}] | //*[{_class_token('page-next')}] | //a[@rel='next']"),
+    etree.XPath("//li[contains(@class,'next')]//a | //span[contains(@class,'next')]//a"),
+]
+
+# 详情页发布日期（与 _read_detail_elements 的定位器一致）
+DATE_XPATHS = [
+    etree.XPath("//*[contains(text(),'发布日期') or contains(text(),'公告日期') or contains(text(),'发布时间')]/following-sibling::*[1]"),
+    etree.XPath("//*[contains(text(),'发布日期') or contains(text(),'公告日期')]/parent::*/following-sibling::*[1]"),
+    etree.XPath("//span[contains(@class,'date') or contains(@class,'time')]"),
+    etree.XPath("//div[contains(@class,'date') or contains(@class,'time')]"),
+]
+
+# 详情页正文容器（与 DETAIL_LOCATORS 一致）
+CONTAINER_XPATHS = [
+    etree.XPath("//*[" + " or ".join(_class_token(name) for name in ("bid-detail", "article", "content", "detail", "announcement")) + "]"),
+    etree.XPath("//div[contains(@class,'bid') or contains(@class,'detail') or contains(@class,'content')]"),
+    etree.XPath("//body"),
+]
+
+LIST_DATE_PATTERN = re.compile(r'\d{4}\s*[-年/.]\s*\d{1,2}\s*[-月/.]\s*\d{1,2}')
+# 列表项无完整日期时识别相对日期（3天前、昨天等）
+LIST_RELATIVE_DATE_PATTERN = re.compile(r'\d+\s*(?:分钟|小时|天|周|个月)前|刚刚|今天|昨天|前天')
+
+BLOCK_TAGS = frozenset((
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "fieldset", "figcaption",
+    "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main",
+    "nav", "ol", "p", "pre", "section", "table", "tbody", "thead", "tfoot", "tr", "ul",
+))
+SKIP_TAGS = frozenset(("script", "style", "noscript", "template", "head", "title", "meta", "link"))
+
+
+def parse_document(page_html):
+    """
+    解析HTML为lxml文档
+
+    Args:
+        page_html: HTML字符串或字节
+
+    Returns:
+        lxml.html.HtmlElement: 文档根节点；内容为空时返回None
+    """
+    if page_html is None:
+        return None
+    if isinstance(page_html, (bytes, bytearray)):
+        if not page_html.strip():
+            return None
+        return lxml_html.document_fromstring(page_html)
+    if not page_html.strip():
+        return None
+    try:
+        return lxml_html.document_fromstring(page_html)
+    except ValueError:
+        # 带 XML 编码声明的字符串需以字节形式解析
+        return lxml_html.document_fromstring(page_html.encode("utf-8"))
+
+
+def extract_text(element):
+    """
+    近似浏览器 innerText 的文本提取：块级元素换行、折叠空白、忽略脚本样式
+
+    Args:
+        element: lxml元素
+
+    Returns:
+        str: 文本
+    """
+    if element is None:
+        return ""
+    parts = []
+    _collect_text(element, parts, is_root=True)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _collect_text(element, parts, is_root=False):
+    """递归收集元素文本（内部使用）"""
+    tag = element.tag if isinstance(element.tag, str) else None
+    if tag is not None and tag.lower() not in SKIP_TAGS:
+        tag = tag.lower()
+        if tag == "br":
+            parts.append("\n")
+        block = tag in BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if element.text:
+            parts.append(element.text)
+        for child in element:
+            _collect_text(child, parts)
+        if tag in ("td", "th"):
+            parts.append(" ")
+        if block:
+            parts.append("\n")
+    if element.tail and not is_root:
+        parts.append(element.tail)
+
+
+def _item_scope(link):
+    """向上找到只包含当前 /bid/ 链接的最大祖先节点，作为该结果项的范围"""
+    scope = link
+    parent = link.getparent()
+    while parent is not None and parent.tag != "body":
+        if len(BID_LINKS_XPATH(parent)) > 1:
+            break
+        scope = parent
+        parent = parent.getparent()
+    return scope
+
+
+def parse_search_results(page_html, base_url="", max_items=20):
+    """
+    解析搜索结果页，提取 /bid/ 详情链接及列表项日期
+
+    Args:
+        page_html: 页面HTML（或已解析的文档根节点）
+        base_url: 用于补全相对链接的页面URL
+        max_items: 最大返回条目数
+
+    Returns:
+        list: [{'url', 'name', 'index', 'date'}]
+    """
+    root = page_html if isinstance(page_html, etree._Element) else parse_document(page_html)
+    if root is None:
+        return []
+
+    anchors = RESULT_LINKS_XPATH(root) or RESULT_LINKS_FALLBACK_XPATH(root)
+    links = []
+    seen = set()
+    for anchor in anchors:
+        href = anchor.get("href")
+        url = urljoin(base_url, href) if href else ""
+        name = extract_text(anchor).strip()
+        if not url or not name or url in seen:
+            continue
+        seen.add(url)
+        item_text = extract_text(_item_scope(anchor))
+        match = LIST_DATE_PATTERN.search(item_text) or LIST_RELATIVE_DATE_PATTERN.search(item_text)
+        links.append({"url": url, "name": name, "index": len(links) + 1, "date": match.group(0) if match else ""})
+        if len(links) >= max_items:
+            break
+    return links
+
+
+def parse_next_page(page_html, base_url=""):
+    """
+    解析搜索结果页的“下一页”控件
+
+    Args:
+        page_html: 页面HTML（或已解析的文档根节点）
+        base_url: 用于补全相对链接的页面URL
+
+    Returns:
+        tuple: (next_url, has_next_control)
+            next_url: 下一页链接（控件无可用href时为None）
+            has_next_control: 是否存在可用的“下一页”控件
+    """
+    root = page_html if isinstance(page_html, etree._Element) else parse_document(page_html)
+    if root is None:
+        return None, False
+
+    for xpath in NEXT_PAGE_XPATHS:
+        nodes = xpath(root)
+        if not nodes:
+            continue
+        node = nodes[0]
+        classes = node.get("class") or ""
+        if "disabled" in classes or "inactive" in classes:
+            return None, False
+        href = (node.get("href") or "").strip()
+        if href and href != "#" and not href.startswith("javascript"):
+            return urljoin(base_url, href), True
+        return None, True
+    return None, False
+
+
+def parse_bid_detail(page_html):
+    """
+    解析招投标详情页，提取发布日期文本、正文与正文字段
+
+    Args:
+        page_html: 页面HTML（或已解析的文档根节点）
+
+    Returns:
+        dict: {'date_text', 'text', 'fields'}，fields 为 extract_fields 的结果
+    """
+    root = page_html if isinstance(page_html, etree._Element) else parse_document(page_html)
+    if root is None:
+        return {"date_text": "", "text": "", "fields": {}}
+
+    date_text = ""
+    for xpath in DATE_XPATHS:
+        nodes = xpath(root)
+        if nodes:
+            date_text = extract_text(nodes[0]).strip()
+            break
+
+    text = ""
+    for xpath in CONTAINER_XPATHS:
+        nodes = xpath(root)
+        if nodes:
+            text = extract_text(nodes[0]).strip()
+            break
+
+    return {"date_text": date_text, "text": text, "fields": extract_fields(text)}
@@ -0,0 +1,164 @@
+import io
+import os
+import re
+import time
+import pstats
+import logging
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from config import PROFILE_DIR, PROFILE_TOP_N, PROFILE_TRACEMALLOC_FRAMES
+
+
+logger = logging.getLogger(__name__)
+
+# 快照中排除 tracemalloc 与剖析器自身的分配
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+)
+
+
+def _safe_name(label):
+    """标签转为文件名（保留中文，替换路径分隔符等字符）"""
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", label).strip("_") or "profile"
+
+
+class Profiler:
+    """
+    cProfile + tracemalloc 性能剖析
+
+    按标签（如每个关键词、导出）分别累积 cProfile 统计与 tracemalloc 内存分配差异，
+    每次退出剖析区间时写出 <标签>.pstats 与 <标签>_report.txt（耗时前N函数 + 分配前N代码行）。
+
+    注：cProfile 只统计进入剖析区间的线程；tracemalloc 为进程级，分配差异包含同时运行的其他线程。
+    """
+
+    def __init__(self, output_dir=PROFILE_DIR, top_n=PROFILE_TOP_N, frames=PROFILE_TRACEMALLOC_FRAMES):
+        """
+        初始化剖析器（默认关闭）
+
+        Args:
+            output_dir: 输出目录
+            top_n: 报告中列出的函数与分配代码行数量
+            frames: tracemalloc 记录的调用栈帧数
+        """
+        self.enabled = False
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.frames = frames
+        self._lock = threading.Lock()
+        self._profiles = {}  # 标签 -> cProfile.Profile（多次进入时累积）
+        self._allocations = {}  # 标签 -> {代码位置: [分配字节差, 分配次数差]}
+        self._elapsed = {}
+        self.files = []
+
+    def enable(self):
+        """开启剖析并启动 tracemalloc"""
+        if self.enabled:
+            return
+        self.enabled = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        os.makedirs(self.output_dir, exist_ok=True)
+        logger.info(f"✓ 性能剖析已开启，结果输出到 {self.output_dir}")
+
+    def disable(self):
+        """关闭剖析并停止 tracemalloc"""
+        self.enabled = False
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def profile(self, label):
+        """
+        剖析区间（未开启时不做任何事）
+
+        用法:
+            with PROFILER.profile(f"keyword_{keyword}"):
+                scraper.search_toubiao(keyword)
+
+        Args:
+            label: 标签；同一标签多次进入时统计累积
+        """
+        if not self.enabled:
+            yield
+            return
+
+        with self._lock:
+            profile = self._profiles.setdefault(label, cProfile.Profile())
+        before = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        start = time.perf_counter()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Python 3.12+ 同一时刻只允许一个 cProfile 处于开启状态（如另一线程正在剖析）
+            logger.warning(f"⚠ 跳过剖析 {label}: {str(e)}")
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - start
+            after = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+            self._record(label, profile, before, after, elapsed)
+
+    def _record(self, label, profile, before, after, elapsed):
+        """累积分配差异并写出该标签的报告"""
+        diffs = after.compare_to(before, "traceback" if self.frames > 1 else "lineno")
+        with self._lock:
+            allocations = self._allocations.setdefault(label, {})
+            for stat in diffs:
+                if stat.size_diff <= 0:
+                    continue
+                where = "\n    ".join(str(frame) for frame in stat.traceback)
+                item = allocations.setdefault(where, [0, 0])
+                item[0] += stat.size_diff
+                item[1] += stat.count_diff
+            self._elapsed[label] = self._elapsed.get(label, 0.0) + elapsed
+            self._write(label, profile, allocations)
+
+    def _write(self, label, profile, allocations):
+        """写出 .pstats 与文本报告（调用方持有锁）"""
+        base = os.path.join(self.output_dir, _safe_name(label))
+        profile.dump_stats(base + ".pstats")
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+        stats.sort_stats("tottime").print_stats(self.top_n)
+
+        lines = [f"剖析标签: {label}", f"累计耗时: {self._elapsed[label]:.2f}s", "",
+                 f"内存分配增长 Top {self.top_n}（tracemalloc，含同时运行的其他线程）:"]
+        top = sorted(allocations.items(), key=lambda item: item[1][0], reverse=True)[:self.top_n]
+        for where, (size, count) in top:
+            lines.append(f"  {size / 1024:10.1f} KB  {count:8d} 次  {where}")
+        lines += ["", "耗时 Top（cProfile）:", stream.getvalue()]
+        with open(base + "_report.txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        for path in (base + ".pstats", base + "_report.txt"):
+            if path not in self.files:
+                self.files.append(path)
+
+    def log_summary(self):
+        """打印各标签耗时与内存分配最多的代码行"""
+        if not self.enabled or not self._elapsed:
+            return
+        logger.info("性能剖析:")
+        with self._lock:
+            for label, elapsed in self._elapsed.items():
+                allocations = self._allocations.get(label, {})
+                total = sum(size for size, _ in allocations.values())
+                logger.info(f"  {label}: {elapsed:.2f}s，分配增长 {total / 1024 / 1024:.1f}MB")
+                top = sorted(allocations.items(), key=lambda item: item[1][0], reverse=True)[:3]
+                for where, (size, count) in top:
+                    logger.info(f"    {size / 1024:.0f}KB / {count} 次  {where.splitlines()[0]}")
+        logger.info(f"✓ 剖析结果已保存到 {self.output_dir}（{len(self.files)} 个文件，"
+                    f".pstats 可用 python -m pstats 或 snakeviz 查看）")
+
+
+# 进程内共享的剖析器
+PROFILER = Profiler()
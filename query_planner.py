@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+按发布日期分片搜索
+站点对单次搜索有翻页上限（max_pages）与结果数上限，宽泛关键词（如“注射笔”）一次搜索无法抓全。
+查询规划器把关键词按发布日期拆成若干区间分片，每个分片带搜索页的日期筛选参数（SEARCH_DATE_PARAMS）
+单独搜索；达到翻页上限的分片对半拆分后继续搜索，直到不再截断或达到最小跨度。
+两个互不重叠的分片返回相同的首页结果时，说明站点忽略了日期筛选参数，此时停止拆分，避免重复搜索。
+分片之间互不依赖，可由线程池并发执行，结束后报告总体与各分片的覆盖情况。
+
+用法:
+    python main.py --shard
+"""
+
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import timedelta
+from urllib.parse import quote
+import date_utils
+from config import SEARCH_URL_TEMPLATE, SEARCH_DATE_PARAMS, SHARD_INITIAL_DAYS, SHARD_MIN_DAYS, SHARD_WORKERS
+
+
+logger = logging.getLogger(__name__)
+
+# 分片状态：翻页未达上限 / 达到上限已拆分为子分片 / 达到上限但已是最小跨度
+COMPLETE, SPLIT, TRUNCATED = "完整", "已拆分", "截断"
+
+
+class Shard:
+    """一个发布日期区间分片及其搜索结果"""
+
+    def __init__(self, start, end, depth=0):
+        """
+        Args:
+            start: 区间起点（date，含）
+            end: 区间终点（date，含）
+            depth: 拆分深度（初始分片为0）
+        """
+        self.start = start
+        self.end = end
+        self.depth = depth
+        self.pages = 0
+        self.capped = False
+        self.status = ""
+        self.results = []
+        self.first_urls = None  # 首页列表中的详情链接（用于判断日期筛选是否生效）
+
+    @property
+    def days(self):
+        """区间跨度（天）"""
+        return (self.end - self.start).days + 1
+
+    def split(self):
+        """
+        对半拆分
+
+        Returns:
+            list: 两个子分片（较新的区间在前，与搜索结果的倒序一致）
+        """
+        middle = self.start + timedelta(days=self.days // 2 - 1)
+        return [Shard(middle + timedelta(days=1), self.end, self.depth + 1), Shard(self.start, middle, self.depth + 1)]
+
+    def label(self):
+        """日志中显示的区间"""
+        return f"[{self.start.isoformat()} ~ {self.end.isoformat()}]"
+
+    def overlaps(self, other):
+        """两个分片的日期区间是否重叠"""
+        return self.start <= other.end and other.start <= self.end
+
+
+class QueryPlanner:
+    """查询规划器：把一个关键词拆成发布日期分片并逐个（或并发）调用 search_toubiao"""
+
+    def __init__(self, scraper, max_pages=5, max_items_per_page=20, initial_days=SHARD_INITIAL_DAYS,
+                 min_days=SHARD_MIN_DAYS, workers=SHARD_WORKERS, url_template=SEARCH_URL_TEMPLATE,
+                 date_params=SEARCH_DATE_PARAMS):
+        """
+        初始化查询规划器
+
+        Args:
+            scraper: TianyanchaScraper实例
+            max_pages: 每个分片的最大抓取页数
+            max_items_per_page: 每页最大提取条目数
+            initial_days: 初始分片跨度（天）
+            min_days: 分片最小跨度（天），达到后不再拆分
+            workers: 并发执行的分片数（1表示在当前线程依次执行）
+            url_template: 搜索URL模板（含 {keyword}）
+            date_params: (起始日期参数名, 结束日期参数名)；None表示站点不支持日期筛选，只按单个分片搜索
+        """
+        self.scraper = scraper
+        self.max_pages = max_pages
+        self.max_items_per_page = max_items_per_page
+        self.initial_days = max(1, initial_days)
+        self.min_days = max(1, min_days)
+        self.workers = max(1, workers)
+        self.url_template = url_template
+        self.date_params = date_params
+        self.keyword = ""
+        self.start = None
+        self.end = None
+        self.shards = []
+        self.date_filter_ignored = False
+        self._first_pages = {}  # 首页详情链接 -> 返回该首页的分片列表
+
+    def plan(self, start, end):
+        """
+        按初始跨度切分日期区间
+
+        Args:
+            start: 区间起点（date）
+            end: 区间终点（date）
+
+        Returns:
+            list: 初始分片（较新的区间在前）
+        """
+        if not self.date_params:
+            return [Shard(start, end)]
+        shards = []
+        shard_end = end
+        while shard_end >= start:
+            shard_start = max(start, shard_end - timedelta(days=self.initial_days - 1))
+            shards.append(Shard(shard_start, shard_end))
+            shard_end = shard_start - timedelta(days=1)
+        return shards
+
+    def shard_url(self, keyword, shard):
+        """
+        构造分片的搜索URL
+
+        Args:
+            keyword: 搜索关键词
+            shard: 分片
+
+        Returns:
+            str: 带发布日期筛选参数的搜索URL
+        """
+        url = self.url_template.format(keyword=quote(keyword))
+        if not self.date_params:
+            return url
+        start_param, end_param = self.date_params
+        separator = "&" if "?" in url else "?"
+        return f"{url}{separator}{start_param}={shard.start.isoformat()}&{end_param}={shard.end.isoformat()}"
+
+    def run(self, keyword, start=date_utils.FILTER_START, end=date_utils.FILTER_END):
+        """
+        分片搜索一个关键词
+
+        Args:
+            keyword: 搜索关键词
+            start: 区间起点（date），默认 DATE_FILTER_START
+            end: 区间终点（date），默认 DATE_FILTER_END
+
+        Returns:
+            list: 全部分片的搜索结果（按区间从新到旧）
+        """
+        self.keyword, self.start, self.end = keyword, start, end
+        self.shards = []
+        self.date_filter_ignored = False
+        self._first_pages = {}
+        if not self.date_params:
+            logger.warning("⚠ 未配置搜索页日期筛选参数，按单个分片搜索")
+
+        queue = deque(self.plan(start, end))
+        logger.info(f"关键词 '{keyword}' 拆分为 {len(queue)} 个初始分片（{start.isoformat()} ~ {end.isoformat()}）")
+        if self.workers == 1:
+            while queue:
+                queue.extend(self._settle(self._run_shard(keyword, queue.popleft())))
+                if self.date_filter_ignored:
+                    queue.clear()
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="shard") as executor:
+                pending = {executor.submit(self._run_shard, keyword, shard) for shard in queue}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future.cancelled():
+                            continue
+                        for child in self._settle(future.result()):
+                            pending.add(executor.submit(self._run_shard, keyword, child))
+                    if self.date_filter_ignored:
+                        # 尚未开始的分片只会重复同一搜索，取消（已在执行的分片照常结束）
+                        for future in pending:
+                            future.cancel()
+
+        self.shards.sort(key=lambda shard: (-shard.end.toordinal(), shard.depth))
+        return [record for shard in self.shards for record in shard.results]
+
+    def _run_shard(self, keyword, shard):
+        """搜索一个分片并记录翻页情况"""
+        logger.info(f"分片 {shard.label()} 开始搜索")
+        shard.results = self.scraper.search_toubiao(keyword, self.max_pages, self.max_items_per_page,
+                                                    search_url=self.shard_url(keyword, shard))
+        shard.pages, shard.capped = self.scraper.last_search_paging()
+        shard.first_urls = self.scraper.last_search_first_page()
+        return shard
+
+    def _settle(self, shard):
+        """
+        判定分片状态
+
+        Returns:
+            list: 需要继续搜索的子分片（未达到翻页上限或无法再拆分时为空）
+        """
+        self.shards.append(shard)
+        self._check_date_filter(shard)
+        if not shard.capped:
+            shard.status = COMPLETE
+            return []
+        if self.date_params and not self.date_filter_ignored and shard.days > self.min_days:
+            shard.status = SPLIT
+            logger.info(f"⚠ 分片 {shard.label()} 达到翻页上限（{shard.pages} 页），对半拆分")
+            return shard.split()
+        shard.status = TRUNCATED
+        logger.warning(f"⚠ 分片 {shard.label()} 达到翻页上限且无法再拆分，结果可能不完整")
+        return []
+
+    def _check_date_filter(self, shard):
+        """
+        检查日期筛选参数是否生效：互不重叠的两个区间不可能返回相同的非空首页
+
+        父子分片区间重叠，较新的子分片与父分片首页相同属正常情况，因此只与不重叠的分片比较
+        （日期筛选被忽略时，同一父分片拆出的两个子分片首页相同）。
+        """
+        if not self.date_params or self.date_filter_ignored or not shard.first_urls:
+            return
+        same = self._first_pages.setdefault(shard.first_urls, [])
+        for other in same:
+            if not other.overlaps(shard):
+                self.date_filter_ignored = True
+                logger.warning(f"⚠ 分片 {other.label()} 与 {shard.label()} 的首页结果相同，"
+                               f"搜索页日期筛选参数 {self.date_params} 可能未生效，停止拆分")
+                return
+        same.append(shard)
+
+    def report(self):
+        """
+        总体与各分片的覆盖情况
+
+        Returns:
+            dict: {'keyword', 'start', 'end', 'records', 'pages', 'shards', 'truncated', 'date_filter_ignored',
+                   'coverage', 'per_shard'}
+                coverage 为完整翻完（未截断）的日期天数占整个区间的比例
+        """
+        total_days = (self.end - self.start).days + 1 if self.start and self.end else 0
+        complete_days = sum(shard.days for shard in self.shards if shard.status == COMPLETE)
+        return {
+            "keyword": self.keyword,
+            "start": self.start.isoformat() if self.start else "",
+            "end": self.end.isoformat() if self.end else "",
+            "records": sum(len(shard.results) for shard in self.shards),
+            "pages": sum(shard.pages for shard in self.shards),
+            "shards": len(self.shards),
+            "truncated": sum(1 for shard in self.shards if shard.status == TRUNCATED),
+            "date_filter_ignored": self.date_filter_ignored,
+            "coverage": complete_days / total_days if total_days > 0 else 0.0,
+            "per_shard": [
+                {"start": shard.start.isoformat(), "end": shard.end.isoformat(), "days": shard.days,
+                 "depth": shard.depth, "pages": shard.pages, "records": len(shard.results), "status": shard.status}
+                for shard in self.shards
+            ],
+        }
+
+    def log_report(self):
+        """打印覆盖报告"""
+        report = self.report()
+        logger.info(f"关键词 '{report['keyword']}' 分片覆盖: {report['coverage']:.1%}（{report['start']} ~ {report['end']}），"
+                    f"{report['shards']} 个分片，{report['pages']} 页，{report['records']} 条，截断 {report['truncated']} 个")
+        for shard in report["per_shard"]:
+            indent = "  " * (shard["depth"] + 1)
+            logger.info(f"{indent}[{shard['start']} ~ {shard['end']}] {shard['pages']} 页 {shard['records']} 条 {shard['status']}")
+        return report
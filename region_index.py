@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+行政区划索引
+由 data/regions.csv（省份、城市、区县、别名）构建 Aho-Corasick 自动机，一次扫描地址或公告正文，
+解析出省份/城市/区县，并列出正文提及的全部省份与地市。
+
+用法:
+    python region_index.py 广州市越秀区人民中路 123 号
+"""
+
+import os
+import csv
+import sys
+import logging
+import threading
+from collections import namedtuple
+from aho_corasick import AhoCorasick
+from config import REGION_DATA_FILE
+
+
+logger = logging.getLogger(__name__)
+
+# 省份为简称（与“省份”列一致，如“广东”），城市与区县为全称；未解析出的层级为空字符串
+Region = namedtuple("Region", ["province", "city", "district"])
+EMPTY_REGION = Region("", "", "")
+
+PROVINCE, CITY, DISTRICT = 0, 1, 2
+# 自动生成城市简称时去掉的后缀（“广州市”→“广州”）
+CITY_SUFFIXES = ("地区", "市", "盟")
+# 简称后紧跟这些字时视为路名而非地名（如“中山路”“北海道”）
+STREET_CHARS = frozenset("路街道巷")
+LIST_SEPARATOR = "、"
+
+
+def _data_path(path):
+    """相对路径按本模块所在目录解析（数据文件随代码发布）"""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+
+
+class RegionIndex:
+    """行政区划索引：全称与简称共用一个自动机，按层级与上下级一致性消歧"""
+
+    def __init__(self, path=REGION_DATA_FILE):
+        """
+        读取区划表并构建自动机
+
+        Args:
+            path: 区划表CSV（列：省份, 城市, 区县, 别名；别名以 | 分隔，省级行的别名第一个为省份简称）
+        """
+        self.path = _data_path(path)
+        with open(self.path, encoding="utf-8", newline="") as f:
+            rows = [row for row in csv.DictReader(f) if row.get("省份")]
+
+        short_names = {}
+        municipalities = set()
+        for row in rows:
+            if not row["城市"] and not row["区县"]:
+                aliases = [alias for alias in (row.get("别名") or "").split("|") if alias]
+                short_names[row["省份"]] = aliases[0] if aliases else row["省份"]
+            elif row["城市"] == row["省份"]:
+                municipalities.add(row["省份"])
+
+        self.automaton = AhoCorasick()
+        self.regions = 0
+        for row in rows:
+            province, city, district = row["省份"], row["城市"], row["区县"]
+            short = short_names.get(province, province)
+            if district:
+                level, name, region = DISTRICT, district, Region(short, city, district)
+            elif city:
+                level, name, region = CITY, city, Region(short, city, "")
+            else:
+                # 直辖市的省级行同时确定城市
+                level, name = PROVINCE, province
+                region = Region(short, province if province in municipalities else "", "")
+
+            aliases = [alias for alias in (row.get("别名") or "").split("|") if alias]
+            if level == CITY and not aliases:
+                for suffix in CITY_SUFFIXES:
+                    if name.endswith(suffix) and len(name) - len(suffix) >= 2:
+                        aliases.append(name[:-len(suffix)])
+                        break
+            self.automaton.add(name, (level, region, False))
+            for alias in aliases:
+                if alias != name:
+                    self.automaton.add(alias, (level, region, True))
+            self.regions += 1
+        self.automaton.build()
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+
+    def _candidates(self, text):
+        """扫描文本，返回每处匹配的候选 [(层级, Region), ...]（已排除路名中的简称）"""
+        matches = []
+        for start, end, values in self.automaton.find(text):
+            street = end < len(text) and text[end] in STREET_CHARS
+            candidates = [(level, region) for level, region, is_alias in values if not (is_alias and street)]
+            if candidates:
+                matches.append(candidates)
+        return matches
+
+    def _resolve_candidates(self, matches):
+        """按出现顺序逐级确定省份/城市/区县：每处匹配取第一个与已确定上级一致的候选"""
+        province = city = district = ""
+        for candidates in matches:
+            for level, region in candidates:
+                if province and region.province != province:
+                    continue
+                if level >= CITY and city and region.city and region.city != city:
+                    continue
+                if level == PROVINCE and not province:
+                    province, city = region.province, city or region.city
+                elif level == CITY and not city:
+                    province, city = region.province, region.city
+                elif level == DISTRICT and not district:
+                    province, city, district = region
+                else:
+                    continue
+                break
+        return Region(province, city, district)
+
+    def resolve(self, text):
+        """
+        解析地址或公告正文所在的省份/城市/区县
+
+        Args:
+            text: 地址或正文
+
+        Returns:
+            Region: 未解析出的层级为空字符串
+        """
+        if not text:
+            return EMPTY_REGION
+        return self._resolve_candidates(self._candidates(text))
+
+    def mentions(self, text):
+        """
+        列出正文提及的全部地区（同名地区优先取与正文所在省份一致的）
+
+        Args:
+            text: 正文
+
+        Returns:
+            list: 按首次出现排序、去重后的 Region 列表
+        """
+        if not text:
+            return []
+        matches = self._candidates(text)
+        return self._mentions(matches, self._resolve_candidates(matches).province)
+
+    def _mentions(self, matches, home):
+        regions = []
+        for candidates in matches:
+            level, region = next((item for item in candidates if item[1].province == home), candidates[0])
+            # 区县重名很多（如各地的“江北区”），只计入正文所在省份的区县
+            if level == DISTRICT and home and region.province != home:
+                continue
+            if region not in regions:
+                regions.append(region)
+        return regions
+
+    def resolve_many(self, texts):
+        """
+        批量解析（相同文本只解析一次，适合对整个结果库重新解析）
+
+        Args:
+            texts: 地址或正文的可迭代对象
+
+        Returns:
+            list: Region 列表，与输入一一对应
+        """
+        results = []
+        for text in texts:
+            region = self._cache.get(text)
+            if region is None:
+                region = self.resolve(text)
+                with self._cache_lock:
+                    if len(self._cache) >= 100000:
+                        self._cache.clear()
+                    self._cache[text] = region
+            results.append(region)
+        return results
+
+    def fill_record(self, record, text=None):
+        """
+        填写记录的 省份 / 配送省份 / 覆盖地区
+
+        省份优先由企业地址解析，地址无法解析时由标题与正文解析；配送省份与覆盖地区为正文提及的省份与地市。
+
+        Args:
+            record: 数据字典
+            text: 用于解析的正文，默认取 企业名称 + 企业经营范围
+
+        Returns:
+            dict: 同一个数据字典
+        """
+        if text is None:
+            text = f"{record.get('企业名称') or ''}\n{record.get('企业经营范围') or ''}"
+        address = record.get("企业地址") or ""
+        province = self.resolve_many([address])[0].province if address else ""
+        matches = self._candidates(text)
+        home = self._resolve_candidates(matches).province
+        mentioned = self._mentions(matches, province or home)
+        province = province or home
+        record["省份"] = province or ("未知" if address else record.get("省份", ""))
+        record["配送省份"] = LIST_SEPARATOR.join(dict.fromkeys(region.province for region in mentioned))
+        record["覆盖地区"] = LIST_SEPARATOR.join(dict.fromkeys(region.city for region in mentioned if region.city))
+        return record
+
+    def fill_records(self, records):
+        """
+        批量重新填写地区字段（逐条返回）
+
+        Args:
+            records: 数据字典的可迭代对象
+
+        Returns:
+            generator: 填写后的数据字典
+        """
+        for record in records:
+            yield self.fill_record(record)
+
+
+_shared_index = None
+_shared_index_lock = threading.Lock()
+
+
+def get_region_index():
+    """
+    获取进程内共享的区划索引（首次调用时构建）
+
+    Returns:
+        RegionIndex: 索引实例
+    """
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None:
+            _shared_index = RegionIndex()
+            logger.debug(f"区划索引已加载: {_shared_index.regions} 个地区")
+        return _shared_index
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    index = get_region_index()
+    text = " ".join(sys.argv[1:])
+    logger.info(f"{index.resolve(text)}")
+    for region in index.mentions(text):
+        logger.info(f"  提及: {region.province} {region.city} {region.district}".rstrip())
@@ -0,0 +1,405 @@
+"""
+页面录制与回放
+
+录制模式下 BrowserManager 把访问过的每个页面HTML保存到夹具目录；
+回放驱动 ReplayDriver 从夹具目录读取页面，实现 TianyanchaScraper 与 LoginHandler
+用到的 WebDriver 子集（get、find_element(s)、execute_script、窗口句柄、page_source），
+使完整的 search_toubiao 流程无需浏览器与网络即可运行。
+
+限制：回放页面是静态HTML，不执行页面脚本；iframe 内容与点击翻页时URL不变的页面无法区分回放。
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from urllib.parse import urljoin
+from lxml import etree, html as lxml_html
+from selenium.common.exceptions import NoSuchElementException, NoSuchWindowException
+from selenium.webdriver.common.by import By
+from dom_scripts import LIST_EXTRACT_SCRIPT, DETAIL_EXTRACT_SCRIPT, READY_STATE_SCRIPT, PAGE_METRICS_SCRIPT, FIND_FIRST_SCRIPT
+from page_cache import normalize_url
+import page_parser
+
+
+logger = logging.getLogger(__name__)
+
+EMPTY_PAGE = "<html><head><title></title></head><body></body></html>"
+
+CSS_COMPOUND = re.compile(r"([a-zA-Z][\w-]*|\*)?((?:[.#][\w-]+|\[[^\]]+\])*)")
+CSS_SIMPLE = re.compile(r"[.#][\w-]+|\[[^\]]+\]")
+
+
+def css_to_xpath(selector, relative=False):
+    """
+    将简单CSS选择器转换为XPath（支持分组、后代组合、标签、.class、#id、[attr] 与 [attr='v']）
+
+    Args:
+        selector: CSS选择器
+        relative: 是否相对当前元素查找
+
+    Returns:
+        str: XPath表达式
+    """
+    paths = []
+    for group in selector.split(","):
+        steps = []
+        for compound in group.split():
+            match = CSS_COMPOUND.fullmatch(compound)
+            if not match:
+                raise ValueError(f"回放驱动不支持的CSS选择器: {selector}")
+            conditions = []
+            for token in CSS_SIMPLE.findall(match.group(2)):
+                if token[0] == ".":
+                    conditions.append(page_parser._class_token(token[1:]))
+                elif token[0] == "#":
+                    conditions.append(f"@id='{token[1:]}'")
+                elif "=" in token:
+                    name, value = token[1:-1].split("=", 1)
+                    conditions.append(f"@{name.strip()}='{value.strip().strip(chr(39) + chr(34))}'")
+                else:
+                    conditions.append(f"@{token[1:-1].strip()}")
+            steps.append((match.group(1) or "*") + "".join(f"[{cond}]" for cond in conditions))
+        paths.append((".//" if relative else "//") + "//".join(steps))
+    return " | ".join(paths)
+
+
+def locator_to_xpath(by, value, relative=False):
+    """
+    将 Selenium 定位器转换为XPath
+
+    Args:
+        by: 定位方式（By.*）
+        value: 定位值
+        relative: 是否相对当前元素查找
+
+    Returns:
+        str: XPath表达式
+    """
+    prefix = ".//" if relative else "//"
+    if by == By.XPATH:
+        return value
+    if by == By.CSS_SELECTOR:
+        return css_to_xpath(value, relative)
+    if by == By.TAG_NAME:
+        return prefix + value
+    if by == By.ID:
+        return f"{prefix}*[@id='{value}']"
+    if by == By.NAME:
+        return f"{prefix}*[@name='{value}']"
+    if by == By.CLASS_NAME:
+        return f"{prefix}*[{page_parser._class_token(value)}]"
+    if by == By.LINK_TEXT:
+        return f"{prefix}a[normalize-space(.)='{value}']"
+    if by == By.PARTIAL_LINK_TEXT:
+        return f"{prefix}a[contains(., '{value}')]"
+    raise ValueError(f"回放驱动不支持的定位方式: {by}")
+
+
+class FixtureArchive:
+    """夹具目录：index.json 记录 归一化URL -> {文件名, 最终URL}，页面以HTML文件保存便于查看和修改"""
+
+    def __init__(self, path):
+        """
+        打开（或创建）夹具目录
+
+        Args:
+            path: 夹具目录
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._index_path = os.path.join(path, "index.json")
+        self.index = {}
+        if os.path.exists(self._index_path):
+            with open(self._index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+
+    def save(self, url, page_html, final_url=None):
+        """
+        保存页面
+
+        Args:
+            url: 请求的URL
+            page_html: 页面HTML
+            final_url: 跳转后的最终URL（与请求URL不同时两者都可回放）
+        """
+        final_url = final_url or url
+        filename = hashlib.sha1(normalize_url(final_url).encode("utf-8")).hexdigest()[:16] + ".html"
+        with self._lock:
+            with open(os.path.join(self.path, filename), "w", encoding="utf-8") as f:
+                f.write(page_html)
+            for key in {normalize_url(url), normalize_url(final_url)}:
+                self.index[key] = {"file": filename, "url": final_url}
+            tmp_path = self._index_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.index, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self._index_path)
+
+    def load(self, url):
+        """
+        读取页面
+
+        Args:
+            url: 页面URL
+
+        Returns:
+            tuple: (页面HTML, 最终URL)；未录制时返回 (None, None)
+        """
+        entry = self.index.get(normalize_url(url))
+        if not entry:
+            return None, None
+        with open(os.path.join(self.path, entry["file"]), encoding="utf-8") as f:
+            return f.read(), entry["url"]
+
+    def __len__(self):
+        return len(self.index)
+
+
+class ReplayElement:
+    """回放页面中的元素（包装 lxml 元素，提供 WebElement 常用接口）"""
+
+    def __init__(self, driver, element):
+        self._driver = driver
+        self._element = element
+        self._value = element.get("value", "")
+
+    @property
+    def tag_name(self):
+        return str(self._element.tag).lower()
+
+    @property
+    def text(self):
+        return page_parser.extract_text(self._element)
+
+    def get_attribute(self, name):
+        """读取属性（href/src 返回绝对地址，与浏览器属性值一致）"""
+        if name in ("innerText", "textContent"):
+            return self.text
+        if name == "outerHTML":
+            return etree.tostring(self._element, encoding="unicode", method="html")
+        if name == "value":
+            return self._value
+        value = self._element.get(name)
+        if value is not None and name in ("href", "src"):
+            return urljoin(self._driver.current_url, value)
+        return value
+
+    def get_dom_attribute(self, name):
+        return self._element.get(name)
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return self._element.get("disabled") is None
+
+    def click(self):
+        """点击：链接（含祖先链接）跳转到其 href，其余元素无动作"""
+        anchor = self._element
+        while anchor is not None and not (anchor.tag == "a" and anchor.get("href")):
+            anchor = anchor.getparent()
+        if anchor is None:
+            return
+        href = anchor.get("href").strip()
+        if href and href != "#" and not href.startswith("javascript"):
+            self._driver.get(urljoin(self._driver.current_url, href))
+
+    def send_keys(self, *values):
+        self._value += "".join(str(value) for value in values)
+
+    def clear(self):
+        self._value = ""
+
+    def submit(self):
+        pass
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._driver._find(by, value, self._element)
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"回放页面中未找到元素: {by}={value}")
+        return elements[0]
+
+
+class _SwitchTo:
+    """driver.switch_to 的回放实现"""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        if handle not in self._driver._windows:
+            raise NoSuchWindowException(f"窗口不存在: {handle}")
+        self._driver.current_window_handle = handle
+
+    def frame(self, frame_reference):
+        # 回放不加载 iframe 内容，保持在主文档
+        pass
+
+    def default_content(self):
+        pass
+
+    def parent_frame(self):
+        pass
+
+
+class ReplayDriver:
+    """从夹具目录回放页面的 WebDriver 替身"""
+
+    def __init__(self, archive):
+        """
+        初始化回放驱动
+
+        Args:
+            archive: FixtureArchive 实例或夹具目录路径
+        """
+        self.archive = archive if isinstance(archive, FixtureArchive) else FixtureArchive(archive)
+        self.switch_to = _SwitchTo(self)
+        self.hits = 0
+        self.misses = 0
+        self._cookies = []
+        self._windows = {}
+        self._window_seq = 0
+        self.current_window_handle = self._open_window()
+
+    def _open_window(self):
+        """新建空白窗口并返回句柄"""
+        self._window_seq += 1
+        handle = f"replay-{self._window_seq}"
+        self._windows[handle] = {"url": "about:blank", "html": EMPTY_PAGE, "root": None, "history": []}
+        return handle
+
+    @property
+    def _window(self):
+        window = self._windows.get(self.current_window_handle)
+        if window is None:
+            raise NoSuchWindowException("当前窗口已关闭")
+        return window
+
+    @property
+    def window_handles(self):
+        return list(self._windows)
+
+    @property
+    def current_url(self):
+        return self._window["url"]
+
+    @property
+    def page_source(self):
+        return self._window["html"]
+
+    @property
+    def title(self):
+        return self._root().findtext(".//title") or ""
+
+    def _root(self):
+        """当前页面的 lxml 文档（按需解析并缓存）"""
+        window = self._window
+        if window["root"] is None:
+            root = page_parser.parse_document(window["html"])
+            window["root"] = root if root is not None else lxml_html.document_fromstring(EMPTY_PAGE)
+        return window["root"]
+
+    def _load(self, url, push_history=True):
+        """载入页面到当前窗口"""
+        window = self._window
+        page_html, final_url = self.archive.load(url)
+        if page_html is None:
+            self.misses += 1
+            logger.warning(f"⚠ 回放夹具中没有该页面: {url}")
+            page_html, final_url = EMPTY_PAGE, url
+        else:
+            self.hits += 1
+        if push_history and window["url"] != "about:blank":
+            window["history"].append(window["url"])
+        window.update(url=final_url, html=page_html, root=None)
+
+    def get(self, url):
+        self._load(url)
+
+    def refresh(self):
+        self._load(self.current_url, push_history=False)
+
+    def back(self):
+        history = self._window["history"]
+        if history:
+            self._load(history.pop(), push_history=False)
+
+    def _find(self, by, value, context=None):
+        """按定位器查找元素，context 为 None 时在整个文档中查找"""
+        xpath = locator_to_xpath(by, value, relative=context is not None)
+        nodes = (context if context is not None else self._root()).xpath(xpath)
+        return [ReplayElement(self, node) for node in nodes if isinstance(node, etree._Element)]
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._find(by, value)
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self._find(by, value)
+        if not elements:
+            raise NoSuchElementException(f"回放页面中未找到元素: {by}={value}")
+        return elements[0]
+
+    def execute_script(self, script, *args):
+        """
+        执行脚本：项目中的注入脚本用离线解析等价实现，其余脚本（滚动等）忽略
+
+        Returns:
+            与浏览器执行对应脚本相同结构的结果
+        """
+        if script == READY_STATE_SCRIPT:
+            # 静态页面无需等待：始终已加载、DOM静默且目标容器已就绪
+            return {"state": "complete", "quiet": 1e9, "found": True}
+        if script == FIND_FIRST_SCRIPT:
+            for index, (by, value) in enumerate(args[0] if args else []):
+                elements = self._find(by, value)
+                if elements:
+                    return [index, elements[0]]
+            return None
+        if script == PAGE_METRICS_SCRIPT:
+            return {"bytes": len(self.page_source.encode("utf-8")), "resources": 0, "load_ms": 0.0, "dcl_ms": 0.0}
+        if script == LIST_EXTRACT_SCRIPT:
+            max_items = args[0] if args else 20
+            links = page_parser.parse_search_results(self._root(), self.current_url, max_items=max_items or 20)
+            return [{"url": link["url"], "name": link["name"], "date": link["date"]} for link in links]
+        if script == DETAIL_EXTRACT_SCRIPT:
+            return page_parser.parse_bid_detail(self._root())
+        if "window.open" in script:
+            self._open_window()
+            return None
+        if "arguments[0].click()" in script and args:
+            args[0].click()
+        return None
+
+    def close(self):
+        self._windows.pop(self.current_window_handle, None)
+
+    def quit(self):
+        self._windows.clear()
+        logger.info(f"回放驱动: 命中 {self.hits} 个页面，缺失 {self.misses} 个")
+
+    def get_cookies(self):
+        return list(self._cookies)
+
+    def add_cookie(self, cookie):
+        self._cookies.append(dict(cookie))
+
+    def delete_all_cookies(self):
+        self._cookies = []
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    def maximize_window(self):
+        pass
@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+本地结果库
+跨运行合并采集结果（按详情链接去重更新），并支持按条件导出为现有Excel格式
+
+用法:
+    python result_store.py stats
+    python result_store.py query --province 广东 --from 2023-01-01 --to 2023-12-31 --out 广东2023.xlsx
+    python result_store.py import output/天眼查招投标数据.jsonl
+    python result_store.py regions
+    python result_store.py dates
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import sqlite3
+import threading
+from config import OUTPUT_COLUMNS, RESULT_STORE_FILE, RESULT_STORE_BATCH
+from date_utils import normalize_date, parse_dates
+
+
+logger = logging.getLogger(__name__)
+
+
+def _quote(column):
+    """列名加双引号（列名含中文与“/”）"""
+    return f'"{column}"'
+
+
+def normalize_publish_date(date_text):
+    """
+    将发布日期文本规范为 YYYY-MM-DD，便于按日期范围查询
+
+    Args:
+        date_text: 日期文本（如 2023年5月6日、2023/05/06、3天前）
+
+    Returns:
+        str: 规范化日期；无法识别时返回空字符串
+    """
+    return normalize_date(date_text)
+
+
+def record_key(record):
+    """
+    记录主键：详情链接；缺失时退化为企业名称
+
+    Args:
+        record: 数据字典
+
+    Returns:
+        str: 主键
+    """
+    return record.get("详情链接") or f"title:{record.get('企业名称', '')}"
+
+
+class ResultStore:
+    """SQLite结果库：按详情链接批量upsert，并在常用查询字段上建立索引"""
+
+    def __init__(self, path=RESULT_STORE_FILE, batch_size=RESULT_STORE_BATCH):
+        """
+        打开（或创建）结果库
+
+        Args:
+            path: 数据库文件路径
+            batch_size: 每个事务写入的记录数
+        """
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+        columns = ["url", "publish_date"] + OUTPUT_COLUMNS + ["updated"]
+        placeholders = ", ".join("?" * len(columns))
+        updates = ", ".join(f"{_quote(c)} = excluded.{_quote(c)}" for c in columns if c != "url")
+        self._upsert_sql = (
+            f"INSERT INTO bids ({', '.join(_quote(c) for c in columns)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(url) DO UPDATE SET {updates}"
+        )
+
+    def _create_schema(self):
+        """建表与索引"""
+        columns = ", ".join(f"{_quote(column)} TEXT" for column in OUTPUT_COLUMNS)
+        self._conn.executescript(
+            f"CREATE TABLE IF NOT EXISTS bids (url TEXT PRIMARY KEY, publish_date TEXT, {columns}, updated REAL);"
+            "CREATE TABLE IF NOT EXISTS bid_keywords (keyword TEXT, url TEXT, PRIMARY KEY (keyword, url));"
+            'CREATE INDEX IF NOT EXISTS idx_bids_credit_code ON bids ("统一社会信用代码");'
+            'CREATE INDEX IF NOT EXISTS idx_bids_name ON bids ("企业名称");'
+            'CREATE INDEX IF NOT EXISTS idx_bids_province_date ON bids ("省份", publish_date);'
+            "CREATE INDEX IF NOT EXISTS idx_bids_date ON bids (publish_date);"
+            "CREATE INDEX IF NOT EXISTS idx_bid_keywords_url ON bid_keywords (url);"
+        )
+        self._conn.commit()
+
+    def upsert(self, records):
+        """
+        批量写入记录：同一详情链接的记录覆盖更新，关键词累加合并
+
+        Args:
+            records: 数据字典的列表或迭代器
+
+        Returns:
+            int: 写入的记录数
+        """
+        total = 0
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                total += self._write_batch(batch)
+                batch = []
+        if batch:
+            total += self._write_batch(batch)
+        return total
+
+    def _write_batch(self, batch):
+        """在一个事务中写入一批记录"""
+        now = time.time()
+        rows = []
+        keyword_rows = []
+        urls = []
+        # 一批记录的发布日期批量解析（同一日期文本只解析一次）
+        dates = parse_dates(record.get("成立日期") for record in batch)
+        for record, publish_date in zip(batch, dates):
+            url = record_key(record)
+            urls.append(url)
+            rows.append([url, publish_date.isoformat() if publish_date else ""]
+                        + [record.get(column, "") or "" for column in OUTPUT_COLUMNS] + [now])
+            for keyword in (record.get("代理产品类别") or "").split(","):
+                if keyword:
+                    keyword_rows.append((keyword, url))
+
+        with self._lock, self._conn:
+            self._conn.executemany(self._upsert_sql, rows)
+            self._conn.executemany("INSERT OR IGNORE INTO bid_keywords (keyword, url) VALUES (?, ?)", keyword_rows)
+            # 代理产品类别保存历次运行命中过的全部关键词
+            self._conn.executemany(
+                'UPDATE bids SET "代理产品类别" = '
+                "(SELECT group_concat(keyword, ',') FROM bid_keywords WHERE bid_keywords.url = bids.url) "
+                "WHERE url = ?",
+                [(url,) for url in urls],
+            )
+        return len(batch)
+
+    def query(self, province=None, date_from=None, date_to=None, keyword=None, name=None,
+              credit_code=None, url=None, limit=None):
+        """
+        按条件查询记录（逐条返回，不整体载入内存）
+
+        Args:
+            province: 省份
+            date_from: 发布日期下限（含，YYYY-MM-DD）
+            date_to: 发布日期上限（含，YYYY-MM-DD）
+            keyword: 搜索关键词
+            name: 企业名称（包含匹配）
+            credit_code: 统一社会信用代码
+            url: 详情链接
+            limit: 最大返回条数
+
+        Returns:
+            generator: 数据字典（含“详情链接”）
+        """
+        conditions = []
+        params = []
+        if province:
+            conditions.append('"省份" = ?')
+            params.append(province)
+        if date_from:
+            conditions.append("publish_date >= ?")
+            params.append(normalize_publish_date(date_from) or date_from)
+        if date_to:
+            conditions.append("publish_date <= ?")
+            params.append(normalize_publish_date(date_to) or date_to)
+        if keyword:
+            conditions.append("url IN (SELECT url FROM bid_keywords WHERE keyword = ?)")
+            params.append(keyword)
+        if name:
+            conditions.append('"企业名称" LIKE ?')
+            params.append(f"%{name}%")
+        if credit_code:
+            conditions.append('"统一社会信用代码" = ?')
+            params.append(credit_code)
+        if url:
+            conditions.append("url = ?")
+            params.append(url)
+
+        sql = "SELECT * FROM bids"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY publish_date, url"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+        for row in cursor:
+            record = {column: row[column] for column in OUTPUT_COLUMNS}
+            if not row["url"].startswith("title:"):
+                record["详情链接"] = row["url"]
+            yield record
+
+    def count(self):
+        """
+        获取结果库记录数
+
+        Returns:
+            int: 记录数
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM bids").fetchone()[0]
+
+    def stats(self):
+        """
+        获取按省份与关键词的统计
+
+        Returns:
+            dict: {'total', 'provinces': {省份: 数量}, 'keywords': {关键词: 数量}, 'date_range': (最早, 最晚)}
+        """
+        with self._lock:
+            provinces = dict(self._conn.execute(
+                'SELECT "省份", COUNT(*) FROM bids GROUP BY "省份" ORDER BY COUNT(*) DESC').fetchall())
+            keywords = dict(self._conn.execute(
+                "SELECT keyword, COUNT(*) FROM bid_keywords GROUP BY keyword ORDER BY COUNT(*) DESC").fetchall())
+            date_range = tuple(self._conn.execute(
+                "SELECT MIN(publish_date), MAX(publish_date) FROM bids WHERE publish_date != ''").fetchone())
+        return {"total": self.count(), "provinces": provinces, "keywords": keywords, "date_range": date_range}
+
+    def close(self):
+        """关闭结果库"""
+        with self._lock:
+            self._conn.close()
+
+
+def _read_jsonl(path):
+    """逐行读取JSONL文件"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="天眼查本地结果库")
+    parser.add_argument("--db", default=RESULT_STORE_FILE, help="结果库文件路径")
+    commands = parser.add_subparsers(dest="command")
+
+    query_parser = commands.add_parser("query", help="按条件导出Excel")
+    query_parser.add_argument("--province", help="省份，如 广东")
+    query_parser.add_argument("--from", dest="date_from", help="发布日期下限 YYYY-MM-DD")
+    query_parser.add_argument("--to", dest="date_to", help="发布日期上限 YYYY-MM-DD")
+    query_parser.add_argument("--keyword", help="搜索关键词")
+    query_parser.add_argument("--name", help="企业名称（包含匹配）")
+    query_parser.add_argument("--credit-code", help="统一社会信用代码")
+    query_parser.add_argument("--limit", type=int, help="最大导出条数")
+    query_parser.add_argument("--out", default="结果库导出.xlsx", help="输出Excel文件名（位于输出目录）")
+
+    import_parser = commands.add_parser("import", help="从JSONL文件导入记录")
+    import_parser.add_argument("path", help="JSONL文件路径")
+
+    commands.add_parser("stats", help="打印结果库统计")
+    commands.add_parser("regions", help="按当前区划表与医院词典重新解析全部记录的省份、配送省份、覆盖地区与覆盖医院")
+    commands.add_parser("dates", help="按当前日期解析规则重新解析全部记录的发布日期（供按日期范围查询）")
+
+    args = parser.parse_args(argv)
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    store = ResultStore(args.db)
+    try:
+        if args.command == "query":
+            from excel_exporter import ExcelExporter
+            exporter = ExcelExporter(args.out)
+            output_file = exporter.create_excel(store.query(
+                province=args.province, date_from=args.date_from, date_to=args.date_to, keyword=args.keyword,
+                name=args.name, credit_code=args.credit_code, limit=args.limit))
+            logger.info(f"✓ 已导出 {exporter.rows_written} 条记录: {output_file}")
+        elif args.command == "import":
+            count = store.upsert(_read_jsonl(args.path))
+            logger.info(f"✓ 已导入 {count} 条记录，结果库共 {store.count()} 条")
+        elif args.command == "regions":
+            from region_index import get_region_index
+            from hospital_matcher import get_hospital_matcher
+            # 先整体读出再写回，避免边查询边更新同一张表
+            records = list(get_region_index().fill_records(store.query()))
+            hospitals = get_hospital_matcher()
+            if hospitals is not None:
+                for record in records:
+                    hospitals.fill_record(record, f"{record['企业名称']}\n{record['企业经营范围']}")
+            count = store.upsert(records)
+            logger.info(f"✓ 已重新解析 {count} 条记录的地区与医院字段")
+        elif args.command == "dates":
+            # 写入时按批量模式解析发布日期；先整体读出再写回
+            count = store.upsert(list(store.query()))
+            logger.info(f"✓ 已重新解析 {count} 条记录的发布日期")
+        elif args.command == "stats":
+            stats = store.stats()
+            logger.info(f"结果库: {store.path}，共 {stats['total']} 条，发布日期 {stats['date_range'][0]} ~ {stats['date_range'][1]}")
+            for province, count in list(stats["provinces"].items())[:10]:
+                logger.info(f"  {province or '未知'}: {count} 条")
+            for keyword, count in stats["keywords"].items():
+                logger.info(f"  [{keyword}] {count} 条")
+        return 0
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main())
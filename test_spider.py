@@ -183,6 +183,23 @@ def test_excel_export():
         filepath = export_to_excel(test_data, "测试数据.xlsx")
 
         logger.info(f"✓ Excel导出成功: {filepath}")
+
+        # 流式写入：迭代器输入，超过单表行数上限时自动分表、分文件
+        import os
+        from openpyxl import load_workbook
+        from excel_exporter import ExcelExporter
+        exporter = ExcelExporter("测试数据_分表.xlsx", max_rows=12, sheets_per_file=2)
+        exporter.create_excel(dict(test_data[i % 2], 企业名称=f"测试公司{i}") for i in range(25))
+        assert exporter.rows_written == 25 and len(exporter.filepaths) == 2
+        workbook = load_workbook(exporter.filepaths[0])
+        assert workbook.sheetnames == ["招投标数据", "招投标数据2"]
+        sheet = workbook["招投标数据"]
+        assert sheet.max_row == 12 and sheet["A1"].value == "全国内分泌配送商联系表" and sheet["A2"].value == "企业名称"
+        assert sheet.column_dimensions["A"].width == 30
+        assert load_workbook(exporter.filepaths[1]).active.max_row == 7
+        for path in exporter.filepaths:
+            os.remove(path)
+        logger.info(f"✓ 流式导出分表正常: {exporter.filepaths}")
         return True
 
     except Exception as e:
@@ -213,6 +230,1128 @@ def test_scraper_init(username="test", password="test"):
         return False
 
 
+def test_http_fast_path():
+    """测试HTTP快速通道（本地HTTP服务模拟列表页、详情页与验证页）"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试6】HTTP快速通道")
+    logger.info("="*50)
+
+    import shutil
+    import tempfile
+    import threading
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from http_fetcher import HttpFetcher
+    from page_cache import PageCache
+
+    pages = {
+        "/s/toubiao/detail": (200, "<html><body><div class='result-list'>"
+                                   "<div class='item'><a href='/bid/1'>某医院生长激素采购公告</a></div>"
+                                   "<div class='item'><a href='/bid/2'>注射笔采购项目</a></div>"
+                                   "</div></body></html>"),
+        "/bid/1": (200, "<html><body><div><span>发布日期</span><span>2023-05-06</span></div>"
+                        "<div class='bid-detail'>采购人：某医院\n地址：广东省广州市天河区1号\n</div></body></html>"),
+        "/bid/2": (403, "<html><body>请完成安全验证</body></html>"),
+        "/s/toubiao/paged": (200, "<html><body><div class='result-list'>"
+                                  "<div class='item'><a href='/bid/1'>某医院生长激素采购公告</a></div>"
+                                  "</div><div class='pagination'><a class='next' href='/s/toubiao/paged2'>下一页</a></div>"
+                                  "</body></html>"),
+        "/s/toubiao/paged2": (403, "<html><body>请完成安全验证</body></html>"),
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, body = pages.get(self.path.split("?")[0], (404, ""))
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    class NoCookieBrowser:
+        def get_driver(self):
+            return self
+
+        def get_cookies(self):
+            return []
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    cache_dir = tempfile.mkdtemp()
+
+    try:
+        fetcher = HttpFetcher(pool_size=2, timeout=5)
+        assert fetcher.fetch(f"{base}/bid/1") is not None
+        assert fetcher.fetch(f"{base}/bid/2") is None  # 验证页
+        fetcher.close()
+        logger.info("✓ 验证页识别正常")
+
+        scraper = TianyanchaScraper(NoCookieBrowser(), parse_mode="script")
+        scraper._extract_bid_from_detail_page = lambda url, title, keyword: None  # 禁止回退真实浏览器
+        scraper.page_cache = PageCache(cache_dir=cache_dir)
+        results = scraper._search_via_http("生长激素", f"{base}/s/toubiao/detail?key=x", 1, 20)
+        assert results is not None and len(results) == 1
+        assert results[0]["省份"] == "广东"
+        assert results[0]["成立日期"] == "2023-05-06"
+        logger.info("✓ HTTP通道解析列表页与详情页成功")
+
+        # 停用HTTP通道后，列表页与详情页应从页面缓存读取（清空已提取链接，模拟新一次运行）
+        scraper.http_fetcher.enabled = False
+        scraper._seen_urls.clear()
+        cached = scraper._search_via_http("生长激素", f"{base}/s/toubiao/detail?key=x#top", 1, 20)
+        assert cached == results
+        assert scraper.page_cache.hits == 2
+        scraper.report_latency()
+        scraper.page_cache.close()
+        scraper.close()
+        logger.info("✓ 页面缓存命中正常")
+
+        # 第2页遇到验证页：保留第1页结果，由浏览器从第2页接着抓取
+        scraper = TianyanchaScraper(NoCookieBrowser(), parse_mode="script")
+        scraper.page_cache = None
+        handoffs = []
+
+        def browser_fallback(keyword, url, max_pages, max_items_per_page, all_results, first_page=1):
+            handoffs.append((url, first_page))
+            all_results.append({"企业名称": "浏览器第2页"})
+
+        scraper._search_via_browser = browser_fallback
+        results = scraper._search_via_http("生长激素", f"{base}/s/toubiao/paged", 3, 20)
+        assert [record["企业名称"] for record in results] == ["某医院生长激素采购公告", "浏览器第2页"]
+        assert handoffs == [(f"{base}/s/toubiao/paged2", 2)]
+        scraper.close()
+        logger.info("✓ 列表页中途遇到验证页时由浏览器从该页接续")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def test_page_parser():
+    """测试离线页面解析（使用保存的HTML片段，无需浏览器）"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试7】离线页面解析")
+    logger.info("="*50)
+
+    import page_parser
+
+    list_html = """
+    <html><body>
+      <div class="search-result-list">
+        <div class="result-item"><a href="/bid/abc123">某市人民医院生长激素采购公告</a><span>2024-03-15</span></div>
+        <div class="result-item"><a href="https://www.tianyancha.com/bid/def456">注射笔项目中标公告</a><span>2023年7月1日</span></div>
+        <a href="/bid/outside">列表外链接</a>
+      </div>
+      <div class="pagination"><a class="next" href="/s/toubiao/detail?key=x&pageNum=2">下一页</a></div>
+    </body></html>
+    """
+    detail_html = """
+    <html><head><script>var x = '地址：脚本内容';</script></head><body>
+      <div class="header"><span>发布日期</span><span>2024-03-15</span></div>
+      <div class="bid-detail">
+        <p>采购人：某市人民医院</p>
+        <p>联系地址：四川省成都市武侯区人民南路 1 号</p>
+        <p>联系电话：028-12345678</p>
+      </div>
+    </body></html>
+    """
+
+    try:
+        base = "https://www.tianyancha.com/s/toubiao/detail?key=x"
+        links = page_parser.parse_search_results(list_html, base, max_items=20)
+        assert [link["url"] for link in links] == [
+            "https://www.tianyancha.com/bid/abc123",
+            "https://www.tianyancha.com/bid/def456",
+            "https://www.tianyancha.com/bid/outside",
+        ]
+        assert links[0]["date"] == "2024-03-15" and links[1]["date"] == "2023年7月1"
+        next_url, has_next = page_parser.parse_next_page(list_html, base)
+        assert has_next and next_url.endswith("pageNum=2")
+        logger.info(f"✓ 列表页解析: {len(links)} 条链接，下一页 {next_url}")
+
+        detail = page_parser.parse_bid_detail(detail_html)
+        assert detail["date_text"] == "2024-03-15"
+        assert detail["text"].splitlines()[1] == "联系地址：四川省成都市武侯区人民南路 1 号"
+        assert detail["fields"]["企业地址"] == "四川省成都市武侯区人民南路 1 号"
+        logger.info("✓ 详情页解析: 发布日期、正文与地址字段正确")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+
+def test_crawl_journal():
+    """测试采集日志与断点续跑（临时数据库，无需浏览器）"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试8】采集日志与断点续跑")
+    logger.info("="*50)
+
+    import os
+    import shutil
+    import tempfile
+    from crawl_journal import CrawlJournal
+    from mock_site import MockSite
+
+    class NoCookieBrowser:
+        def get_driver(self):
+            return self
+
+        def get_cookies(self):
+            return []
+
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "journal.db")
+
+    try:
+        journal = CrawlJournal(path)
+        journal.record_bid("生长激素", "https://www.tianyancha.com/bid/1", {"企业名称": "某医院生长激素采购公告"})
+        journal.record_bid("生长激素", "https://www.tianyancha.com/bid/2", None)  # 日期过滤排除
+        journal.mark_page_done("生长激素", 1, 1)
+        journal.mark_keyword_done("生长激素", 1)
+        journal.close()
+
+        # 续跑：已完成的关键词与详情页保留，已完成的详情页不再访问
+        journal = CrawlJournal(path, resume=True)
+        assert journal.is_keyword_done("生长激素") and journal.is_page_done("生长激素", 1)
+        assert journal.load_records() == [{"企业名称": "某医院生长激素采购公告"}]
+
+        scraper = TianyanchaScraper(NoCookieBrowser(), use_http=False, parse_mode="script", journal=journal)
+        fetched = []
+        scraper._submit_bid = lambda url, title, keyword: fetched.append(url) or scraper._completed({"企业名称": title})
+        links = [
+            {"url": "https://www.tianyancha.com/bid/1", "name": "某医院生长激素采购公告", "index": 1},
+            {"url": "https://www.tianyancha.com/bid/2", "name": "已排除公告", "index": 2},
+            {"url": "https://www.tianyancha.com/bid/3", "name": "注射笔采购项目", "index": 3},
+        ]
+        results = scraper._extract_links(links, "生长激素")
+        assert fetched == ["https://www.tianyancha.com/bid/3"]
+        assert [item["企业名称"] for item in results] == ["某医院生长激素采购公告", "注射笔采购项目"]
+        assert len(journal.load_records("生长激素")) == 2
+        scraper.close()
+        journal.close()
+        logger.info("✓ 续跑时跳过已完成的详情页")
+
+        # 非续跑：清空上次记录
+        journal = CrawlJournal(path)
+        assert not journal.is_keyword_done("生长激素") and journal.load_records() == []
+        journal.close()
+        logger.info("✓ 新一轮采集清空采集日志")
+
+        # 按页续跑：上次完成的第1、2页不再请求列表页，按记录的下一页URL直接抓取第3页
+        with MockSite(pages=3, items_per_page=2) as site:
+            search_url = site.search_url("注射笔")
+            journal = CrawlJournal(path)
+            scraper = TianyanchaScraper(NoCookieBrowser(), parse_mode="script", journal=journal)
+            scraper._extract_bid_from_detail_page = lambda url, title, keyword: None  # 禁止回退真实浏览器
+            scraper.page_cache = None
+            first = scraper._search_via_http("注射笔", search_url, 2, 20)
+            scraper.close()
+            journal.close()
+            assert len(first) == 4 and site.stats["list"] == 2
+
+            journal = CrawlJournal(path, resume=True)
+            scraper = TianyanchaScraper(NoCookieBrowser(), parse_mode="script", journal=journal)
+            scraper._extract_bid_from_detail_page = lambda url, title, keyword: None
+            scraper.page_cache = None
+            resumed = scraper._search_via_http("注射笔", search_url, 3, 20)
+            assert resumed[:4] == first and len(resumed) == 6
+            assert site.stats["list"] == 3 and site.stats["detail"] == 6
+            assert scraper.last_search_paging() == (3, False)
+            scraper.close()
+            journal.close()
+        logger.info("✓ 续跑时跳过已完成的搜索结果页")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def test_url_dedup():
+    """测试跨关键词详情链接去重（无需浏览器）"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试9】跨关键词链接去重")
+    logger.info("="*50)
+
+    import shutil
+    import tempfile
+    from page_cache import PageCache
+
+    class NoCookieBrowser:
+        def get_driver(self):
+            return self
+
+        def get_cookies(self):
+            return []
+
+    try:
+        scraper = TianyanchaScraper(NoCookieBrowser(), use_http=False, parse_mode="script")
+        fetched = []
+
+        def submit(url, title, keyword):
+            fetched.append(url)
+            return scraper._completed(scraper._new_record(title, keyword))
+
+        scraper._submit_bid = submit
+        shared = {"url": "https://www.tianyancha.com/bid/1", "name": "济川药业蒲地蓝消炎口服液采购公告", "index": 1}
+        first = scraper._extract_links([shared], "蒲地蓝消炎口服液")
+        scraper.save_data(first)
+        second = scraper._extract_links([shared, {"url": "https://www.tianyancha.com/bid/2", "name": "济川药业中标公告", "index": 2}], "济川药业")
+        scraper.save_data(second)
+
+        assert fetched == ["https://www.tianyancha.com/bid/1", "https://www.tianyancha.com/bid/2"]
+        assert scraper.skipped_detail_fetches == 1
+        data = scraper.get_collected_data()
+        assert len(data) == 2
+        assert data[0]["代理产品类别"] == "蒲地蓝消炎口服液,济川药业"
+        assert data[0]["详情链接"] == "https://www.tianyancha.com/bid/1"
+        scraper.close()
+        logger.info("✓ 重复链接未再次访问，关键词已合并到代理产品类别")
+
+        # 第1页来自页面缓存、第2页缓存未命中且HTTP不可用：已登记的第1页结果不能丢失，
+        # 浏览器从第2页接着抓取（不能从第1页重来，否则第1页链接会被当作已提取而跳过）
+        cache_dir = tempfile.mkdtemp()
+        try:
+            page_cache = PageCache(cache_dir=cache_dir)
+            list_url = "https://www.tianyancha.com/s/toubiao?key=dedup"
+            page_cache.put(list_url, "<html><body><div class='result-list'>"
+                                     "<div class='item'><a href='/bid/1'>某医院生长激素采购公告</a></div>"
+                                     "</div><div class='pagination'><a class='next' href='/s/toubiao?key=dedup&p=2'>下一页</a></div>"
+                                     "</body></html>")
+            page_cache.put("https://www.tianyancha.com/bid/1",
+                           "<html><body><div><span>发布日期</span><span>2023-05-06</span></div>"
+                           "<div class='bid-detail'>采购人：某医院\n地址：广东省广州市天河区1号\n</div></body></html>")
+            scraper = TianyanchaScraper(NoCookieBrowser(), parse_mode="script")
+            scraper.http_fetcher.enabled = False
+            scraper.page_cache = page_cache
+            scraper._extract_bid_from_detail_page = lambda url, title, keyword: None  # 禁止回退真实浏览器
+            handoffs = []
+
+            def browser_fallback(keyword, url, max_pages, max_items_per_page, all_results, first_page=1):
+                handoffs.append((url, first_page))
+
+            scraper._search_via_browser = browser_fallback
+            results = scraper.search_toubiao("生长激素", max_pages=3, search_url=list_url)
+            assert [record["企业名称"] for record in results] == ["某医院生长激素采购公告"]
+            assert "https://www.tianyancha.com/bid/1" in scraper._seen_urls
+            assert handoffs == [("https://www.tianyancha.com/s/toubiao?key=dedup&p=2", 2)]
+            page_cache.close()
+            scraper.close()
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        logger.info("✓ 列表页部分命中缓存时保留已获取的结果，浏览器从未命中的页面接续")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+
+def test_output_sinks():
+    """测试CSV/JSONL/SQLite输出与后台写入线程（无需浏览器）"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试10】多格式输出")
+    logger.info("="*50)
+
+    import os
+    import csv
+    import json
+    import shutil
+    import sqlite3
+    import tempfile
+    from output_sinks import SinkWriter, create_sinks
+
+    class NoCookieBrowser:
+        def get_driver(self):
+            return self
+
+    def store_categories(path):
+        conn = sqlite3.connect(path)
+        try:
+            return dict(conn.execute('SELECT url, "代理产品类别" FROM bids').fetchall())
+        except sqlite3.OperationalError:
+            return {}
+        finally:
+            conn.close()
+
+    folder = tempfile.mkdtemp()
+    writer = None
+    scraper = None
+    try:
+        sinks = create_sinks(["csv", "jsonl", "sqlite", "store"], basename="测试输出")
+        sinks[3].filepath = os.path.join(folder, "results.db")
+        writer = SinkWriter(sinks)
+
+        # 两个关键词的搜索结果包含同一详情页：第二个关键词合并到第一个关键词已提交的记录
+        scraper = TianyanchaScraper(NoCookieBrowser(), use_http=False, parse_mode="script")
+        scraper._submit_bid = lambda url, title, keyword: scraper._completed(
+            dict(scraper._new_record(title, keyword), 省份="广东" if url.endswith("/1") else "四川"))
+        shared = {"url": "https://www.tianyancha.com/bid/1", "name": "某医院生长激素采购公告", "index": 1}
+        other = {"url": "https://www.tianyancha.com/bid/2", "name": "注射笔采购项目", "index": 2}
+        writer.submit(scraper._extract_links([shared], "生长激素"))
+        writer.update(scraper.take_merged_records())
+
+        # 采集过程中即可读取已写入的CSV与结果库
+        csv_path = sinks[0].filepath
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            with open(csv_path, encoding="utf-8-sig") as f:
+                if len(list(csv.reader(f))) == 2 and store_categories(sinks[3].filepath):
+                    break
+            time.sleep(0.05)
+        else:
+            raise AssertionError("CSV或结果库未及时写入")
+        assert store_categories(sinks[3].filepath) == {"https://www.tianyancha.com/bid/1": "生长激素"}
+
+        writer.submit(scraper._extract_links([shared, other], "注射笔"))
+        writer.update(scraper.take_merged_records())
+        paths = writer.close()
+
+        # 只能追加的文件：合并后的记录追加为更新行，同一记录以最后一行为准
+        with open(paths[0], encoding="utf-8-sig") as f:
+            rows = list(csv.DictReader(f))
+        assert [(row["企业名称"], row["代理产品类别"]) for row in rows] == [
+            ("某医院生长激素采购公告", "生长激素"), ("注射笔采购项目", "注射笔"), ("某医院生长激素采购公告", "生长激素,注射笔")]
+        with open(paths[1], encoding="utf-8") as f:
+            latest = {}
+            for line in f:
+                row = json.loads(line)
+                latest[row.get("详情链接")] = row
+        assert latest["https://www.tianyancha.com/bid/1"]["代理产品类别"] == "生长激素,注射笔"
+        assert latest["https://www.tianyancha.com/bid/2"]["省份"] == "四川"
+        # SQLite 与结果库按详情链接覆盖
+        conn = sqlite3.connect(paths[2])
+        assert conn.execute('SELECT "详情链接", "代理产品类别" FROM records ORDER BY rowid').fetchall() == [
+            ("https://www.tianyancha.com/bid/1", "生长激素,注射笔"), ("https://www.tianyancha.com/bid/2", "注射笔")]
+        conn.close()
+        assert store_categories(paths[3]) == {"https://www.tianyancha.com/bid/1": "生长激素,注射笔",
+                                              "https://www.tianyancha.com/bid/2": "注射笔"}
+        logger.info(f"✓ 多格式输出正常，后续关键词合并的类别已写出: {paths}")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+    finally:
+        if scraper:
+            scraper.close()
+        if writer:
+            writer.close()
+            for sink in writer.sinks:
+                if os.path.exists(sink.filepath):
+                    os.remove(sink.filepath)
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def test_result_store():
+    """测试本地结果库的upsert、索引查询与导出（临时数据库，无需浏览器）"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试11】本地结果库")
+    logger.info("="*50)
+
+    import os
+    import shutil
+    import tempfile
+    import result_store
+    from result_store import ResultStore
+
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "results.db")
+    try:
+        store = ResultStore(path, batch_size=2)
+        store.upsert([
+            {"企业名称": "某医院生长激素采购公告", "省份": "广东", "成立日期": "2023年5月6日", "代理产品类别": "生长激素",
+             "详情链接": "https://www.tianyancha.com/bid/1"},
+            {"企业名称": "注射笔采购项目", "省份": "广东", "成立日期": "2024-02-01", "代理产品类别": "注射笔",
+             "详情链接": "https://www.tianyancha.com/bid/2"},
+            {"企业名称": "成都某医院采购公告", "省份": "四川", "成立日期": "2023/08/09", "代理产品类别": "生长激素",
+             "详情链接": "https://www.tianyancha.com/bid/3"},
+        ])
+        # 下一次运行以另一个关键词再次采集到同一公告：覆盖更新，关键词合并
+        store.upsert([{"企业名称": "某医院生长激素采购公告", "省份": "广东", "成立日期": "2023-05-06",
+                       "代理产品类别": "骨龄仪器", "企业地址": "广州市天河区", "详情链接": "https://www.tianyancha.com/bid/1"}])
+        assert store.count() == 3
+
+        rows = list(store.query(province="广东", date_from="2023-01-01", date_to="2023-12-31"))
+        assert len(rows) == 1 and rows[0]["企业地址"] == "广州市天河区"
+        assert sorted(rows[0]["代理产品类别"].split(",")) == ["生长激素", "骨龄仪器"]
+        assert [row["企业名称"] for row in store.query(keyword="生长激素")] == ["某医院生长激素采购公告", "成都某医院采购公告"]
+        plan = " ".join(str(item[-1]) for item in store._conn.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM bids WHERE "省份" = ? AND publish_date >= ?', ("广东", "2023-01-01")))
+        assert "idx_bids_province_date" in plan
+        store.close()
+        logger.info("✓ upsert合并与索引查询正常")
+
+        assert result_store.main(["--db", path, "query", "--province", "广东", "--out", "测试结果库导出.xlsx"]) == 0
+        export_path = os.path.join("output", "测试结果库导出.xlsx")
+        from openpyxl import load_workbook
+        assert load_workbook(export_path).active.max_row == 4
+        os.remove(export_path)
+        logger.info("✓ 查询命令导出Excel正常")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def test_replay_driver():
+    """测试页面回放：用录制好的夹具离线跑完整的 search_toubiao 流程（无需浏览器与网络）"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试12】页面录制与回放")
+    logger.info("="*50)
+
+    import shutil
+    import tempfile
+    from urllib.parse import quote
+    from config import SEARCH_URL_TEMPLATE
+    from replay_driver import FixtureArchive
+
+    keyword = "生长激素"
+    search_url = SEARCH_URL_TEMPLATE.format(keyword=quote(keyword))
+    pages = {
+        search_url: "<html><body><div class='search-result-list'>"
+                    "<div class='result-item'><a href='/bid/r1'>某医院生长激素采购公告</a></div>"
+                    "<div class='result-item'><a href='/bid/r2'>注射笔采购项目</a></div>"
+                    "</div><div class='pagination'><a class='next' href='" + search_url + "&pageNum=2'>下一页</a></div>"
+                    "</body></html>",
+        search_url + "&pageNum=2": "<html><body><div class='search-result-list'>"
+                                   "<div class='result-item'><a href='/bid/r3'>成都某医院采购公告</a></div>"
+                                   "</div></body></html>",
+        "https://www.tianyancha.com/bid/r1": "<html><body><div><span>发布日期</span><span>2023-05-06</span></div>"
+                                             "<div class='bid-detail'>采购人：某医院\n地址：广东省广州市天河区1号\n</div></body></html>",
+        "https://www.tianyancha.com/bid/r2": "<html><body><div><span>发布日期</span><span>2024-02-01</span></div>"
+                                             "<div class='bid-detail'>采购人：某医院\n地址：浙江省杭州市西湖区2号\n</div></body></html>",
+        "https://www.tianyancha.com/bid/r3": "<html><body><div><span>发布日期</span><span>2023-08-09</span></div>"
+                                             "<div class='bid-detail'>采购人：某医院\n地址：四川省成都市武侯区3号\n</div></body></html>",
+    }
+
+    replay_dir = tempfile.mkdtemp()
+    record_dir = tempfile.mkdtemp()
+    try:
+        archive = FixtureArchive(replay_dir)
+        for url, page_html in pages.items():
+            archive.save(url, page_html)
+
+        # 回放同时录制：回放经过的页面应被完整录制到另一个目录
+        browser = BrowserManager(replay_dir=replay_dir, record_dir=record_dir)
+        scraper = TianyanchaScraper(browser)
+        assert scraper.http_fetcher is None and scraper.page_cache is None
+        start = time.time()
+        results = scraper.search_toubiao(keyword, max_pages=3)
+        elapsed = time.time() - start
+        assert [item["省份"] for item in results] == ["广东", "浙江", "四川"]
+        assert results[2]["成立日期"] == "2023-08-09"
+        assert browser.driver.misses == 0 and elapsed < 2
+        logger.info(f"✓ 离线回放 {len(results)} 条结果，耗时 {elapsed * 1000:.0f}ms")
+
+        assert len(FixtureArchive(record_dir)) == len(pages)
+        scraper.close()
+        browser.close()
+        logger.info("✓ 录制模式保存了全部访问过的页面")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+    finally:
+        shutil.rmtree(replay_dir, ignore_errors=True)
+        shutil.rmtree(record_dir, ignore_errors=True)
+
+
+def test_mock_site():
+    """测试本地模拟站点：登录校验、翻页与故障注入（HTTP通道端到端，无需浏览器）"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试13】本地模拟站点")
+    logger.info("="*50)
+
+    from http_fetcher import HttpFetcher
+    from mock_site import MockSite, LOGIN_COOKIE
+
+    class NoCookieBrowser:
+        def get_driver(self):
+            return self
+
+        def get_cookies(self):
+            return []
+
+    try:
+        with MockSite(pages=3, items_per_page=4, require_login=True) as site:
+            fetcher = HttpFetcher(pool_size=2, timeout=5)
+            assert fetcher.fetch(site.search_url("生长激素")) is None  # 未登录跳转登录页
+            fetcher.close()
+
+            scraper = TianyanchaScraper(NoCookieBrowser(), parse_mode="script")
+            scraper._extract_bid_from_detail_page = lambda url, title, keyword: None  # 禁止回退真实浏览器
+            scraper.page_cache = None
+            scraper.http_fetcher.session.cookies.set(LOGIN_COOKIE, "mock")
+            results = scraper._search_via_http("生长激素", site.search_url("生长激素"), 5, 20)
+            assert results is not None and len(results) == 12
+            assert results[0]["成立日期"] == "2025-06-30" and results[0]["省份"]
+            assert site.stats["list"] == 3 and site.stats["detail"] == 12
+            scraper.close()
+            logger.info("✓ 登录校验、翻页与详情页正常")
+
+        with MockSite(rate_limit=1.0) as site:
+            fetcher = HttpFetcher(pool_size=2, timeout=5, max_challenges=2)
+            assert fetcher.fetch(site.search_url("注射笔")) is None
+            assert fetcher.fetch(site.search_url("注射笔")) is None and not fetcher.enabled
+            assert site.stats["429"] == 2
+            fetcher.close()
+            logger.info("✓ 429响应识别为验证页并停用HTTP通道")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+
+def test_bench():
+    """测试基准运行与基线对比（只运行一个微基准）"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试14】性能基准与回退对比")
+    logger.info("="*50)
+
+    from bench.runner import run_all, compare, log_report
+
+    try:
+        run = run_all(name_filter="extract_province", repeat=2, min_time=0.01)
+        result = run["results"]["extract_province"]
+        assert result["median"] > 0 and result["number"] >= 1
+
+        faster = {"results": {"extract_province": dict(result, min=result["min"] / 2)}}
+        rows = compare(run, faster, threshold=0.15)
+        assert rows[0]["status"] == "regression" and log_report(rows) == 1
+        slower = {"results": {"extract_province": dict(result, min=result["min"] * 2)}}
+        assert compare(run, slower)[0]["status"] == "improved"
+        assert compare(run, {"results": {}})[0]["status"] == "new"
+        logger.info("✓ 基准结果与回退标记正常")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+
+def test_metrics():
+    """测试阶段耗时统计：装饰器/上下文管理器、按关键词分组、JSON与Prometheus输出"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试15】阶段耗时统计")
+    logger.info("="*50)
+
+    import os
+    import json
+    import shutil
+    import tempfile
+    from metrics import StageMetrics, percentile
+
+    folder = tempfile.mkdtemp()
+    try:
+        metrics = StageMetrics(enabled=True)
+
+        @metrics.timed("search", keyword_arg="keyword")
+        def search(keyword, pages):
+            for _ in range(pages):
+                with metrics.timer("next_page"):
+                    time.sleep(0.001)
+
+        search("生长激素", 3)
+        search(keyword="注射笔", pages=1)
+        with metrics.timer("excel_export", keyword=""):
+            pass
+
+        summary = metrics.summary()
+        assert summary["stages"]["next_page"]["count"] == 4
+        assert summary["keywords"]["生长激素"]["next_page"]["count"] == 3
+        assert summary["keywords"]["注射笔"]["search"]["count"] == 1
+        assert "excel_export" not in summary["keywords"].get("", {})
+        assert percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 0.95) == 10 and percentile([1, 2, 3], 0.5) == 2
+
+        json_path, prom_path = metrics.write_reports(os.path.join(folder, "m.json"), os.path.join(folder, "m.prom"))
+        with open(json_path, encoding="utf-8") as f:
+            assert json.load(f)["stages"]["search"]["count"] == 2
+        with open(prom_path, encoding="utf-8") as f:
+            prom = f.read()
+        assert 'tyc_stage_duration_seconds_count{stage="next_page"} 4' in prom
+        assert 'tyc_stage_duration_seconds_count{stage="next_page",keyword="生长激素"} 3' in prom
+        assert '# TYPE tyc_stage_duration_seconds summary' in prom
+        metrics.log_summary()
+        logger.info("✓ 阶段耗时统计与报告输出正常")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def test_tracer():
+    """测试区间追踪：嵌套区间、线程信息与 Chrome Trace 输出，关闭时不记录"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试16】区间追踪")
+    logger.info("="*50)
+
+    import os
+    import json
+    import shutil
+    import tempfile
+    import threading
+    from tracer import Tracer
+
+    folder = tempfile.mkdtemp()
+    try:
+        tracer = Tracer(enabled=False)
+
+        @tracer.traced("detail", args=("url",))
+        def detail(url):
+            with tracer.span("tab_open"):
+                pass
+
+        detail("https://www.tianyancha.com/bid/0")
+        assert tracer.events == [] and tracer.write(os.path.join(folder, "off.json")) is None
+
+        tracer.enable()
+        with tracer.span("keyword", keyword="生长激素"):
+            with tracer.span("page", page=1):
+                detail("https://www.tianyancha.com/bid/1")
+                worker = threading.Thread(target=detail, args=("https://www.tianyancha.com/bid/2",), name="pool-worker")
+                worker.start()
+                worker.join()
+
+        path = tracer.write(os.path.join(folder, "trace.json"))
+        with open(path, encoding="utf-8") as f:
+            trace = json.load(f)
+        spans = {(e["name"], e["args"].get("url")): e for e in trace["traceEvents"] if e["ph"] == "X"}
+        keyword_span = spans[("keyword", None)]
+        main_detail = spans[("detail", "https://www.tianyancha.com/bid/1")]
+        pool_detail = spans[("detail", "https://www.tianyancha.com/bid/2")]
+        assert keyword_span["ts"] <= main_detail["ts"]
+        assert main_detail["ts"] + main_detail["dur"] <= keyword_span["ts"] + keyword_span["dur"]
+        assert pool_detail["tid"] != main_detail["tid"]
+        thread_names = {e["args"]["name"] for e in trace["traceEvents"] if e["name"] == "thread_name"}
+        assert "pool-worker" in thread_names
+        assert len([e for e in trace["traceEvents"] if e["name"] == "tab_open"]) == 2
+        logger.info(f"✓ 记录 {len(tracer.events)} 个区间，嵌套与线程信息正确")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def test_profiler():
+    """测试性能剖析：同一标签多次进入累积统计，写出 .pstats 与分配报告，关闭时不写文件"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试17】性能剖析")
+    logger.info("="*50)
+
+    import os
+    import re
+    import pstats
+    import shutil
+    import tempfile
+    from profiler import Profiler
+
+    folder = tempfile.mkdtemp()
+    profiler = Profiler(output_dir=os.path.join(folder, "profile"), top_n=10)
+    try:
+        def parse_bodies(count):
+            bodies = [f"联系地址：广东省广州市越秀区人民中路 {i} 号。" * 40 for i in range(count)]
+            return [re.findall(r"[\u4e00-\u9fa5]+省", body) for body in bodies]
+
+        with profiler.profile("keyword_生长激素"):
+            parse_bodies(10)
+        assert not os.path.exists(profiler.output_dir) and profiler.files == []
+
+        profiler.enable()
+        for _ in range(2):
+            with profiler.profile("keyword_生长激素"):
+                kept = parse_bodies(200)
+        with profiler.profile("export/excel"):
+            parse_bodies(10)
+
+        pstats_file = os.path.join(profiler.output_dir, "keyword_生长激素.pstats")
+        stats = pstats.Stats(pstats_file)
+        calls = [stat[1] for func, stat in stats.stats.items() if func[2] == "parse_bodies"]
+        assert calls == [2], calls
+        with open(os.path.join(profiler.output_dir, "keyword_生长激素_report.txt"), encoding="utf-8") as f:
+            report = f.read()
+        assert "内存分配增长" in report and "test_spider.py" in report and "parse_bodies" in report
+        assert os.path.exists(os.path.join(profiler.output_dir, "export_excel.pstats"))
+        assert len(profiler.files) == 4 and kept
+        profiler.log_summary()
+        logger.info("✓ 剖析结果累积正确，已写出 .pstats 与分配报告")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+    finally:
+        profiler.disable()
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def test_field_extractor():
+    """测试正文多字段提取：标签取值截止到下一个标签、规范化与无标签兜底，并写入记录"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试18】正文多字段提取")
+    logger.info("="*50)
+
+    from field_extractor import extract_fields
+    from tianyancha_scraper import TianyanchaScraper
+
+    try:
+        text = (
+            "采购人：某市人民医院\n"
+            "联系地址：四川省成都市武侯区人民南路 1 号\n"
+            "联系人：张三 联系电话：028－85501234 / 13800138000\n"
+            "法定代表人：李四（院长）\n"
+            "统一社会信用代码：12510000450717511k\n"
+            "注册资本：1,000万元人民币；邮箱地址：Bid@Example.com\n"
+            + "采购内容：重组人生长激素注射液。\n" * 200
+            + "代理机构信用代码 91510100MA61R8XQ2B，联系邮箱 agent@daili.cn"
+        )
+        fields = extract_fields(text)
+        assert fields["企业地址"] == "四川省成都市武侯区人民南路 1 号"
+        assert fields["实际业务负责人"] == "张三" and fields["企业法人"] == "李四"
+        assert fields["企业联系电话"] == "028-85501234；13800138000"
+        assert fields["统一社会信用代码"] == "12510000450717511K"
+        assert fields["注册资金"] == "1000万元"
+        assert fields["微信/邮箱"] == "bid@example.com；agent@daili.cn"
+        assert extract_fields("代理机构 91510100MA61R8XQ2B")["统一社会信用代码"] == "91510100MA61R8XQ2B"
+        assert extract_fields("") == {}
+
+        scraper = TianyanchaScraper.__new__(TianyanchaScraper)
+        record = scraper._build_bid_record("某市人民医院采购公告", "生长激素", "", text)
+        assert record["省份"] == "四川" and record["企业联系电话"] == fields["企业联系电话"]
+        assert len(record["企业经营范围"]) == 2000 and record["微信/邮箱"].endswith("agent@daili.cn")
+        logger.info(f"✓ 提取 {len(fields)} 个字段（正文 {len(text)} 字，尾部字段同样提取）")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+
+def test_region_index():
+    """测试行政区划索引：城市/区县解析、同名消歧、路名排除、正文提及地区与结果库重新解析"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试19】行政区划索引")
+    logger.info("="*50)
+
+    import os
+    import shutil
+    import tempfile
+    from aho_corasick import AhoCorasick
+    from region_index import get_region_index, Region
+    from result_store import ResultStore, main as store_main
+
+    folder = tempfile.mkdtemp()
+    try:
+        automaton = AhoCorasick([("内蒙古", 1), ("内蒙古自治区", 2), ("古自", 3)])
+        assert sorted(automaton.iter("内蒙古自治区")) == [(0, 3, 1), (0, 6, 2), (2, 4, 3)]
+        assert automaton.find("内蒙古自治区") == [(0, 6, [2])]
+
+        index = get_region_index()
+        assert index.resolve("广州市越秀区人民中路 123 号") == Region("广东", "广州市", "")
+        assert index.resolve("北京市朝阳区建国路 1 号") == Region("北京", "北京市", "朝阳区")
+        assert index.resolve("辽宁朝阳市双塔区") == Region("辽宁", "朝阳市", "")
+        assert index.resolve("内蒙古自治区呼和浩特市").province == "内蒙古"
+        assert index.resolve("某市中山路 8 号") == Region("", "", "")
+        assert index.resolve_many(["延边州人民医院", "广州市"]) == [Region("吉林", "延边朝鲜族自治州", ""),
+                                                                 Region("广东", "广州市", "")]
+
+        record = {"企业名称": "深圳市某医院采购公告", "企业地址": "",
+                  "企业经营范围": "配送范围：广东省广州市、佛山市，湖南省长沙市，浙江省宁波市江北区"}
+        index.fill_record(record)
+        assert record["省份"] == "广东"
+        assert record["配送省份"] == "广东、湖南、浙江"
+        assert record["覆盖地区"] == "深圳市、广州市、佛山市、长沙市、宁波市"
+
+        db = os.path.join(folder, "results.db")
+        store = ResultStore(db)
+        store.upsert([{"企业名称": "成都市某医院采购公告", "省份": "未知", "企业地址": "武侯区人民南路 1 号",
+                       "代理产品类别": "生长激素", "详情链接": "https://www.tianyancha.com/bid/1"}])
+        store.close()
+        assert store_main(["--db", db, "regions"]) == 0
+        store = ResultStore(db)
+        assert [item["省份"] for item in store.query()] == ["四川"]
+        store.close()
+        logger.info(f"✓ 区划索引 {index.regions} 个地区，解析与消歧正确")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def test_hospital_matcher():
+    """测试医院词典匹配：别名去重、覆盖地区合并、自动机缓存命中与词典变化后重建"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试20】医院词典匹配")
+    logger.info("="*50)
+
+    import os
+    import shutil
+    import tempfile
+    from hospital_matcher import HospitalMatcher, Hospital
+    from tianyancha_scraper import TianyanchaScraper
+
+    folder = tempfile.mkdtemp()
+    dict_path = os.path.join(folder, "hospitals.csv")
+    region_path = os.path.join(folder, "regions.csv")
+    cache_path = os.path.join(folder, "cache", "hospital_automaton.pickle")
+    try:
+        shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "regions.csv"), region_path)
+        with open(dict_path, "w", encoding="utf-8") as f:
+            # 省份/城市为空时由名称解析
+            f.write("名称,别名,省份,城市\n四川大学华西医院,华西医院,四川,成都市\n"
+                    "四川大学华西第二医院,华西第二医院,四川,成都市\n广州市妇女儿童医疗中心,,,\n")
+
+        matcher = HospitalMatcher.load(dict_path, cache_path, region_path)
+        assert os.path.exists(cache_path)
+        text = "四川大学华西医院牵头，华西第二医院、华西医院及广州市妇女儿童医疗中心参与"
+        assert matcher.match(text) == [Hospital("四川大学华西医院", "四川", "成都市"),
+                                       Hospital("四川大学华西第二医院", "四川", "成都市"),
+                                       Hospital("广州市妇女儿童医疗中心", "广东", "广州市")]
+        record = {"覆盖地区": "成都市、绵阳市"}
+        matcher.fill_record(record, text)
+        assert record["覆盖医院"] == "四川大学华西医院、四川大学华西第二医院、广州市妇女儿童医疗中心"
+        assert record["覆盖地区"] == "成都市、绵阳市、广州市"
+
+        # 词典与区划表未变化时从缓存载入，不再构建；任一变化后重建
+        build = HospitalMatcher.build
+        builds = []
+        HospitalMatcher.build = classmethod(lambda cls, path=None: builds.append(path) or build(path))
+        try:
+            assert len(HospitalMatcher.load(dict_path, cache_path, region_path).hospitals) == 3
+            assert builds == []
+            with open(region_path, "a", encoding="utf-8") as f:
+                f.write("\n")
+            assert len(HospitalMatcher.load(dict_path, cache_path, region_path).hospitals) == 3
+            assert builds == [dict_path]
+        finally:
+            HospitalMatcher.build = build
+        with open(dict_path, "a", encoding="utf-8") as f:
+            f.write("北京协和医院,,北京,北京市\n")
+        assert len(HospitalMatcher.load(dict_path, cache_path, region_path).hospitals) == 4
+
+        scraper = TianyanchaScraper.__new__(TianyanchaScraper)
+        record = scraper._build_bid_record("华西医院生长激素采购公告", "生长激素", "", "采购人：四川大学华西医院")
+        assert record["覆盖医院"] == "四川大学华西医院" and "成都市" in record["覆盖地区"]
+        logger.info("✓ 医院匹配、覆盖地区合并与自动机缓存正确")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def test_date_utils():
+    """测试发布日期解析：各类日期写法、相对日期、批量解析与日期范围过滤"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试21】发布日期解析")
+    logger.info("="*50)
+
+    from datetime import date
+    from date_utils import parse_date, parse_dates, filter_records
+    from tianyancha_scraper import TianyanchaScraper
+
+    try:
+        today = date(2025, 3, 10)
+        cases = {
+            "2023-05-06": date(2023, 5, 6),
+            "发布时间：2023年5月6日 10:00": date(2023, 5, 6),
+            "2023/05/06": date(2023, 5, 6),
+            "2024.11.30": date(2024, 11, 30),
+            "20220318": date(2022, 3, 18),
+            "05-06": date(2024, 5, 6),
+            "3月1日": date(2025, 3, 1),
+            "3天前": date(2025, 3, 7),
+            "2周前": date(2025, 2, 24),
+            "5小时前": today,
+            "昨天 10:20": date(2025, 3, 9),
+            "刚刚": today,
+            "2023-02-30": None,
+            "未知日期": None,
+            "": None,
+        }
+        for text, expected in cases.items():
+            assert parse_date(text, today) == expected, f"{text!r} -> {parse_date(text, today)}"
+        assert parse_dates(list(cases) * 3, today) == list(cases.values()) * 3
+
+        records = [{"成立日期": "2019-12-31"}, {"成立日期": "2020-01-01"}, {"成立日期": "未知"}, {"成立日期": "2030-01-01"}]
+        assert [r["成立日期"] for r in filter_records(records)] == ["2020-01-01", "未知"]
+        assert len(filter_records(records, start=None, end=None, keep_unknown=False)) == 3
+
+        scraper = TianyanchaScraper.__new__(TianyanchaScraper)
+        assert scraper._build_bid_record("旧公告", "生长激素", "2019年12月31日", "") is None
+        # 相对日期按采集当天换算保存（换算到过滤范围内的日期）
+        days_ago = f"{(date.today() - date(2024, 1, 1)).days}天前"
+        assert scraper._build_bid_record("新公告", "生长激素", days_ago, "")["成立日期"] == "2024-01-01"
+        logger.info(f"✓ {len(cases)} 种日期写法解析正确，日期范围过滤生效")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+
+def test_date_prefilter():
+    """测试列表日期预过滤与提前结束翻页（模拟站点结果按日期倒序，HTTP通道端到端）"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试22】列表日期预过滤")
+    logger.info("="*50)
+
+    from mock_site import MockSite
+
+    class NoCookieBrowser:
+        def get_driver(self):
+            return self
+
+        def get_cookies(self):
+            return []
+
+    try:
+        # 每页4条、相邻结果间隔200天：第1页前2条晚于结束日期，第4页整页早于开始日期，第5页不再访问
+        with MockSite(pages=5, items_per_page=4, newest="2026-06-30", days_step=200) as site:
+            scraper = TianyanchaScraper(NoCookieBrowser(), parse_mode="script")
+            scraper._extract_bid_from_detail_page = lambda url, title, keyword: None  # 禁止回退真实浏览器
+            scraper.page_cache = None
+            results = scraper._search_via_http("生长激素", site.search_url("生长激素"), 5, 20)
+            assert results is not None and len(results) == 10
+            assert results[0]["成立日期"] == "2025-05-26" and results[-1]["成立日期"] == "2020-06-21"
+            assert site.stats["list"] == 4 and site.stats["detail"] == 10
+            assert scraper.date_skipped_fetches == 6 and scraper.date_skipped_pages == 1
+            scraper.report_latency()
+            scraper.close()
+        logger.info("✓ 列表日期不在范围内的详情页未访问，整页早于开始日期时停止翻页")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+
+def test_query_planner():
+    """测试按发布日期分片搜索：达到翻页上限的分片递归拆分、并发执行与覆盖报告"""
+    logger.info("\n" + "="*50)
+    logger.info("【测试23】按发布日期分片搜索")
+    logger.info("="*50)
+
+    import os
+    import shutil
+    import tempfile
+    from datetime import date
+    from crawl_journal import CrawlJournal
+    from mock_site import MockSite
+    from query_planner import QueryPlanner, SPLIT, TRUNCATED
+
+    class NoCookieBrowser:
+        def get_driver(self):
+            return self
+
+        def get_cookies(self):
+            return []
+
+    def new_scraper(journal=None):
+        scraper = TianyanchaScraper(NoCookieBrowser(), parse_mode="script", journal=journal)
+        scraper._extract_bid_from_detail_page = lambda url, title, keyword: None  # 禁止回退真实浏览器
+        scraper.page_cache = None
+        return scraper
+
+    folder = tempfile.mkdtemp()
+    try:
+        # 40条结果（每页4条、间隔10天），每次搜索最多2页：单次搜索只能拿到8条
+        with MockSite(pages=10, items_per_page=4, newest="2025-06-30", days_step=10) as site:
+            template = site.base_url + "/s/toubiao/detail?key={keyword}"
+            scraper = new_scraper()
+            planner = QueryPlanner(scraper, max_pages=2, initial_days=365, min_days=1, workers=1, url_template=template)
+            results = planner.run("注射笔", date(2024, 1, 1), date(2025, 6, 30))
+            report = planner.log_report()
+            assert len(results) == 40 and site.stats["detail"] == 40
+            assert report["coverage"] == 1.0 and report["truncated"] == 0
+            assert any(shard["status"] == SPLIT for shard in report["per_shard"])
+            assert results[0]["成立日期"] == "2025-06-30" and results[-1]["成立日期"] == "2024-06-05"
+            scraper.close()
+            logger.info(f"✓ 递归拆分为 {report['shards']} 个分片，全部 40 条结果均已采集")
+
+            # 最小跨度较大时无法继续拆分：记为截断，覆盖率低于100%
+            scraper = new_scraper()
+            planner = QueryPlanner(scraper, max_pages=2, initial_days=365, min_days=120, workers=3, url_template=template)
+            results = planner.run("注射笔", date(2024, 1, 1), date(2025, 6, 30))
+            report = planner.log_report()
+            assert report["truncated"] > 0 and report["coverage"] < 1.0
+            assert report["records"] == len(results) < 40
+            assert all(shard["status"] != TRUNCATED or shard["days"] <= 120 for shard in report["per_shard"])
+            scraper.close()
+            logger.info(f"✓ 并发分片与截断报告正常（覆盖 {report['coverage']:.1%}）")
+
+            # 并发递归拆分：共享的去重索引与计数不丢失、不重复访问；各分片的页码在采集日志中分别记录
+            journal = CrawlJournal(os.path.join(folder, "journal.db"))
+            scraper = new_scraper(journal)
+            detail_before = site.stats["detail"]
+            planner = QueryPlanner(scraper, max_pages=2, initial_days=365, min_days=1, workers=4, url_template=template)
+            results = planner.run("注射笔", date(2024, 1, 1), date(2025, 6, 30))
+            report = planner.report()
+            assert len(results) == 40 and site.stats["detail"] - detail_before == 40
+            assert report["coverage"] == 1.0
+            pages = journal._conn.execute("SELECT COUNT(*), COUNT(DISTINCT search) FROM pages").fetchone()
+            assert pages == (report["pages"], report["shards"])
+            scraper.close()
+            journal.close()
+            logger.info(f"✓ 并发分片结果完整，采集日志记录 {pages[0]} 页（{pages[1]} 个分片）")
+
+            # 站点不识别日期参数：不重叠的分片首页相同，停止拆分而不是拆到最小跨度
+            scraper = new_scraper()
+            planner = QueryPlanner(scraper, max_pages=2, initial_days=365, min_days=1, workers=1,
+                                   url_template=template, date_params=("from", "to"))
+            results = planner.run("注射笔", date(2024, 1, 1), date(2025, 6, 30))
+            report = planner.log_report()
+            assert report["date_filter_ignored"] and report["shards"] == 2
+            assert len(results) == 8
+            scraper.close()
+            logger.info("✓ 日期筛选参数未生效时停止拆分")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 测试失败: {str(e)}")
+        return False
+
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
 def run_all_tests():
     """运行所有测试"""
     logger.info("\n" + "="*60)
@@ -225,6 +1364,24 @@ def run_all_tests():
         ("登录页面访问", test_login_without_password),
         ("Excel导出", test_excel_export),
         ("爬虫初始化", test_scraper_init),
+        ("HTTP快速通道", test_http_fast_path),
+        ("离线页面解析", test_page_parser),
+        ("采集日志", test_crawl_journal),
+        ("跨关键词链接去重", test_url_dedup),
+        ("多格式输出", test_output_sinks),
+        ("本地结果库", test_result_store),
+        ("页面录制与回放", test_replay_driver),
+        ("本地模拟站点", test_mock_site),
+        ("性能基准", test_bench),
+        ("阶段耗时统计", test_metrics),
+        ("区间追踪", test_tracer),
+        ("性能剖析", test_profiler),
+        ("正文多字段提取", test_field_extractor),
+        ("行政区划索引", test_region_index),
+        ("医院词典匹配", test_hospital_matcher),
+        ("发布日期解析", test_date_utils),
+        ("列表日期预过滤", test_date_prefilter),
+        ("按发布日期分片搜索", test_query_planner),
     ]
 
     results = {}
@@ -271,8 +1428,44 @@ def main():
             return test_excel_export()
         elif test_name == "scraper":
             return test_scraper_init()
+        elif test_name == "http":
+            return test_http_fast_path()
+        elif test_name == "parser":
+            return test_page_parser()
+        elif test_name == "journal":
+            return test_crawl_journal()
+        elif test_name == "dedup":
+            return test_url_dedup()
+        elif test_name == "sinks":
+            return test_output_sinks()
+        elif test_name == "store":
+            return test_result_store()
+        elif test_name == "replay":
+            return test_replay_driver()
+        elif test_name == "mock":
+            return test_mock_site()
+        elif test_name == "bench":
+            return test_bench()
+        elif test_name == "metrics":
+            return test_metrics()
+        elif test_name == "trace":
+            return test_tracer()
+        elif test_name == "profile":
+            return test_profiler()
+        elif test_name == "fields":
+            return test_field_extractor()
+        elif test_name == "regions":
+            return test_region_index()
+        elif test_name == "hospitals":
+            return test_hospital_matcher()
+        elif test_name == "dates":
+            return test_date_utils()
+        elif test_name == "prefilter":
+            return test_date_prefilter()
+        elif test_name == "shards":
+            return test_query_planner()
         else:
-            print("用法: python test_spider.py [browser|element|login|excel|scraper|all]")
+            print("用法: python test_spider.py [browser|element|login|excel|scraper|http|parser|journal|dedup|sinks|store|replay|mock|bench|metrics|trace|profile|fields|regions|hospitals|dates|prefilter|shards|all]")
             return False
 
     else:
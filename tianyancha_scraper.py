@@ -1,32 +1,87 @@
 import time
 import logging
-import re
-from datetime import datetime
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib.parse import quote
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from bs4 import BeautifulSoup
-from config import SEARCH_URL_TEMPLATE, DATE_FILTER_START, DATE_FILTER_END
+from config import SEARCH_URL_TEMPLATE, HTTP_FAST_PATH
+from config import PARSE_MODE, PARSE_WORKERS, LIST_DATE_PREFILTER, RESULTS_SORTED_BY_DATE
+from http_fetcher import HttpFetcher, LatencyTracker
+from page_cache import get_page_cache
+from metrics import timed
+from tracer import span, traced
+from browser_pool import CollectedData
+from dom_scripts import LIST_EXTRACT_SCRIPT, DETAIL_EXTRACT_SCRIPT
+from field_extractor import extract_fields
+from region_index import get_region_index
+from hospital_matcher import get_hospital_matcher
+import page_parser
+import date_utils
 
 
 logger = logging.getLogger(__name__)
 
+# 搜索结果区域定位器（用于判断列表页就绪）
+RESULT_LOCATORS = [
+    (By.XPATH, "//a[contains(@href,'/bid/')]"),
+    (By.XPATH, "//div[contains(@class,'result') or contains(@class,'list') or contains(@class,'item')]"),
+]
+
+# 详情页正文容器定位器（用于判断详情页就绪）
+DETAIL_LOCATORS = [
+    (By.CSS_SELECTOR, ".bid-detail, .article, .content, .detail, .announcement"),
+    (By.XPATH, "//div[contains(@class,'bid') or contains(@class,'detail') or contains(@class,'content')]"),
+]
+
 
 class TianyanchaScraper:
     """天眼查数据爬虫类"""
 
-    def __init__(self, browser_manager):
+    def __init__(self, browser_manager, use_http=HTTP_FAST_PATH, browser_pool=None, parse_mode=PARSE_MODE,
+                 journal=None):
         """
         初始化爬虫
 
         Args:
-            browser_manager: BrowserManager实例
+            browser_manager: BrowserManager实例（需已登录）
+            use_http: 是否启用HTTP快速通道（复用浏览器Cookie直接请求页面）
+            browser_pool: BrowserPool实例；提供时详情页由池内浏览器并发提取
+            parse_mode: 页面解析方式（offline / script / element）
+            journal: CrawlJournal实例；提供时逐条记录已完成的详情页，并跳过上次已完成的详情页
         """
         self.browser_manager = browser_manager
+        self.journal = journal
         self.driver = browser_manager.get_driver()
-        self.collected_data = []
-
-    def search_toubiao(self, keyword, max_pages=5, max_items_per_page=20):
+        self.collected_data = CollectedData()
+        self.browser_pool = browser_pool
+        self._pool_workers = {}
+        self.latency = LatencyTracker()
+        self.parse_mode = parse_mode
+        self.parse_executor = None
+        if parse_mode == "offline":
+            self.parse_executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+        self.http_fetcher = None
+        # 回放模式下页面全部来自夹具，不走HTTP与页面缓存
+        offline = getattr(browser_manager, "offline", False)
+        if use_http and not offline:
+            self.http_fetcher = HttpFetcher()
+            self.http_fetcher.load_cookies_from_driver(self.driver)
+        self.page_cache = get_page_cache() if not offline else None
+        self._list_cache_urls = set()
+        self._seen_urls = {}  # 详情链接 -> 已提取的记录（None表示被日期过滤排除），跨关键词共享
+        self._merged_records = []  # 合并了新关键词、尚未交给输出目标重写的记录
+        self.skipped_detail_fetches = 0
+        self.date_skipped_fetches = 0  # 列表日期不在范围内而未打开的详情页
+        self.date_skipped_pages = 0  # 整页早于开始日期而提前结束时省去的翻页
+        self._state_lock = threading.Lock()  # 保护上面的去重索引与计数（分片并发搜索、浏览器池并发提取）
+        self._browser_lock = threading.Lock()
+        self._paging = threading.local()  # 按线程记录当前搜索的翻页与提前结束状态（分片可并发搜索）
+
+    @traced("keyword", args=("keyword",))
+    @timed("search_keyword", keyword_arg="keyword")
+    def search_toubiao(self, keyword, max_pages=5, max_items_per_page=20, search_url=None):
         """
         搜索招投标信息（支持分页）
 
@@ -34,54 +89,283 @@ class TianyanchaScraper:
             keyword: 搜索关键字
             max_pages: 最大抓取页数，默认5页
             max_items_per_page: 每页最大提取条目数，默认20
+            search_url: 搜索结果页URL（如带发布日期筛选参数的分片URL），默认由 SEARCH_URL_TEMPLATE 构造
 
         Returns:
             list: 搜索结果列表
         """
         all_results = []
+        self._paging.pages, self._paging.capped, self._paging.first_urls = 0, False, None
         try:
             # 直接构造并访问带关键词的招投标搜索URL
-            search_url = SEARCH_URL_TEMPLATE.format(keyword=quote(keyword))
+            search_url = search_url or SEARCH_URL_TEMPLATE.format(keyword=quote(keyword))
+            self._paging.search = search_url
             logger.info(f"正在搜索关键词: {keyword}")
             logger.info(f"访问URL: {search_url}")
 
-            self.browser_manager.navigate_to(search_url)
-            time.sleep(3)
+            http_results = self._search_via_http(keyword, search_url, max_pages, max_items_per_page)
+            if http_results is not None:
+                logger.info(f"✓ 关键词 '{keyword}' 共获取 {len(http_results)} 条结果（缓存/HTTP）")
+                return http_results
+
+            # 只有一个主浏览器：多个分片并发搜索时浏览器通道串行执行
+            with self._browser_lock:
+                self._search_via_browser(keyword, search_url, max_pages, max_items_per_page, all_results)
+
+            logger.info(f"✓ 关键词 '{keyword}' 共获取 {len(all_results)} 条结果")
+            return all_results
+
+        except Exception as e:
+            logger.error(f"❌ 搜索过程出错: {str(e)}")
+            return all_results
 
-            # 处理可能的弹窗
-            self._close_overlays()
-            self._wait_for_results()
+    def last_search_paging(self):
+        """
+        当前线程最近一次 search_toubiao 的翻页情况
 
-            # 分页抓取
-            for page in range(1, max_pages + 1):
+        Returns:
+            tuple: (已抓取页数, 是否达到翻页上限且仍有下一页)
+        """
+        return getattr(self._paging, "pages", 0), getattr(self._paging, "capped", False)
+
+    def last_search_first_page(self):
+        """
+        当前线程最近一次 search_toubiao 首页列表中的详情链接（日期预过滤与去重之前）
+
+        Returns:
+            tuple: 详情页URL；首页未解析（如续跑时跳过）时返回None
+        """
+        return getattr(self._paging, "first_urls", None)
+
+    def _search_via_browser(self, keyword, search_url, max_pages, max_items_per_page, all_results, first_page=1):
+        """
+        通过浏览器打开搜索页并逐页抓取
+
+        Args:
+            keyword: 搜索关键词
+            search_url: 搜索结果页URL（first_page 对应的页面）
+            max_pages: 最大抓取页数
+            max_items_per_page: 每页最大提取条目数
+            all_results: 结果列表（逐页追加，出错时保留已获取的结果）
+            first_page: 起始页码（HTTP通道中途失败时从失败的页面接着抓取）
+        """
+        self._list_cache_urls = set()
+        start = time.time()
+        self.browser_manager.navigate_to(search_url)
+        self.browser_manager.wait_until_ready("search_list", budget=3, locators=RESULT_LOCATORS)
+
+        # 处理可能的弹窗
+        self._close_overlays()
+        self._wait_for_results()
+        self.browser_manager.record_fixture(search_url)
+        self.latency.record("browser:list", time.time() - start)
+
+        # 分页抓取
+        for page in range(first_page, max_pages + 1):
+            with span("page", keyword=keyword, page=page):
                 logger.info(f"正在抓取第 {page}/{max_pages} 页...")
 
-                # 解析当前页
-                results = self._parse_search_results_fast(keyword, max_items=max_items_per_page)
-                logger.info(f"✓ 第 {page} 页获取到 {len(results)} 条结果")
+                done = self._resume_page(keyword, page)
+                if done is not None:
+                    results, last = done["records"], done["last"]
+                else:
+                    # 解析当前页
+                    self._paging.date_skipped = 0
+                    results = self._parse_search_results_fast(keyword, max_items=max_items_per_page)
+                    logger.info(f"✓ 第 {page} 页获取到 {len(results)} 条结果")
+
+                    # 如果没有结果，可能已到最后一页（整页被列表日期过滤时仍继续翻页）
+                    last = len(results) == 0 and not self._paging.date_skipped
+                    if last:
+                        logger.info("已无更多结果")
+                    # 结果按日期倒序时，整页早于开始日期即可停止翻页
+                    elif self._paging.before_start and page < max_pages:
+                        self._stop_paging(page, max_pages)
+                        last = True
+                    self._mark_page_done(keyword, page, len(results), last=last)
+                self._paging.pages = page
 
                 all_results.extend(results)
-
-                # 如果没有结果，可能已到最后一页
-                if len(results) == 0:
-                    logger.info("已无更多结果")
+                if last:
                     break
 
                 # 尝试翻到下一页
                 if page < max_pages:
+                    start = time.time()
                     if not self._go_to_next_page():
                         logger.info("已到达最后一页")
                         break
                     # 翻页后等待新页面加载完成
-                    time.sleep(3)
-                    self._wait_for_results(timeout=10)
+                    self._wait_for_results(timeout=10, budget=3)
+                    self.browser_manager.record_fixture()
+                    self.latency.record("browser:list", time.time() - start)
+                else:
+                    # 已达翻页上限：记录是否仍有下一页（供查询分片判断是否需要继续拆分）
+                    self._paging.capped = self._find_next_button() is not None
+
+    def _search_via_http(self, keyword, search_url, max_pages, max_items_per_page):
+        """
+        通过页面缓存或HTTP快速通道抓取搜索列表
 
-            logger.info(f"✓ 关键词 '{keyword}' 共获取 {len(all_results)} 条结果")
-            return all_results
+        Args:
+            keyword: 搜索关键词
+            search_url: 搜索结果页URL
+            max_pages: 最大抓取页数
+            max_items_per_page: 每页最大提取条目数
+
+        Returns:
+            list: 搜索结果列表；首页缓存未命中且HTTP通道不可用（验证页、无结果或仅支持脚本翻页）时返回None
+        """
+        if not self.page_cache and not (self.http_fetcher and self.http_fetcher.enabled):
+            return None
+
+        self._paging.search = search_url
+        all_results = []
+        url = search_url
+        for page in range(1, max_pages + 1):
+            with span("page", keyword=keyword, page=page):
+                done = self._resume_page(keyword, page, need_next_url=True)
+                if done is not None:
+                    # 上次已完成的页面不再请求，按记录的下一页URL继续
+                    self._paging.pages = page
+                    all_results.extend(done["records"])
+                    if done["last"]:
+                        break
+                    if page == max_pages:
+                        self._paging.capped = True
+                    url = done["next_url"]
+                    continue
+
+                start = time.time()
+                html, source = self._fetch_html(url)
+                if html is None:
+                    # 首页即失败则整体回退浏览器；中途失败（验证页或缓存未命中且HTTP不可用）
+                    # 则保留已获取结果，由浏览器从失败的页面接着抓取
+                    if page == 1:
+                        return None
+                    self._hand_off_to_browser(keyword, url, max_pages, max_items_per_page, all_results, page)
+                    return all_results
+                root = page_parser.parse_document(html)
+                links = page_parser.parse_search_results(root, url, max_items=max_items_per_page)
+                next_url, has_next_control = page_parser.parse_next_page(root, url)
+                self.latency.record(f"{source}:list", time.time() - start)
+
+                if page == 1 and (not links or (has_next_control and not next_url)):
+                    # 列表为空（可能需要脚本渲染）或翻页依赖脚本，交给浏览器处理
+                    return None
+                if source == "http" and links:
+                    self._cache_page(url, html)
+
+                logger.info(f"正在抓取第 {page}/{max_pages} 页（{'缓存' if source == 'cache' else 'HTTP'}），找到 {len(links)} 个结果项")
+                results = self._extract_links(links, keyword)
+                logger.info(f"✓ 第 {page} 页获取到 {len(results)} 条结果")
+                self._paging.pages = page
+                all_results.extend(results)
 
+                last = True
+                if not links or not next_url:
+                    logger.info("已到达最后一页")
+                elif self._page_before_start(links) and page < max_pages:
+                    self._stop_paging(page, max_pages)
+                else:
+                    last = False
+                self._mark_page_done(keyword, page, len(results), next_url=next_url, last=last)
+                if last:
+                    break
+                if page == max_pages:
+                    # 已达翻页上限且仍有下一页（供查询分片判断是否需要继续拆分）
+                    self._paging.capped = True
+                url = next_url
+
+        return all_results
+
+    def _hand_off_to_browser(self, keyword, url, max_pages, max_items_per_page, all_results, page):
+        """
+        HTTP通道中途失败时由浏览器从失败的页面接着抓取（出错时保留已获取的结果）
+
+        Args:
+            keyword: 搜索关键词
+            url: 失败页面的URL
+            max_pages: 最大抓取页数
+            max_items_per_page: 每页最大提取条目数
+            all_results: 已获取的结果列表（浏览器结果继续追加）
+            page: 失败的页码
+        """
+        logger.info(f"⚠ 第 {page} 页无法通过缓存/HTTP获取，改用浏览器从该页继续")
+        try:
+            with self._browser_lock:
+                self._search_via_browser(keyword, url, max_pages, max_items_per_page, all_results, first_page=page)
         except Exception as e:
-            logger.error(f"❌ 搜索过程出错: {str(e)}")
-            return all_results
+            logger.error(f"❌ 浏览器接续抓取出错: {str(e)}")
+
+    def _fetch_html(self, url):
+        """
+        不经浏览器获取页面HTML：先查页面缓存，未命中再走HTTP快速通道
+
+        Args:
+            url: 页面URL
+
+        Returns:
+            tuple: (html, source)，source 为 'cache' 或 'http'；均不可用时返回 (None, None)
+        """
+        if self.page_cache:
+            with span("cache_get"):
+                html = self.page_cache.get(url)
+            if html is not None:
+                return html, "cache"
+        if self.http_fetcher and self.http_fetcher.enabled:
+            with span("http_fetch", url=url):
+                html = self.http_fetcher.fetch(url)
+            if html is not None:
+                return html, "http"
+        return None, None
+
+    def _mark_page_done(self, keyword, page, items, next_url="", last=False):
+        """
+        在采集日志中记录已完成的搜索结果页（未启用日志或本页解析失败时忽略）
+
+        Args:
+            keyword: 搜索关键词
+            page: 页码
+            items: 该页提取到的数据条数
+            next_url: 下一页URL（点击翻页时为空）
+            last: 是否在该页结束翻页
+        """
+        urls, self._paging.urls = getattr(self._paging, "urls", None), None
+        if self.journal and urls is not None:
+            self.journal.mark_page_done(keyword, page, items, urls=urls, next_url=next_url, last=last,
+                                        search=getattr(self._paging, "search", ""))
+
+    def _resume_page(self, keyword, page, need_next_url=False):
+        """
+        续跑时从采集日志重建上次已完成的搜索结果页
+
+        Args:
+            keyword: 搜索关键词
+            page: 页码
+            need_next_url: 是否要求记录了下一页URL（HTTP通道不经点击翻页，需要据此跳到下一页）
+
+        Returns:
+            dict: {'records', 'next_url', 'last'}；未完成或页内仍有未完成的详情页时返回None
+        """
+        if not self.journal:
+            return None
+        done = self.journal.get_page(keyword, page, search=getattr(self._paging, "search", ""))
+        if done is None or (need_next_url and not done["last"] and not done["next_url"]):
+            return None
+        bids = self.journal.get_bids(keyword, done["urls"])
+        if len(bids) < len(done["urls"]):
+            return None
+        for url in done["urls"]:
+            self._remember(url, bids[url])
+        done["records"] = [bids[url] for url in done["urls"] if bids[url]]
+        logger.info(f"⊘ 第 {page} 页上次已完成，跳过（{len(done['records'])} 条）")
+        return done
+
+    def _cache_page(self, url, html):
+        """写入页面缓存（未启用缓存时忽略）"""
+        if self.page_cache and html:
+            self.page_cache.put(url, html)
 
     def _parse_search_results(self, keyword):
         """
@@ -106,57 +390,420 @@ class TianyanchaScraper:
         Returns:
             list: 解析后的数据列表
         """
+        self._paging.before_start = False
+        self._paging.urls = None
+        try:
+            self.browser_manager.wait_until_ready("list_parse", budget=1, locators=RESULT_LOCATORS)
+
+            links_data = None
+            if self.parse_mode == "offline":
+                links_data = self._collect_result_links_offline(max_items)
+            if links_data is None and self.parse_mode in ("offline", "script"):
+                links_data = self._collect_result_links_js(max_items)
+            if links_data is None:
+                links_data = self._collect_result_links(max_items)
+
+            self._paging.before_start = self._page_before_start(links_data)
+            return self._extract_links(links_data, keyword)
+
+        except Exception as e:
+            logger.error(f"❌ 解析搜索结果时出错: {str(e)}")
+            return []
+
+    def _collect_result_links_offline(self, max_items=20):
+        """
+        取一次 page_source 并离线解析结果链接
+
+        Args:
+            max_items: 最大条目数
+
+        Returns:
+            list: [{'url', 'name', 'index', 'date'}]；读取页面源码失败返回None
+        """
         try:
-            results = []
-            time.sleep(1)
+            html = self.driver.page_source
+            base_url = self.driver.current_url
+        except Exception as e:
+            logger.debug(f"读取页面源码失败，回退脚本方式: {str(e)}")
+            return None
+        links_data = page_parser.parse_search_results(html, base_url, max_items=max_items)
+        # 点击翻页可能不改变URL，同一次搜索中每个URL只缓存首次看到的页面
+        if links_data and base_url not in self._list_cache_urls:
+            self._list_cache_urls.add(base_url)
+            self._cache_page(base_url, html)
+        logger.info(f"找到 {len(links_data)} 个可点击的结果项")
+        return links_data
+
+    def _collect_result_links_js(self, max_items=20):
+        """
+        通过一次注入脚本收集结果链接（标题、URL与列表项日期）
+
+        Args:
+            max_items: 最大条目数
 
-            # 查找所有可点击的结果标题（/bid/ 详情链接）
+        Returns:
+            list: [{'url', 'name', 'index', 'date'}]；脚本执行失败返回None
+        """
+        try:
+            items = self.driver.execute_script(LIST_EXTRACT_SCRIPT, max_items)
+        except Exception as e:
+            logger.debug(f"脚本提取结果链接失败，回退逐元素方式: {str(e)}")
+            return None
+        if not isinstance(items, list):
+            return None
+
+        links_data = []
+        for item in items[:max_items]:
+            links_data.append({
+                'url': item.get('url'),
+                'name': (item.get('name') or '').strip(),
+                'index': len(links_data) + 1,
+                'date': item.get('date') or '',
+            })
+        logger.info(f"找到 {len(links_data)} 个可点击的结果项")
+        return links_data
+
+    def _collect_result_links(self, max_items=20):
+        """
+        逐元素收集结果链接（脚本提取不可用时的回退方式）
+
+        Args:
+            max_items: 最大条目数
+
+        Returns:
+            list: [{'url', 'name', 'index'}]
+        """
+        # 查找所有可点击的结果标题（/bid/ 详情链接）
+        result_links = self.driver.find_elements(
+            By.XPATH,
+            "//a[contains(@href,'/bid/')][ancestor::*[contains(@class,'result') or contains(@class,'item') or contains(@class,'list')]]"
+        )
+
+        if not result_links:
+            # 备用选择器
             result_links = self.driver.find_elements(
                 By.XPATH,
-                "//a[contains(@href,'/bid/')][ancestor::*[contains(@class,'result') or contains(@class,'item') or contains(@class,'list')]]"
+                "//div[contains(@class,'result') or contains(@class,'item')]//a[contains(@href,'/bid/')]"
             )
 
-            if not result_links:
-                # 备用选择器
-                result_links = self.driver.find_elements(
-                    By.XPATH,
-                    "//div[contains(@class,'result') or contains(@class,'item')]//a[contains(@href,'/bid/')]"
-                )
+        # 限制数量
+        result_links = result_links[:max_items]
 
-            # 限制数量
-            result_links = result_links[:max_items]
+        logger.info(f"找到 {len(result_links)} 个可点击的结果项")
 
-            logger.info(f"找到 {len(result_links)} 个可点击的结果项")
+        # 收集所有链接URL和名称，避免遍历时元素失效
+        links_data = []
+        for idx, link in enumerate(result_links):
+            try:
+                url = link.get_attribute('href')
+                name = link.text.strip()
+                if url and name:
+                    links_data.append({'url': url, 'name': name, 'index': idx + 1})
+            except Exception:
+                continue
+        return links_data
 
-            # 收集所有链接URL和名称，避免遍历时元素失效
-            links_data = []
-            for idx, link in enumerate(result_links[:max_items]):
-                try:
-                    url = link.get_attribute('href')
-                    name = link.text.strip()
-                    if url and name:
-                        links_data.append({'url': url, 'name': name, 'index': idx + 1})
-                except Exception:
-                    continue
+    def _extract_links(self, links_data, keyword):
+        """
+        逐个访问详情页并提取数据（仅抓取正文，不跟随页面内其他链接）
+
+        Args:
+            links_data: [{'url', 'name', 'index'}] 列表
+            keyword: 搜索关键词
+
+        Returns:
+            list: 提取到的数据列表
+        """
+        total = len(links_data)
+        if getattr(self._paging, "first_urls", None) is None:
+            self._paging.first_urls = tuple(data['url'] for data in links_data)
+        links_data = self._prefilter_by_date(links_data, total)
+        links_data = self._skip_seen_links(links_data, keyword, total)
+        self._paging.urls = [data['url'] for data in links_data]
+        results = []
+        if self.journal:
+            done = self.journal.get_bids(keyword, [data['url'] for data in links_data])
+            if done:
+                logger.info(f"⊘ 跳过 {len(done)} 个上次已完成的详情页")
+                for url, record in done.items():
+                    self._remember(url, record)
+                results = [record for record in done.values() if record]
+                links_data = [data for data in links_data if data['url'] not in done]
+        if not links_data:
+            return results
+
+        if self.browser_pool and len(self.browser_pool) > 1 and len(links_data) > 1:
+            return results + self._extract_links_with_pool(links_data, keyword, total)
+
+        # 先逐个抓取页面（离线模式下解析在后台线程进行，浏览器不必等待解析完成）
+        pending = []
+        for data in links_data:
+            try:
+                logger.info(f"[{data['index']}/{total}] 正在提取: {data['name']}")
+                pending.append((data, self._submit_bid(data['url'], data['name'], keyword)))
+            except Exception as e:
+                logger.warning(f"⚠ [{data['index']}/{total}] 提取失败: {data['name']} - {str(e)}")
+
+        for data, future in pending:
+            try:
+                bid_data = future.result()
+                self._remember(data['url'], bid_data)
+                self._journal_bid(keyword, data['url'], bid_data)
+                if bid_data:  # None表示日期过滤排除
+                    results.append(bid_data)
+                    logger.info(f"✓ [{data['index']}/{total}] 已提取: {data['name']}")
+            except Exception as e:
+                logger.warning(f"⚠ [{data['index']}/{total}] 提取失败: {data['name']} - {str(e)}")
+        return results
+
+    def _extract_links_with_pool(self, links_data, keyword, total=None):
+        """
+        使用浏览器池并发提取详情页
 
-            # 逐个访问详情页并提取数据（仅抓取正文，不跟随页面内其他链接）
+        Args:
+            links_data: [{'url', 'name', 'index'}] 列表
+            keyword: 搜索关键词
+            total: 本页结果总数（用于日志，默认为links_data长度）
+
+        Returns:
+            list: 提取到的数据列表（保持链接原顺序）
+        """
+        total = total or len(links_data)
+
+        def handle(manager, data):
+            worker = self._get_pool_worker(manager)
+            logger.info(f"[{data['index']}/{total}] 正在提取: {data['name']}")
+            bid_data = worker._extract_bid(data['url'], data['name'], keyword)
+            self._remember(data['url'], bid_data)
+            self._journal_bid(keyword, data['url'], bid_data)
+            if bid_data:
+                logger.info(f"✓ [{data['index']}/{total}] 已提取: {data['name']}")
+            return bid_data
+
+        results = self.browser_pool.run_tasks(links_data, handle)
+        return [item for item in results if item]
+
+    def _prefilter_by_date(self, links_data, total):
+        """
+        按列表项日期跳过不在日期范围内的详情页（列表项无日期或无法识别时保留，由详情页日期判断）
+
+        Args:
+            links_data: [{'url', 'name', 'index', 'date'}] 列表
+            total: 本页结果总数（用于日志）
+
+        Returns:
+            list: 需要打开详情页的链接
+        """
+        if not LIST_DATE_PREFILTER:
+            return links_data
+        remaining = []
+        for data, publish_date in zip(links_data, date_utils.parse_dates(data.get('date') for data in links_data)):
+            if publish_date is None or date_utils.in_filter_range(publish_date):
+                remaining.append(data)
+                continue
+            with self._state_lock:
+                self.date_skipped_fetches += 1
+            self._paging.date_skipped = getattr(self._paging, "date_skipped", 0) + 1
+            logger.info(f"⊘ [{data['index']}/{total}] 跳过（列表日期{publish_date.isoformat()}不在范围内）: {data['name']}")
+        return remaining
+
+    def _page_before_start(self, links_data):
+        """
+        判断整页结果是否都早于开始日期（仅在结果按日期倒序时用于提前结束翻页）
+
+        Args:
+            links_data: [{'url', 'name', 'index', 'date'}] 列表
+
+        Returns:
+            bool: 每一项都有可识别的列表日期且早于 DATE_FILTER_START 时返回True
+        """
+        if not RESULTS_SORTED_BY_DATE or not links_data:
+            return False
+        dates = date_utils.parse_dates(data.get('date') for data in links_data)
+        return all(publish_date is not None and publish_date < date_utils.FILTER_START for publish_date in dates)
+
+    def _stop_paging(self, page, max_pages):
+        """整页早于开始日期时停止翻页，并记录省去的页数"""
+        skipped = max_pages - page
+        with self._state_lock:
+            self.date_skipped_pages += skipped
+        logger.info(f"⊘ 第 {page} 页结果均早于 {date_utils.FILTER_START.isoformat()}，停止翻页（省去 {skipped} 页）")
+
+    def _skip_seen_links(self, links_data, keyword, total):
+        """
+        跳过已提取过的详情链接（如其他关键词的搜索结果中出现过），
+        并把当前关键词合并到已有记录的“代理产品类别”
+
+        Args:
+            links_data: [{'url', 'name', 'index'}] 列表
+            keyword: 搜索关键词
+            total: 本页结果总数（用于日志）
+
+        Returns:
+            list: 尚未提取过的链接
+        """
+        remaining = []
+        merged = []
+        with self._state_lock:
             for data in links_data:
-                try:
-                    logger.info(f"[{data['index']}/{len(links_data)}] 正在提取: {data['name']}")
-                    bid_data = self._extract_bid_from_detail_page(data['url'], data['name'], keyword)
-                    if bid_data:  # None表示日期过滤排除
-                        results.append(bid_data)
-                        logger.info(f"✓ [{data['index']}/{len(links_data)}] 已提取: {data['name']}")
-                    time.sleep(0.5)  # 减少延迟提升速度
-                except Exception as e:
-                    logger.warning(f"⚠ [{data['index']}/{len(links_data)}] 提取失败: {data['name']} - {str(e)}")
+                if data['url'] not in self._seen_urls:
+                    remaining.append(data)
                     continue
+                self.skipped_detail_fetches += 1
+                record = self._seen_urls[data['url']]
+                if record is not None and self._merge_keyword(record, keyword):
+                    self._merged_records.append(record)
+                    merged.append((data['url'], dict(record)))
+                logger.info(f"⊘ [{data['index']}/{total}] 已提取过，跳过: {data['name']}")
+        if self.journal:
+            for url, record in merged:
+                self.journal.update_bid(url, record)
+        return remaining
+
+    def take_merged_records(self):
+        """
+        取出上次调用以来合并了新关键词的已有记录（供输出目标重写）
 
-            return results
+        Returns:
+            list: 数据字典列表
+        """
+        with self._state_lock:
+            records, self._merged_records = self._merged_records, []
+        return records
 
-        except Exception as e:
-            logger.error(f"❌ 解析搜索结果时出错: {str(e)}")
-            return []
+    def _merge_keyword(self, record, keyword):
+        """
+        把关键词合并到记录的“代理产品类别”（逗号分隔）
+
+        Returns:
+            bool: 记录被修改返回True
+        """
+        categories = [item for item in (record.get("代理产品类别") or "").split(",") if item]
+        if keyword in categories:
+            return False
+        categories.append(keyword)
+        record["代理产品类别"] = ",".join(categories)
+        return True
+
+    def _remember(self, url, bid_data):
+        """登记已提取的详情链接（记录中同时保存“详情链接”，便于续跑时重建索引）"""
+        if bid_data is not None:
+            bid_data["详情链接"] = url
+        with self._state_lock:
+            self._seen_urls[url] = bid_data
+
+    def _journal_bid(self, keyword, url, bid_data):
+        """在采集日志中记录已完成的详情页（未启用日志时忽略）"""
+        if self.journal:
+            self.journal.record_bid(keyword, url, bid_data)
+
+    def _get_pool_worker(self, manager):
+        """
+        获取浏览器池实例对应的爬虫（共享HTTP会话与耗时统计）
+
+        Args:
+            manager: 池内BrowserManager实例
+
+        Returns:
+            TianyanchaScraper: 绑定该浏览器的爬虫
+        """
+        if manager is self.browser_manager:
+            return self
+        worker = self._pool_workers.get(id(manager))
+        if worker is None:
+            worker = TianyanchaScraper(manager, use_http=False, parse_mode=self.parse_mode)
+            if worker.parse_executor:
+                worker.parse_executor.shutdown(wait=False)
+            worker.parse_executor = self.parse_executor
+            worker.http_fetcher = self.http_fetcher
+            worker.latency = self.latency
+            self._pool_workers[id(manager)] = worker
+        return worker
+
+    def _extract_bid(self, url, title, keyword):
+        """
+        提取单个招投标详情：优先HTTP快速通道，遇到验证页回退浏览器
+
+        Args:
+            url: 招投标详情页URL（/bid/...）
+            title: 结果标题
+            keyword: 搜索关键词
+
+        Returns:
+            dict: 数据字典，或None如果不在日期范围内
+        """
+        return self._submit_bid(url, title, keyword).result()
+
+    @traced("detail", args=("url", "title"))
+    @timed("detail", keyword_arg="keyword")
+    def _submit_bid(self, url, title, keyword):
+        """
+        抓取单个招投标详情页并提交解析
+
+        依次尝试页面缓存、HTTP快速通道与浏览器。页面抓取在当前线程完成；
+        离线模式下浏览器页面源码的解析交给后台线程，调用方可以立即处理下一个链接。
+
+        Args:
+            url: 招投标详情页URL（/bid/...）
+            title: 结果标题
+            keyword: 搜索关键词
+
+        Returns:
+            Future: 结果为数据字典，或None如果不在日期范围内
+        """
+        if self.page_cache or (self.http_fetcher and self.http_fetcher.enabled):
+            start = time.time()
+            html, source = self._fetch_html(url)
+            if html is not None:
+                detail = page_parser.parse_bid_detail(html)
+                if detail["text"]:
+                    if source == "http":
+                        self._cache_page(url, html)
+                    self.latency.record(f"{source}:detail", time.time() - start)
+                    return self._completed(self._build_detail_record(title, keyword, detail))
+            logger.debug(f"缓存/HTTP通道未取得正文，回退浏览器: {url}")
+
+        start = time.time()
+        if self.parse_executor:
+            html = self._read_detail_source(url)
+            self.latency.record("browser:detail", time.time() - start)
+            if html is None:
+                return self._completed(self._new_record(title, keyword))
+            return self.parse_executor.submit(self._parse_detail_source, html, title, keyword, url)
+
+        data = self._extract_bid_from_detail_page(url, title, keyword)
+        self.latency.record("browser:detail", time.time() - start)
+        return self._completed(data)
+
+    def _completed(self, result):
+        """包装已得到的结果为已完成的Future"""
+        future = Future()
+        future.set_result(result)
+        return future
+
+    @traced("detail_parse", args=("url",))
+    @timed("detail_parse", keyword_arg="keyword")
+    def _parse_detail_source(self, html, title, keyword, url=None):
+        """
+        离线解析详情页源码并构造记录（在解析线程中执行）
+
+        Args:
+            html: 详情页源码
+            title: 结果标题
+            keyword: 搜索关键词
+            url: 详情页URL；提供且解析到正文时写入页面缓存
+
+        Returns:
+            dict: 数据字典，或None如果不在日期范围内
+        """
+        detail = page_parser.parse_bid_detail(html)
+        if url and detail["text"]:
+            self._cache_page(url, html)
+        return self._build_detail_record(title, keyword, detail)
+
+    def _build_detail_record(self, title, keyword, detail):
+        """由解析得到的 {'date_text', 'text', 'fields'} 构造记录（fields 缺失时从正文提取）"""
+        return self._build_bid_record(title, keyword, detail["date_text"], detail["text"], detail.get("fields"))
 
     def _find_search_input_toubiao(self, timeout=10):
         """定位招投标页的搜索输入框，兼容不同结构与 iframe。"""
@@ -188,19 +835,8 @@ class TianyanchaScraper:
         return None
 
     def _find_first(self, locator_list, timeout=10, log_failure=True):
-        """尝试多个定位器，返回第一个匹配元素。"""
-        end = time.time() + timeout
-        while time.time() < end:
-            for by, value in locator_list:
-                try:
-                    elem = self.driver.find_element(by, value)
-                    return elem
-                except Exception:
-                    continue
-            time.sleep(0.3)
-        if log_failure:
-            logger.debug(f"未定位到元素 locators={locator_list}")
-        return None
+        """尝试多个定位器，返回第一个匹配元素（timeout为整体截止时间）。"""
+        return self.browser_manager.find_first(locator_list, timeout=timeout, log_failure=log_failure)
 
     def _close_overlays(self):
         """尝试关闭可能的弹窗/遮罩。"""
@@ -211,11 +847,12 @@ class TianyanchaScraper:
                 ,(By.XPATH, "//button[contains(@class,'close') or contains(text(),'关闭')]")
                 ,(By.CSS_SELECTOR, ".tyc-modal .close,.modal .close")
             ]
-            close_btn = self._find_first(candidates, timeout=2, log_failure=False)
+            # 页面已就绪，弹窗不存在时单轮查找即可返回
+            close_btn = self._find_first(candidates, timeout=0, log_failure=False)
             if close_btn:
                 try:
                     self.driver.execute_script("arguments[0].click();", close_btn)
-                    time.sleep(0.5)
+                    self.browser_manager.wait_until_ready("close_overlay", budget=0.5, reset=True)
                 except Exception:
                     pass
         except Exception:
@@ -233,24 +870,17 @@ class TianyanchaScraper:
             if tab and '招投标' in tab.text:
                 try:
                     tab.click()
-                    time.sleep(1)
+                    self.browser_manager.wait_until_ready("toubiao_tab", budget=1, reset=True)
                 except Exception:
                     pass
         except Exception:
             pass
 
-    def _wait_for_results(self, timeout=10):
-        """等待搜索结果区域出现。"""
-        end = time.time() + timeout
-        while time.time() < end:
-            try:
-                elems = self.driver.find_elements(By.XPATH, "//div[contains(@class,'result') or contains(@class,'list') or contains(@class,'item')]")
-                if elems:
-                    return True
-            except Exception:
-                pass
-            time.sleep(0.5)
-        return False
+    @traced("wait_results")
+    @timed("wait_results")
+    def _wait_for_results(self, timeout=10, budget=0):
+        """等待搜索结果区域出现且DOM渲染稳定。"""
+        return self.browser_manager.wait_until_ready("results", budget=budget, locators=RESULT_LOCATORS, timeout=timeout)
 
     def _extract_company_info(self, item, keyword):
         """
@@ -291,7 +921,6 @@ class TianyanchaScraper:
                 try:
                     # 点击查看详情
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", item)
-                    time.sleep(0.5)
 
                     # 获取企业名称
                     name_elem = item.find_element(By.XPATH, ".//span[@class='company-name'] | .//a[@class='company-link']")
@@ -310,14 +939,14 @@ class TianyanchaScraper:
                     try:
                         detail_link = item.find_element(By.XPATH, ".//a[@class='detail-link' or contains(@href, '/gongshang/')]")
                         detail_link.click()
-                        time.sleep(2)
+                        self.browser_manager.wait_until_ready("company_detail", budget=2, reset=True)
 
                         # 获取详情页面信息
                         self._extract_detail_page_info(company_data)
 
                         # 返回搜索结果页面
                         self.driver.back()
-                        time.sleep(2)
+                        self.browser_manager.wait_until_ready("company_back", budget=2, locators=RESULT_LOCATORS)
                     except Exception as e:
                         logger.debug(f"无法获取详情页面: {str(e)}")
 
@@ -330,6 +959,8 @@ class TianyanchaScraper:
             logger.debug(f"提取企业信息失败: {str(e)}")
             return None
 
+    @traced("detail_browser", args=("url",))
+    @timed("detail_browser", keyword_arg="keyword")
     def _extract_bid_from_detail_page(self, url, title, keyword):
         """
         直接访问招投标详情页并提取正文（不跟随页面内链接）
@@ -342,36 +973,107 @@ class TianyanchaScraper:
         Returns:
             dict: 以现有列为键的字典，或None如果不在日期范围内
         """
-        data = {
-            "企业名称": title,
-            "省份": "",
-            "企业经营范围": "",
-            "企业地址": "",
-            "企业法人": "",
-            "企业联系电话": "",
-            "成立日期": "",
-            "营业期限": "",
-            "注册资金": "",
-            "统一社会信用代码": "",
-            "纳税人识别号": "",
-            "实际业务负责人": "",
-            "实际联系号码": "",
-            "代理产品类别": keyword,
-            "微信/邮箱": "",
-            "配送省份": "",
-            "覆盖地区": "",
-            "覆盖医院": ""
-        }
+        data = self._new_record(title, keyword)
 
         try:
-            # 新标签打开详情页
-            self.driver.execute_script(f"window.open('{url}', '_blank');")
-            time.sleep(1)
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            time.sleep(2)
-
-            # 尝试提取发布日期（优先处理，用于过滤）
-            publish_date = None
+            self._open_detail_tab(url)
+
+            # 一次脚本往返提取发布日期与正文；失败时回退逐元素方式
+            detail = None
+            if self.parse_mode != "element":
+                detail = self._read_detail_js()
+            if detail is None:
+                detail = self._read_detail_elements()
+            if self.page_cache and detail.get("text"):
+                self._cache_page(url, self.driver.page_source)
+
+            # 关闭详情页标签并返回
+            self._close_detail_tab()
+            return self._build_detail_record(title, keyword, detail)
+
+        except Exception as e:
+            logger.debug(f"访问招投标详情失败 {url}: {str(e)}")
+            self._close_detail_tab()
+            return data
+
+    @traced("detail_browser", args=("url",))
+    @timed("detail_browser")
+    def _read_detail_source(self, url):
+        """
+        在新标签打开详情页并读取一次页面源码（离线解析模式）
+
+        Args:
+            url: 招投标详情页URL（/bid/...）
+
+        Returns:
+            str: 页面源码；访问失败返回None
+        """
+        try:
+            self._open_detail_tab(url)
+            with span("page_source"):
+                html = self.driver.page_source
+            self._close_detail_tab()
+            return html
+        except Exception as e:
+            logger.debug(f"访问招投标详情失败 {url}: {str(e)}")
+            self._close_detail_tab()
+            return None
+
+    @traced("tab_open")
+    def _open_detail_tab(self, url):
+        """新标签打开详情页并等待正文就绪"""
+        handle_count = len(self.driver.window_handles)
+        self.driver.execute_script("window.open('about:blank', '_blank');")
+        self.browser_manager.wait_for(lambda: len(self.driver.window_handles) > handle_count,
+                                      "detail_tab", budget=1, timeout=5)
+        self.driver.switch_to.window(self.driver.window_handles[-1])
+        # 先为新标签应用精简加载设置，再加载详情页
+        self.browser_manager.apply_lean_profile(log=False)
+        self.driver.get(url)
+        self.browser_manager.wait_until_ready("detail_page", budget=2, locators=DETAIL_LOCATORS)
+        self.browser_manager.record_page_metrics("detail")
+        self.browser_manager.record_fixture(url)
+
+    @traced("tab_close")
+    def _close_detail_tab(self):
+        """关闭详情页标签并切回列表页"""
+        try:
+            if len(self.driver.window_handles) > 1:
+                self.driver.close()
+            self.driver.switch_to.window(self.driver.window_handles[0])
+        except Exception:
+            pass
+
+    @traced("detail_script")
+    def _read_detail_js(self):
+        """
+        通过一次注入脚本读取当前详情页
+
+        Returns:
+            dict: {'date_text', 'text'}；脚本执行失败返回None
+        """
+        try:
+            detail = self.driver.execute_script(DETAIL_EXTRACT_SCRIPT)
+        except Exception as e:
+            logger.debug(f"脚本提取详情失败，回退逐元素方式: {str(e)}")
+            return None
+        if not isinstance(detail, dict):
+            return None
+        return {
+            "date_text": detail.get("date_text") or "",
+            "text": detail.get("text") or "",
+        }
+
+    def _read_detail_elements(self):
+        """
+        逐元素读取当前详情页（脚本提取不可用时的回退方式）
+
+        Returns:
+            dict: {'date_text', 'text'}
+        """
+        # 尝试提取发布日期（优先处理，用于过滤）
+        date_text = ""
+        with span("date_lookup"):
             try:
                 date_candidates = [
                     (By.XPATH, "//*[contains(text(),'发布日期') or contains(text(),'公告日期') or contains(text(),'发布时间')]/following-sibling::*[1]"),
@@ -379,30 +1081,19 @@ class TianyanchaScraper:
                     (By.XPATH, "//span[contains(@class,'date') or contains(@class,'time')]"),
                     (By.XPATH, "//div[contains(@class,'date') or contains(@class,'time')]"),
                 ]
-                pub = self._find_first(date_candidates, timeout=3, log_failure=False)
+                pub = self._find_first(date_candidates, timeout=0, log_failure=False)
                 if pub:
                     date_text = pub.text.strip()
-                    data["成立日期"] = date_text
-                    publish_date = self._parse_date(date_text)
             except Exception as e:
                 logger.debug(f"提取日期失败: {str(e)}")
 
-            # 日期过滤：只保留2020-01-01到2025-11-30的数据
-            if publish_date:
-                filter_start = datetime.strptime(DATE_FILTER_START, "%Y-%m-%d")
-                filter_end = datetime.strptime(DATE_FILTER_END, "%Y-%m-%d")
-                if publish_date < filter_start or publish_date > filter_end:
-                    logger.info(f"⊘ 跳过（日期{publish_date.strftime('%Y-%m-%d')}不在范围内）: {title}")
-                    self.driver.close()
-                    self.driver.switch_to.window(self.driver.window_handles[0])
-                    return None
+        # 不在日期范围内的无需再读取正文
+        if self._is_out_of_date_range(date_text, "", log=False):
+            return {"date_text": date_text, "text": ""}
 
-            # 提取正文内容容器
-            candidates = [
-                (By.CSS_SELECTOR, ".bid-detail, .article, .content, .detail, .announcement"),
-                (By.XPATH, "//div[contains(@class,'bid') or contains(@class,'detail') or contains(@class,'content')]"),
-            ]
-            container = self._find_first(candidates, timeout=5, log_failure=False)
+        # 提取正文内容容器
+        with span("container_text"):
+            container = self._find_first(DETAIL_LOCATORS, timeout=5, log_failure=False)
             text = ""
             if container:
                 text = container.text.strip()
@@ -412,84 +1103,123 @@ class TianyanchaScraper:
                     text = self.driver.find_element(By.TAG_NAME, "body").text.strip()
                 except Exception:
                     text = ""
+        return {"date_text": date_text, "text": text}
 
-            # 适度裁剪正文长度，避免Excel过长
-            if text:
-                data["企业经营范围"] = text[:2000]
-
-            # 尝试从内容中提取企业地址和省份
-            if text:
-                # 查找地址模式
-                addr_patterns = [
-                    r'地址[：:](.*?)(?:\n|$)',
-                    r'联系地址[：:](.*?)(?:\n|$)',
-                    r'详细地址[：:](.*?)(?:\n|$)',
-                ]
-                for pattern in addr_patterns:
-                    match = re.search(pattern, text)
-                    if match:
-                        address = match.group(1).strip()
-                        data["企业地址"] = address[:100]  # 限制长度
-                        data["省份"] = self._extract_province(address)
-                        break
+    def _new_record(self, title, keyword):
+        """
+        创建以输出列为键的空记录
 
-            # 关闭详情页标签并返回
-            self.driver.close()
-            self.driver.switch_to.window(self.driver.window_handles[0])
-            return data
+        Args:
+            title: 结果标题
+            keyword: 搜索关键词
 
-        except Exception as e:
-            logger.debug(f"访问招投标详情失败 {url}: {str(e)}")
-            try:
-                if len(self.driver.window_handles) > 1:
-                    self.driver.close()
-                self.driver.switch_to.window(self.driver.window_handles[0])
-            except Exception:
-                pass
-            return data
+        Returns:
+            dict: 数据字典
+        """
+        return {
+            "企业名称": title,
+            "省份": "",
+            "企业经营范围": "",
+            "企业地址": "",
+            "企业法人": "",
+            "企业联系电话": "",
+            "成立日期": "",
+            "营业期限": "",
+            "注册资金": "",
+            "统一社会信用代码": "",
+            "纳税人识别号": "",
+            "实际业务负责人": "",
+            "实际联系号码": "",
+            "代理产品类别": keyword,
+            "微信/邮箱": "",
+            "配送省份": "",
+            "覆盖地区": "",
+            "覆盖医院": ""
+        }
 
-    def _parse_date(self, date_str):
+    def _is_out_of_date_range(self, date_text, title, log=True):
         """
-        解析日期字符串为datetime对象
+        判断发布日期是否不在过滤范围内
 
         Args:
-            date_str: 日期字符串
+            date_text: 发布日期文本
+            title: 结果标题（用于日志）
+            log: 是否输出跳过日志
+
+        Returns:
+            bool: 日期可解析且不在范围内时返回True
+        """
+        publish_date = self._parse_date(date_text)
+        if publish_date and not date_utils.in_filter_range(publish_date):
+            if log:
+                logger.info(f"⊘ 跳过（日期{publish_date.isoformat()}不在范围内）: {title}")
+            return True
+        return False
+
+    def _build_bid_record(self, title, keyword, date_text, text, fields=None):
+        """
+        由发布日期与正文构造记录（浏览器与HTTP通道共用）
+
+        Args:
+            title: 结果标题
+            keyword: 搜索关键词
+            date_text: 发布日期文本
+            text: 正文文本
+            fields: 已提取的正文字段（extract_fields 的结果），为None时从完整正文提取
 
         Returns:
-            datetime: 日期对象，解析失败返回None
+            dict: 数据字典，或None如果不在日期范围内
         """
-        if not date_str:
+        data = self._new_record(title, keyword)
+        date_text = (date_text or "").strip()
+        text = (text or "").strip()
+        data["成立日期"] = date_text
+
+        if self._is_out_of_date_range(date_text, title):
             return None
+        # 相对日期（3天前、昨天）与无年份日期按采集当天换算保存，日后重新解析结果不变
+        if date_text and not date_utils.has_year(date_text):
+            data["成立日期"] = date_utils.normalize_date(date_text) or date_text
 
-        # 常见日期格式
-        date_formats = [
-            "%Y-%m-%d",
-            "%Y年%m月%d日",
-            "%Y/%m/%d",
-            "%Y.%m.%d",
-        ]
+        # 一次扫描完整正文提取地址、电话、联系人、信用代码等字段
+        if fields is None:
+            fields = extract_fields(text)
+        data.update(fields)
 
-        # 提取日期数字
-        date_match = re.search(r'(\d{4})[年/-.]?(\d{1,2})[月/-.]?(\d{1,2})', date_str)
-        if date_match:
-            try:
-                year, month, day = date_match.groups()
-                return datetime(int(year), int(month), int(day))
-            except Exception:
-                pass
+        # 适度裁剪正文长度，避免Excel过长
+        if text:
+            data["企业经营范围"] = text[:2000]
 
-        # 尝试标准格式
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except Exception:
-                continue
+        address = fields.get("企业地址", "").strip()
+        if address:
+            data["企业地址"] = address[:100]  # 限制长度
 
-        return None
+        # 省份（地址无法解析时由标题与正文解析），正文提及的省份与地市写入配送省份与覆盖地区
+        context = f"{title}\n{text}"
+        get_region_index().fill_record(data, context)
+
+        # 正文提及的医院写入覆盖医院，医院所在地市并入覆盖地区
+        hospitals = get_hospital_matcher()
+        if hospitals is not None:
+            hospitals.fill_record(data, context)
+
+        return data
+
+    def _parse_date(self, date_str):
+        """
+        解析发布日期文本（支持绝对日期、无年份日期与“3天前”“昨天”等相对日期）
+
+        Args:
+            date_str: 日期字符串
+
+        Returns:
+            date: 日期对象，解析失败返回None
+        """
+        return date_utils.parse_date(date_str)
 
     def _extract_province(self, address):
         """
-        从地址中提取省份
+        从地址中提取省份（可由城市解析，如“广州市…”）
 
         Args:
             address: 地址字符串
@@ -497,21 +1227,24 @@ class TianyanchaScraper:
         Returns:
             str: 省份名称
         """
-        provinces = [
-            "北京", "上海", "天津", "重庆",
-            "河北", "山西", "辽宁", "吉林", "黑龙江",
-            "江苏", "浙江", "安徽", "福建", "江西", "山东",
-            "河南", "湖北", "湖南", "广东", "广西", "海南",
-            "四川", "贵州", "云南", "西藏",
-            "陕西", "甘肃", "青海", "宁夏", "新疆",
-            "台湾", "香港", "澳门"
-        ]
-
-        for province in provinces:
-            if province in address:
-                return province
-
-        return "未知"
+        return get_region_index().resolve(address).province or "未知"
+
+    def report_latency(self):
+        """打印缓存、HTTP与浏览器各通道的单页耗时统计及缓存命中情况"""
+        self.latency.log_summary()
+        if self.page_cache:
+            self.page_cache.log_stats()
+        if self.skipped_detail_fetches:
+            logger.info(f"重复链接: 跳过 {self.skipped_detail_fetches} 次详情页访问")
+        if self.date_skipped_fetches or self.date_skipped_pages:
+            logger.info(f"日期预过滤: 跳过 {self.date_skipped_fetches} 次详情页访问，提前结束省去 {self.date_skipped_pages} 页")
+
+    def close(self):
+        """释放HTTP会话等资源（浏览器由BrowserManager负责关闭）"""
+        if self.http_fetcher:
+            self.http_fetcher.close()
+        if self.parse_executor:
+            self.parse_executor.shutdown(wait=True)
 
     def save_data(self, data_list):
         """
@@ -520,6 +1253,11 @@ class TianyanchaScraper:
         Args:
             data_list: 数据列表
         """
+        with self._state_lock:
+            for item in data_list:
+                url = item.get("详情链接")
+                if url:
+                    self._seen_urls.setdefault(url, item)
         self.collected_data.extend(data_list)
         logger.info(f"✓ 已保存 {len(data_list)} 条数据，总计: {len(self.collected_data)} 条")
 
@@ -530,8 +1268,10 @@ class TianyanchaScraper:
         Returns:
             list: 数据列表
         """
-        return self.collected_data
+        return self.collected_data.snapshot()
 
+    @traced("next_page")
+    @timed("next_page")
     def _go_to_next_page(self):
         """
         翻到下一页
@@ -540,29 +1280,36 @@ class TianyanchaScraper:
             bool: 成功返回True，否则False
         """
         try:
-            # 查找"下一页"按钮
-            next_btns = [
-                (By.XPATH, "//a[contains(text(),'下一页') or contains(text(),'下页')]"),
-                (By.XPATH, "//button[contains(text(),'下一页') or contains(text(),'下页')]"),
-                (By.CSS_SELECTOR, ".pagination .next, .page-next, a[rel='next']"),
-                (By.XPATH, "//li[contains(@class,'next')]//a | //span[contains(@class,'next')]//a")
-            ]
-
-            next_btn = self._find_first(next_btns, timeout=3, log_failure=False)
+            next_btn = self._find_next_button()
             if next_btn:
-                # 检查是否禁用
-                classes = next_btn.get_attribute('class') or ''
-                if 'disabled' in classes or 'inactive' in classes:
-                    return False
-
                 self.driver.execute_script("arguments[0].scrollIntoView(true);", next_btn)
-                time.sleep(0.5)
                 next_btn.click()
-                time.sleep(2)
-                self._wait_for_results(timeout=5)
+                self.browser_manager.wait_until_ready("next_page", budget=2.5, locators=RESULT_LOCATORS,
+                                                      timeout=5, reset=True)
                 return True
 
             return False
         except Exception as e:
             logger.debug(f"翻页失败: {str(e)}")
             return False
+
+    def _find_next_button(self):
+        """
+        查找可用的“下一页”按钮
+
+        Returns:
+            WebElement: 按钮元素；不存在或已禁用时返回None
+        """
+        next_btns = [
+            (By.XPATH, "//a[contains(text(),'下一页') or contains(text(),'下页')]"),
+            (By.XPATH, "//button[contains(text(),'下一页') or contains(text(),'下页')]"),
+            (By.CSS_SELECTOR, ".pagination .next, .page-next, a[rel='next']"),
+            (By.XPATH, "//li[contains(@class,'next')]//a | //span[contains(@class,'next')]//a")
+        ]
+        next_btn = self._find_first(next_btns, timeout=0, log_failure=False)
+        if next_btn:
+            # 检查是否禁用
+            classes = next_btn.get_attribute('class') or ''
+            if 'disabled' in classes or 'inactive' in classes:
+                return None
+        return next_btn
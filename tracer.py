@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import inspect
+import logging
+import threading
+from functools import wraps
+from config import TRACE_ENABLED, TRACE_FILE
+
+
+logger = logging.getLogger(__name__)
+
+
+class _NullSpan:
+    """关闭追踪时返回的空上下文（不分配对象、不读时钟）"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """一个追踪区间，退出时写入 Chrome Trace 的完整事件（ph='X'）"""
+
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._add_complete(self.name, self.cat, self.start, end, self.args)
+        return False
+
+
+class Tracer:
+    """
+    区间追踪器：记录带线程信息的嵌套区间，输出 Chrome Trace Event JSON
+
+    输出文件可直接在 chrome://tracing 或 https://ui.perfetto.dev 打开，
+    同一线程内的区间按时间自动嵌套（关键词 → 页面 → 详情页 → 子步骤）。
+    """
+
+    def __init__(self, enabled=TRACE_ENABLED):
+        """
+        初始化追踪器
+
+        Args:
+            enabled: 是否记录；关闭时 span() 返回共享的空上下文，装饰器直接调用原函数
+        """
+        self.enabled = enabled
+        self.events = []
+        self._lock = threading.Lock()
+        self._threads = {}
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def enable(self, enabled=True):
+        """开启或关闭追踪（开启时清空已记录的区间）"""
+        if enabled and not self.enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def reset(self):
+        """清空已记录的区间"""
+        with self._lock:
+            self.events = []
+            self._threads = {}
+            self._origin = time.perf_counter()
+
+    def span(self, name, cat="crawl", **args):
+        """
+        追踪区间上下文管理器
+
+        用法:
+            with TRACER.span("detail", url=url):
+                ...
+
+        Args:
+            name: 区间名称
+            cat: 类别（在追踪界面中可按类别过滤）
+            **args: 附加参数（显示在区间详情中）
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def traced(self, name=None, cat="crawl", args=()):
+        """
+        追踪装饰器
+
+        Args:
+            name: 区间名称，默认取函数名
+            cat: 类别
+            args: 记录到区间参数中的函数参数名（如 ("keyword",)）
+
+        Returns:
+            function: 装饰器
+        """
+        def decorator(func):
+            span_name = name or func.__name__
+            signature = inspect.signature(func) if args else None
+
+            @wraps(func)
+            def wrapper(*call_args, **call_kwargs):
+                if not self.enabled:
+                    return func(*call_args, **call_kwargs)
+                span_args = {}
+                if signature is not None:
+                    bound = signature.bind_partial(*call_args, **call_kwargs).arguments
+                    span_args = {arg: bound[arg] for arg in args if arg in bound}
+                with _Span(self, span_name, cat, span_args):
+                    return func(*call_args, **call_kwargs)
+            return wrapper
+        return decorator
+
+    def instant(self, name, cat="crawl", **args):
+        """记录一个瞬时事件（如遇到验证页、回退浏览器）"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            tid = self._thread_id()
+            self.events.append({"name": name, "cat": cat, "ph": "i", "s": "t", "pid": self._pid, "tid": tid,
+                                "ts": (now - self._origin) * 1e6, "args": args})
+
+    def _thread_id(self):
+        """当前线程ID，首次出现时记录线程名（调用方持有锁）"""
+        thread = threading.current_thread()
+        tid = thread.ident
+        if tid not in self._threads:
+            self._threads[tid] = thread.name
+        return tid
+
+    def _add_complete(self, name, cat, start, end, args):
+        """写入一个完整事件"""
+        with self._lock:
+            tid = self._thread_id()
+            self.events.append({"name": name, "cat": cat, "ph": "X", "pid": self._pid, "tid": tid,
+                                "ts": (start - self._origin) * 1e6, "dur": (end - start) * 1e6, "args": args})
+
+    def to_chrome_trace(self):
+        """
+        转换为 Chrome Trace Event 格式
+
+        Returns:
+            dict: {'traceEvents': [...], 'displayTimeUnit': 'ms'}
+        """
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+        metadata = [{"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0, "args": {"name": "天眼查爬虫"}}]
+        metadata += [{"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": thread_name}}
+                     for tid, thread_name in threads.items()]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def write(self, path=TRACE_FILE):
+        """
+        写出追踪文件（未开启或无区间时不写）
+
+        Returns:
+            str: 文件路径；未写出时返回None
+        """
+        if not self.enabled or not self.events:
+            return None
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        logger.info(f"✓ 追踪文件已保存: {path}（{len(self.events)} 个区间，可在 chrome://tracing 或 Perfetto 中打开）")
+        return path
+
+
+# 进程内共享的追踪器
+TRACER = Tracer()
+span = TRACER.span
+traced = TRACER.traced